@@ -108,6 +108,31 @@ export interface paths {
     patch?: never;
     trace?: never;
   };
+  "/v1/scenes/batch/": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    get?: never;
+    put?: never;
+    /**
+     * Batch Scenes
+     * @description Fetch many scenes by key in one request.
+     *
+     *     ``fields: "full"`` returns each scene as ``GET /{key}/`` does (and counts
+     *     a view of each); ``"mini"`` returns the fields the list endpoints return,
+     *     without loading items. Legacy keys are migrated as on GET. Keys with no
+     *     scene are left out of the result.
+     */
+    post: operations["scenes_api_batch_scenes"];
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
   "/v1/scenes/me/": {
     parameters: {
       query?: never;
@@ -125,6 +150,52 @@ export interface paths {
     patch?: never;
     trace?: never;
   };
+  "/v1/scenes/me/bulk/": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    get?: never;
+    put?: never;
+    /**
+     * Bulk Update Scenes
+     * @description Archive, unarchive, delete or retitle many of your scenes at once.
+     *
+     *     Keys you don't own, or that don't exist, are reported and left alone;
+     *     the rest are written in one statement.
+     */
+    post: operations["scenes_api_bulk_update_scenes"];
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
+  "/v1/scenes/search/": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    /**
+     * Search Scenes
+     * @description Scenes whose title or item descriptions match ``q``, best match first.
+     *
+     *     Full-text (stemmed, websearch syntax) over titles and item descriptions,
+     *     plus fuzzy title matching. Archived scenes are excluded.
+     */
+    get: operations["scenes_api_search_scenes"];
+    put?: never;
+    post?: never;
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
   "/v1/scenes/{key}/": {
     parameters: {
       query?: never;
@@ -144,6 +215,31 @@ export interface paths {
     patch: operations["scenes_api_update_scene"];
     trace?: never;
   };
+  "/v1/scenes/{key}/items/": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    get?: never;
+    put?: never;
+    post?: never;
+    delete?: never;
+    options?: never;
+    head?: never;
+    /**
+     * Patch Scene Items
+     * @description Edit some of a scene's items without resending the rest.
+     *
+     *     Only the upserted items are validated, and the stored items are patched
+     *     in place by the database. The response is the scene's metadata, not its
+     *     body: the stored GET body is regenerated by the next read rather than
+     *     rendered on every autosave.
+     */
+    patch: operations["scenes_api_patch_scene_items"];
+    trace?: never;
+  };
   "/v1/scenes/{key}/meta/": {
     parameters: {
       query?: never;
@@ -553,6 +649,13 @@ export interface components {
     };
     /** Input */
     Input: {
+      /**
+       * Count
+       * @default true
+       */
+      count?: boolean;
+      /** Cursor */
+      cursor?: string | null;
       /**
        * Limit
        * @default 20
@@ -664,9 +767,11 @@ export interface components {
     /** PagedMiniSceneSchema */
     PagedMiniSceneSchema: {
       /** Count */
-      count: number;
+      count: number | null;
       /** Items */
       items: components["schemas"]["MiniSceneSchema"][];
+      /** Next */
+      next: string | null;
     };
     /** ParametricCurveItem */
     ParametricCurveItem: {
@@ -801,6 +906,61 @@ export interface components {
       /** Zorder */
       zOrder: string;
     };
+    /**
+     * SceneBatchResultSchema
+     * @description The requested scenes, by key, in request order. Keys with no scene
+     *     are absent.
+     */
+    SceneBatchResultSchema: {
+      /** Scenes */
+      scenes: {
+        [key: string]:
+          | components["schemas"]["SceneSchema"]
+          | components["schemas"]["MiniSceneSchema"];
+      };
+    };
+    /**
+     * SceneBatchSchema
+     * @description Scenes to fetch by key. ``fields`` is ``mini`` for the fields the list
+     *     endpoints return, or ``full`` for what ``GET /{key}/`` returns.
+     */
+    SceneBatchSchema: {
+      /**
+       * Fields
+       * @default mini
+       * @enum {string}
+       */
+      fields?: "mini" | "full";
+      /** Keys */
+      keys: string[];
+    };
+    /**
+     * SceneBulkResultSchema
+     * @description Each requested key's outcome: ``ok``, ``forbidden`` (not your scene) or
+     *     ``not_found``.
+     */
+    SceneBulkResultSchema: {
+      /** Results */
+      results: {
+        [key: string]: "ok" | "forbidden" | "not_found";
+      };
+    };
+    /**
+     * SceneBulkSchema
+     * @description One action applied to many of your scenes. ``title`` is required by,
+     *     and only used for, ``retitle``.
+     */
+    SceneBulkSchema: {
+      /**
+       * Action
+       * @enum {string}
+       */
+      action: "archive" | "unarchive" | "delete" | "retitle";
+      /** Keys */
+      keys: string[];
+      /** Title */
+      title?: string | null;
+    };
     /** SceneCreateSchema */
     SceneCreateSchema: {
       /**
@@ -824,6 +984,22 @@ export interface components {
       /** Title */
       title?: string | null;
     };
+    /**
+     * SceneItemsPatchSchema
+     * @description An item-level edit: the items to add or replace (matched by ``id``),
+     *     the ids to remove, and the ``itemOrder`` entries to set. Entries not
+     *     named are left as stored, and the entry of a removed id is dropped.
+     */
+    SceneItemsPatchSchema: {
+      /** Itemorder */
+      itemOrder?: {
+        [key: string]: string[];
+      };
+      /** Remove */
+      remove?: string[];
+      /** Upsert */
+      upsert?: components["schemas"]["MathItem"][];
+    };
     /**
      * SceneMetaSchema
      * @description Title-only shape for the read-only meta endpoint the edge OG Worker calls.
@@ -874,6 +1050,16 @@ export interface components {
       /** Title */
       title?: string | null;
     };
+    /** SceneSearchSchema */
+    SceneSearchSchema: {
+      /**
+       * Limit
+       * @default 20
+       */
+      limit?: number;
+      /** Q */
+      q: string;
+    };
     /** StrArray */
     StrArray: {
       /** Items */
@@ -1212,6 +1398,8 @@ export interface operations {
         archived?: boolean | null;
         limit?: number;
         offset?: number;
+        cursor?: string | null;
+        count?: boolean;
       };
       header?: never;
       path?: never;
@@ -1254,6 +1442,30 @@ export interface operations {
       };
     };
   };
+  scenes_api_batch_scenes: {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody: {
+      content: {
+        "application/json": components["schemas"]["SceneBatchSchema"];
+      };
+    };
+    responses: {
+      /** @description OK */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["SceneBatchResultSchema"];
+        };
+      };
+    };
+  };
   scenes_api_my_scenes: {
     parameters: {
       query?: {
@@ -1261,6 +1473,8 @@ export interface operations {
         archived?: boolean | null;
         limit?: number;
         offset?: number;
+        cursor?: string | null;
+        count?: boolean;
       };
       header?: never;
       path?: never;
@@ -1279,6 +1493,53 @@ export interface operations {
       };
     };
   };
+  scenes_api_bulk_update_scenes: {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody: {
+      content: {
+        "application/json": components["schemas"]["SceneBulkSchema"];
+      };
+    };
+    responses: {
+      /** @description OK */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["SceneBulkResultSchema"];
+        };
+      };
+    };
+  };
+  scenes_api_search_scenes: {
+    parameters: {
+      query: {
+        q: string;
+        limit?: number;
+      };
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody?: never;
+    responses: {
+      /** @description OK */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["MiniSceneSchema"][];
+        };
+      };
+    };
+  };
   scenes_api_get_scene: {
     parameters: {
       query?: never;
@@ -1347,6 +1608,32 @@ export interface operations {
       };
     };
   };
+  scenes_api_patch_scene_items: {
+    parameters: {
+      query?: never;
+      header?: never;
+      path: {
+        key: string;
+      };
+      cookie?: never;
+    };
+    requestBody: {
+      content: {
+        "application/json": components["schemas"]["SceneItemsPatchSchema"];
+      };
+    };
+    responses: {
+      /** @description OK */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["MiniSceneSchema"];
+        };
+      };
+    };
+  };
   scenes_api_get_scene_meta: {
     parameters: {
       query?: never;
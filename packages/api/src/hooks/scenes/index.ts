@@ -48,20 +48,22 @@ const useInfiniteScenesMe = (
 ) => {
   return useInfiniteQuery({
     queryKey: [...meListKey(), { limit, offset, title, archived }],
-    initialPageParam: offset ?? 0,
+    // The first page is fetched by offset; later pages follow the server's
+    // keyset cursor (`next`), which stays cheap however deep the scroll goes
+    // and skips re-counting.
+    initialPageParam: undefined as string | undefined,
     queryFn: ({ pageParam }) =>
       unwrap(
         v1Client.GET("/v1/scenes/me/", {
-          params: { query: { limit, offset: pageParam, title, archived } },
+          params: {
+            query:
+              pageParam === undefined
+                ? { limit, offset, title, archived }
+                : { limit, cursor: pageParam, count: false, title, archived },
+          },
         }),
       ),
-    getNextPageParam: (lastPage, allPages, lastPageParam) => {
-      // Empty page => nothing more to load (also guards against an infinite
-      // loop if a malformed `count` ever exceeds the returnable item total).
-      if (lastPage.items.length === 0) return undefined;
-      const loaded = (lastPageParam ?? 0) + lastPage.items.length;
-      return loaded < lastPage.count ? loaded : undefined;
-    },
+    getNextPageParam: (lastPage) => lastPage.next ?? undefined,
     ...opts,
   });
 };
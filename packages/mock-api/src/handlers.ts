@@ -116,6 +116,7 @@ export const handlers = [
       return HttpResponse.json({
         count: items.length,
         items,
+        next: null,
       });
     },
   ),
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
+from main import metrics
+from scenes import view_counts
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Start every test with cold caches. LocMemCache lives for the whole test
+    process, so without this an entry cached by one test survives the DB
+    rollback and leaks into the next."""
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@pytest.fixture(autouse=True)
+def _empty_view_count_buffer():
+    """The view-count buffer is process-global and outlives each test's DB
+    rollback; empty it around every test (after, too, so the atexit flush has
+    nothing to write once the test database is gone). The flush clock is
+    reset too, so a long suite can't trigger an inline flush mid-test."""
+    view_counts._scene_views.clear()
+    view_counts._legacy_views.clear()
+    view_counts._last_flush = time.monotonic()
+    yield
+    view_counts._scene_views.clear()
+    view_counts._legacy_views.clear()
+
+
+@pytest.fixture(autouse=True)
+def _empty_metrics_buffer():
+    """The same for the metrics buffer (main/metrics.py)."""
+    metrics._buffer.clear()
+    metrics._last_flush = time.monotonic()
+    yield
+    metrics._buffer.clear()
@@ -2,6 +2,10 @@ from django.http import HttpRequest
 from ninja import NinjaAPI
 from ninja.errors import AuthenticationError, ValidationError
 
+from main.instrumentation import time_operation, time_view
+from main.metrics import observe_operation
+from scenes.conditional import NotModified
+
 api = NinjaAPI(
     title="Math3d API",
     version="1.0.0",
@@ -38,6 +42,14 @@ api = NinjaAPI(
 )
 
 
+# Latency histograms for /metrics. First, see observe_operation.
+api.add_decorator(observe_operation, mode="view")
+# Split each operation's time into the view and ninja's schema work around it,
+# for RequestInstrumentationMiddleware. No-ops unless that is enabled.
+api.add_decorator(time_operation, mode="view")
+api.add_decorator(time_view, mode="operation")
+
+
 @api.exception_handler(AuthenticationError)
 def on_authentication_error(request: HttpRequest, exc: AuthenticationError):
     # v0 parity: session/cookie auth cannot send a compliant WWW-Authenticate
@@ -54,6 +66,13 @@ def on_validation_error(request: HttpRequest, exc: ValidationError):
     return api.create_response(request, {"detail": exc.errors}, status=400)
 
 
+@api.exception_handler(NotModified)
+def on_not_modified(request: HttpRequest, exc: NotModified):
+    # A matched precondition raised from inside a view (scenes/conditional.py);
+    # the 304/412 is already built.
+    return exc.response
+
+
 from authentication.api import router as auth_router  # noqa: E402
 from scenes.api import legacy_router, scenes_router  # noqa: E402
 
@@ -0,0 +1,217 @@
+"""Benchmarks for the scene API's hot paths (``manage.py bench``).
+
+Each benchmark times one operation ``iterations`` times, in-process, with any
+per-iteration setup kept outside the timed region. It reports p50/p99/mean
+latency and throughput. Endpoints are driven through ``django.test.Client``,
+so they include URL routing, the middleware stack and ninja's
+parsing/rendering, but no network or WSGI server.
+
+Scenes are seeded from the two realistic fixtures in the tree,
+``main/management/commands/test_scene.json`` and ``scenes/tests/data.py``,
+alternately. Results are plain JSON (see ``run_benchmarks``) so runs on two
+commits can be diffed.
+"""
+
+import copy
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Optional
+
+import django
+from django.test import Client
+
+from authentication.models import CustomUser
+from scenes.cache import invalidate_scene
+from scenes.legacy_scene_utils.migrate_scene import migrate_scene
+from scenes.models import LegacyScene, Scene
+from scenes.schemas.math_items import MATH_ITEM_LIST_ADAPTER
+from scenes.tests.data import default_scene
+
+_TEST_SCENE_PATH = os.path.join(
+    os.path.dirname(__file__), "management", "commands", "test_scene.json"
+)
+
+# What a freshly created v0 scene dehydrates to; migrate_scene fills in the
+# default folders, axes and grids, so this is a full translation.
+_LEGACY_DEHYDRATED = {
+    "folders": {},
+    "mathSymbols": {},
+    "mathGraphics": {},
+    "sliderValues": {},
+    "sortableTree": {"root": []},
+    "metadata": {"creationDate": '"2020-01-01T00:00:00Z"', "title": "Bench"},
+}
+
+
+def fixtures() -> list[dict]:
+    """``{"items", "itemOrder"}`` payloads of realistic scenes."""
+    with open(_TEST_SCENE_PATH) as f:
+        test_scene = json.load(f)
+    default = default_scene()
+    return [
+        {"items": test_scene["items"], "itemOrder": test_scene["itemOrder"]},
+        {"items": default["items"], "itemOrder": default["itemOrder"]},
+    ]
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """p50/p99/mean latency (ms) and throughput (ops/s) of one benchmark."""
+    if len(samples_ms) > 1:
+        cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+        p50, p99 = cuts[49], cuts[98]
+    else:
+        p50 = p99 = samples_ms[0]
+    total_s = sum(samples_ms) / 1000
+    return {
+        "iterations": len(samples_ms),
+        "p50_ms": round(p50, 3),
+        "p99_ms": round(p99, 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "ops_per_sec": round(len(samples_ms) / total_s, 1) if total_s else None,
+    }
+
+
+def _time(
+    operation: Callable[[int], object],
+    iterations: int,
+    setup: Optional[Callable[[int], None]] = None,
+) -> list[float]:
+    samples = []
+    for i in range(iterations):
+        if setup is not None:
+            setup(i)
+        started = time.perf_counter_ns()
+        operation(i)
+        samples.append((time.perf_counter_ns() - started) / 1e6)
+    return samples
+
+
+def _expect(status: int):
+    def check(response):
+        if response.status_code != status:
+            raise RuntimeError(
+                f"{response.request['REQUEST_METHOD']} {response.request['PATH_INFO']}"
+                f" returned {response.status_code}, expected {status}"
+            )
+        return response
+
+    return check
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    scene_count: int, iterations: int, only: Optional[set[str]] = None
+) -> dict:
+    """Seed ``scene_count`` scenes into the current database, then run every
+    benchmark (or those named in ``only``). Writes to the database: run it
+    against a scratch one."""
+    rng = random.Random(0)
+    payloads = fixtures()
+    keys: list[str] = []
+    anonymous, owner = Client(), Client()
+    ok, created = _expect(200), _expect(201)
+
+    def key(i: int) -> str:
+        return keys[rng.randrange(len(keys))]
+
+    def cold_get(i: int) -> None:
+        invalidate_scene(keys[i % len(keys)])
+
+    legacy: list[LegacyScene] = []
+
+    def new_legacy(i: int) -> None:
+        legacy.append(
+            LegacyScene.objects.create(dehydrated=copy.deepcopy(_LEGACY_DEHYDRATED))
+        )
+
+    benchmarks: dict[str, tuple[Callable[[int], object], Optional[Callable]]] = {
+        "validate_items": (
+            lambda i: MATH_ITEM_LIST_ADAPTER.validate_python(
+                payloads[i % len(payloads)]["items"]
+            ),
+            None,
+        ),
+        "migrate_scene": (lambda i: migrate_scene(legacy[-1]), new_legacy),
+        "get_scene": (
+            lambda i: ok(anonymous.get(f"/v1/scenes/{keys[i % len(keys)]}/")),
+            cold_get,
+        ),
+        "get_scene_cached": (
+            lambda i: ok(anonymous.get(f"/v1/scenes/{key(i)}/")),
+            None,
+        ),
+        "list_scenes": (lambda i: ok(anonymous.get("/v1/scenes/?limit=20")), None),
+        "create_scene": (
+            lambda i: created(
+                anonymous.post(
+                    "/v1/scenes/",
+                    data=payloads[i % len(payloads)],
+                    content_type="application/json",
+                )
+            ),
+            None,
+        ),
+        "update_scene": (
+            lambda i: ok(
+                owner.patch(
+                    f"/v1/scenes/{key(i)}/",
+                    data={**payloads[i % len(payloads)], "title": f"Edit {i}"},
+                    content_type="application/json",
+                )
+            ),
+            None,
+        ),
+    }
+    unknown = (only or set()) - benchmarks.keys()
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {sorted(unknown)}")
+
+    author = CustomUser.objects.create_user(
+        email="bench@example.com", password=None, public_nickname="Bench"
+    )
+    for i in range(scene_count):
+        payload = payloads[i % len(payloads)]
+        scene = Scene(
+            title=f"Bench scene {i}",
+            author=author,
+            items=payload["items"],
+            item_order=payload["itemOrder"],
+        )
+        scene.save()
+        keys.append(scene.key)
+
+    owner.force_login(author)
+
+    results = {}
+    for name, (operation, setup) in benchmarks.items():
+        if only and name not in only:
+            continue
+        results[name] = summarize(_time(operation, iterations, setup))
+
+    return {
+        "meta": {
+            "commit": _commit(),
+            "python": sys.version.split()[0],
+            "django": django.get_version(),
+            "scenes": scene_count,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
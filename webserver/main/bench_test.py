@@ -0,0 +1,43 @@
+import pytest
+
+from main.bench import run_benchmarks, summarize
+
+
+def test_summarize_reports_percentiles_and_throughput():
+    summary = summarize([float(ms) for ms in range(1, 101)])
+    assert summary["iterations"] == 100
+    assert summary["p50_ms"] == 50.5
+    assert summary["p99_ms"] == 99.01
+    assert summary["mean_ms"] == 50.5
+    assert summary["ops_per_sec"] == round(100 / 5.05, 1)
+
+
+def test_summarize_single_sample():
+    assert summarize([2.0])["p99_ms"] == 2.0
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_covers_every_hot_path():
+    report = run_benchmarks(scene_count=3, iterations=2)
+    assert set(report["results"]) == {
+        "validate_items",
+        "migrate_scene",
+        "get_scene",
+        "get_scene_cached",
+        "list_scenes",
+        "create_scene",
+        "update_scene",
+    }
+    assert report["results"]["get_scene"]["iterations"] == 2
+    assert report["meta"]["scenes"] == 3
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_only():
+    report = run_benchmarks(scene_count=1, iterations=1, only={"list_scenes"})
+    assert list(report["results"]) == ["list_scenes"]
+
+
+def test_run_benchmarks_rejects_unknown_names():
+    with pytest.raises(ValueError, match="nope"):
+        run_benchmarks(scene_count=1, iterations=1, only={"nope"})
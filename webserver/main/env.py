@@ -37,6 +37,17 @@ class EnvConfig(BaseSettings):
     # Shared secret gating the Worker's POST /render. Unset in dev is fine
     # (feature dark). Not required in production — the feature is optional.
     RENDER_SECRET: str = ""
+    # Edge caching of public scene reads (scenes/edge.py). Cache-Control values
+    # are emitted verbatim. SCENE_CACHE_CONTROL is unset by default: edge hits
+    # on GET /v1/scenes/{key}/ bypass view counting. The meta endpoint is
+    # side-effect free, so it is edge-cacheable by default.
+    SCENE_CACHE_CONTROL: str = ""
+    SCENE_META_CACHE_CONTROL: str = "public, max-age=60, s-maxage=300"
+    # Full URL the purger (drain_purge_outbox) POSTs the surrogate keys of
+    # saved/deleted scenes to, with EDGE_PURGE_SECRET as a bearer token.
+    # Unset ⇒ purging is dark.
+    EDGE_PURGE_URL: str = ""
+    EDGE_PURGE_SECRET: str = ""
     DATABASE_URL: str = ""
     INGESTION_DATABASE_URL: str = ""
     # NoDecode: these env vars hold comma-separated lists, not JSON — skip
@@ -54,6 +65,14 @@ class EnvConfig(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     DJANGO_LOG_LEVEL: str = "INFO"
+    # Per-request instrumentation (main/middleware.py): Server-Timing header,
+    # a log line per request, and the SQL of requests slower than
+    # SLOW_REQUEST_MS. Off by default; the header exposes timings to clients.
+    REQUEST_INSTRUMENTATION: bool = False
+    SLOW_REQUEST_MS: int = 1000
+    # Bearer token GET /metrics requires (main/views.py). Unset ⇒ /metrics
+    # 404s (dark).
+    METRICS_TOKEN: str = ""
     # Version
     APP_VERSION: str = "unknown"
     # Feature flags
@@ -88,6 +107,13 @@ class EnvConfig(BaseSettings):
             )
         return value
 
+    @field_validator("EDGE_PURGE_URL")
+    @classmethod
+    def _validate_purge_url(cls, value: str) -> str:
+        if value and urlparse(value).scheme not in ("http", "https"):
+            raise ValueError(f"{value!r} must be an http(s) URL")
+        return value
+
     @model_validator(mode="after")
     def _reject_contradictory_legacy_flag(self) -> "EnvConfig":
         if self.IS_HEROKU and self.IS_DEVELOPMENT:
@@ -30,3 +30,14 @@ def test_screenshots_origin_rejects_non_bare_origin():
 
 def test_render_secret_defaults_empty():
     assert _base().RENDER_SECRET == ""
+
+
+def test_edge_purge_defaults_dark():
+    assert _base().EDGE_PURGE_URL == ""
+    assert _base().SCENE_CACHE_CONTROL == ""
+
+
+def test_edge_purge_url_requires_http_scheme():
+    assert _base(EDGE_PURGE_URL="https://edge.example/purge").EDGE_PURGE_URL
+    with pytest.raises(ValidationError):
+        _base(EDGE_PURGE_URL="edge.example/purge")
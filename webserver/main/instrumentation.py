@@ -0,0 +1,107 @@
+"""Per-request instrumentation: query count, DB time and schema time.
+
+``RequestInstrumentationMiddleware`` (main/middleware.py) opens a
+``RequestStats`` for each request and installs ``RequestStats.record_query``
+as an execute wrapper on every database connection. The two ninja decorators
+below split the time ninja spends on an operation into the view itself and
+everything around it: parsing and validating the input, then validating,
+dumping and rendering the response, i.e. the Pydantic work. They are
+registered on the API in main/api.py and do nothing when no request is being
+instrumented.
+"""
+
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Optional
+
+# SQL statements kept per request for the slow-request sample. The count and
+# time cover every statement; only the text is capped.
+MAX_SAMPLED_QUERIES = 100
+
+_current: ContextVar[Optional["RequestStats"]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_ms: float = 0.0
+    # Time in ninja outside the view and outside the database.
+    schema_ms: float = 0.0
+    # The ninja operation that handled the request, e.g. "get_scene".
+    operation: str = ""
+    # (duration ms, sql) of the first MAX_SAMPLED_QUERIES statements.
+    sql: list[tuple[float, str]] = field(default_factory=list)
+
+    def record_query(self, execute, sql, params, many, context):
+        """A ``connection.execute_wrapper`` callable."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.db_ms += duration_ms
+            if len(self.sql) < MAX_SAMPLED_QUERIES:
+                self.sql.append((duration_ms, sql))
+
+
+def current() -> Optional[RequestStats]:
+    """The stats of the request being instrumented, if any."""
+    return _current.get()
+
+
+def activate(stats: Optional[RequestStats]):
+    """Make ``stats`` current; returns a token for ``deactivate``."""
+    return _current.set(stats)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+# While a view runs, the schema clock is paused: time_operation() measures the
+# whole operation, time_view() hands back the share that belongs to the view.
+# DB time is subtracted on both sides, so lazily-loaded columns read while
+# rendering count as DB time, not schema time.
+
+
+def time_operation(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Ninja ``mode="view"`` decorator: wraps the whole operation."""
+
+    @wraps(run)
+    def timed_run(request, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return run(request, *args, **kwargs)
+        started, db_before = time.perf_counter(), stats.db_ms
+        try:
+            return run(request, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats.schema_ms += elapsed_ms - (stats.db_ms - db_before)
+
+    return timed_run
+
+
+def time_view(view_func: Callable[..., Any]) -> Callable[..., Any]:
+    """Ninja ``mode="operation"`` decorator: wraps just the view function."""
+
+    @wraps(view_func)
+    def timed_view(request, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return view_func(request, *args, **kwargs)
+        stats.operation = view_func.__name__
+        started, db_before = time.perf_counter(), stats.db_ms
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats.schema_ms -= elapsed_ms - (stats.db_ms - db_before)
+
+    return timed_view
@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from main import metrics
+from main.bench import run_benchmarks
+from scenes import view_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the scene API hot paths against a scratch database and "
+        "print (or write) p50/p99 latency and throughput as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenes",
+            type=int,
+            default=200,
+            help="Scenes to seed before benchmarking (default: 200)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Timed iterations per benchmark (default: 200)",
+        )
+        parser.add_argument(
+            "--only",
+            type=str,
+            help="Comma-separated benchmark names to run (default: all)",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="Write the JSON results to this path instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        only = set(options["only"].split(",")) if options["only"] else None
+
+        # A fresh database per run, built the way the test runner builds one,
+        # so results don't depend on (or disturb) whatever the dev DB holds.
+        setup_test_environment()
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        test_settings["NAME"] = f"bench_{connection.settings_dict['NAME']}"
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # Keep side effects dark: no render Worker nudges, no edge purges.
+            with override_settings(SCREENSHOTS_ORIGIN="", EDGE_PURGE_URL=""):
+                report = run_benchmarks(options["scenes"], options["iterations"], only)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        finally:
+            # Into the scratch DB, not (at exit) into the real one.
+            view_counts.flush()
+            metrics.flush()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
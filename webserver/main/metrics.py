@@ -0,0 +1,241 @@
+"""Prometheus metrics, aggregated across gunicorn workers through the database.
+
+Instrumented code calls ``inc`` (counters) or ``observe`` (histograms). Both
+only touch a per-process buffer under a lock. The buffer is added into
+``MetricSeries`` rows in one upsert by the first call after
+``settings.METRICS_FLUSH_INTERVAL`` seconds, by every scrape (for the
+scraped worker), and at interpreter exit: the same buffered pattern as
+scenes/view_counts.py. A histogram is stored as its cumulative ``_bucket``
+counters plus ``_sum`` and ``_count``, so every series is a plain sum and
+workers' contributions simply add up.
+
+GET /metrics (main/views.py) renders the table with ``render``. Totals are
+up to one interval behind per worker, and a hard-killed worker loses its
+unflushed increments; Prometheus' ``rate()`` tolerates both.
+"""
+
+import atexit
+import logging
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from main.models import MetricSeries
+
+logger = logging.getLogger(__name__)
+
+# name -> (type, help). Only these families are exported.
+FAMILIES: dict[str, tuple[str, str]] = {
+    "math3d_request_duration_seconds": (
+        "histogram",
+        "API request latency per ninja operation.",
+    ),
+    "math3d_scene_reads_total": (
+        "counter",
+        "Scene reads served, including 304s, by kind (scene, legacy, or batch: "
+        "one per scene a batch fetch returns).",
+    ),
+    "math3d_scene_writes_total": (
+        "counter",
+        "Scene writes through the API, by op (create, update, update_items, "
+        "delete, and bulk_<action> for each bulk action).",
+    ),
+    "math3d_scene_cache_lookups_total": (
+        "counter",
+        "Read-through scene cache lookups, by result (hit or miss).",
+    ),
+    "math3d_render_slots_total": (
+        "counter",
+        "reserve_render_slot outcomes: granted, denied_monthly, denied_daily.",
+    ),
+    "math3d_render_requests_total": (
+        "counter",
+        "Saves that asked for a render: queued, or coalesced into a queued one.",
+    ),
+    "math3d_render_outbox_total": (
+        "counter",
+        "Render outbox rows drained: rendered, retried, dropped, declined.",
+    ),
+    "math3d_render_nudge_failures_total": (
+        "counter",
+        "nudge_render calls that failed to reach the render Worker.",
+    ),
+}
+
+# Prometheus' default buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_buffer: defaultdict[tuple[str, str], float] = defaultdict(float)
+_last_flush = time.monotonic()
+
+# Raw SQL: an increment (not bulk_create's absolute update_fields value) of
+# many rows in one statement, as in scenes/view_counts.py. Rows are sent
+# sorted so two workers upserting the same series lock them in the same
+# order and can't deadlock.
+_TABLE = MetricSeries._meta.db_table
+_UPSERT_SQL = f"""
+    INSERT INTO {_TABLE} (name, labels, value)
+    SELECT * FROM unnest(%(names)s::text[], %(labels)s::text[], %(values)s::float8[])
+    ON CONFLICT (name, labels) DO UPDATE SET value = {_TABLE}.value + EXCLUDED.value
+"""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    _record([((name, format_labels(labels)), amount)])
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record ``value`` into histogram ``name``'s buckets, sum and count."""
+    rendered = format_labels(labels)
+    prefix = f"{rendered}," if rendered else ""
+    updates = [
+        ((f"{name}_bucket", f'{prefix}le="{bound}"'), 1.0)
+        for bound in LATENCY_BUCKETS
+        if value <= bound
+    ]
+    updates += [
+        ((f"{name}_bucket", f'{prefix}le="+Inf"'), 1.0),
+        ((f"{name}_sum", rendered), value),
+        ((f"{name}_count", rendered), 1.0),
+    ]
+    _record(updates)
+
+
+def _record(updates: list[tuple[tuple[str, str], float]]) -> None:
+    with _lock:
+        for series, amount in updates:
+            _buffer[series] += amount
+        due = time.monotonic() - _last_flush >= settings.METRICS_FLUSH_INTERVAL
+    # Never from inside a transaction: a rollback there would discard the
+    # increments after they've left the buffer.
+    if due and not connection.in_atomic_block:
+        flush()
+
+
+def flush() -> None:
+    """Add the buffered increments to the table. Never raises: it runs inline
+    in requests. Failed increments go back in the buffer."""
+    global _last_flush
+    with _lock:
+        pending = dict(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    series = sorted(pending)
+    try:
+        with connection.cursor() as cur:
+            cur.execute(
+                _UPSERT_SQL,
+                {
+                    "names": [name for name, _ in series],
+                    "labels": [labels for _, labels in series],
+                    "values": [float(pending[key]) for key in series],
+                },
+            )
+    except Exception:
+        logger.warning("flushing buffered metrics failed", exc_info=True)
+        with _lock:
+            for series_key, amount in pending.items():
+                _buffer[series_key] += amount
+
+
+def observe_operation(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Ninja ``mode="view"`` decorator: records each operation's latency,
+    input validation and response rendering included. Must be added before
+    any other view-mode decorator, so that ``run`` is still the bound
+    ``Operation.run`` its view's name is read from."""
+    operation = getattr(run, "__self__").view_func.__name__
+
+    @wraps(run)
+    def observed_run(request, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return run(request, *args, **kwargs)
+        finally:
+            observe(
+                "math3d_request_duration_seconds",
+                time.perf_counter() - started,
+                operation=operation,
+            )
+
+    return observed_run
+
+
+def _family(name: str) -> str:
+    for suffix in ("_bucket", "_sum", "_count"):
+        base = name.removesuffix(suffix)
+        if base != name and FAMILIES.get(base, ("",))[0] == "histogram":
+            return base
+    return name
+
+
+_LE = re.compile(r',?le="([^"]*)"')
+_SERIES_RANK = {"_bucket": 0, "_sum": 1, "_count": 2}
+
+
+def _order(row: tuple[str, str, float]) -> tuple:
+    # Buckets in ascending le order, each series' buckets before its sum and
+    # count, as the exposition format expects.
+    name, labels, _ = row
+    family = _family(name)
+    le = _LE.search(labels)
+    bound = float(le.group(1)) if le else math.inf
+    return (
+        family,
+        _LE.sub("", labels),
+        _SERIES_RANK.get(name[len(family) :], 0),
+        bound,
+    )
+
+
+def _line(name: str, labels: str, value: float) -> str:
+    text = str(int(value)) if float(value).is_integer() else repr(value)
+    return f"{name}{{{labels}}} {text}" if labels else f"{name} {text}"
+
+
+# name -> (help, [(labels, value)])
+Gauges = dict[str, tuple[str, list[tuple[str, float]]]]
+
+
+def render(gauges: Optional[Gauges] = None) -> str:
+    """The text exposition of every stored series, plus ``gauges``: values
+    computed at scrape time."""
+    rows = sorted(
+        MetricSeries.objects.values_list("name", "labels", "value"), key=_order
+    )
+    lines: list[str] = []
+    seen: set[str] = set()
+    for name, labels, value in rows:
+        family = _family(name)
+        if family not in FAMILIES:
+            continue
+        if family not in seen:
+            seen.add(family)
+            kind, help_text = FAMILIES[family]
+            lines += [f"# HELP {family} {help_text}", f"# TYPE {family} {kind}"]
+        lines.append(_line(name, labels, value))
+    for name, (help_text, samples) in (gauges or {}).items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [_line(name, labels, value) for labels, value in samples]
+    return "\n".join(lines) + "\n"
+
+
+atexit.register(flush)
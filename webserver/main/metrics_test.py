@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from django.db import transaction
+
+from main import metrics
+from main.models import MetricSeries
+
+
+def _value(name: str, labels: str = "") -> float:
+    return MetricSeries.objects.get(name=name, labels=labels).value
+
+
+@pytest.mark.django_db
+def test_flush_adds_to_stored_totals():
+    """Each flush adds, so every worker's increments accumulate in one row."""
+    metrics.inc("math3d_scene_writes_total", op="create")
+    metrics.flush()
+    metrics.inc("math3d_scene_writes_total", op="create")
+    metrics.inc("math3d_scene_writes_total", 2, op="create")
+    metrics.flush()
+    assert _value("math3d_scene_writes_total", 'op="create"') == 4
+
+
+@pytest.mark.django_db
+def test_observe_fills_cumulative_buckets():
+    metrics.observe("math3d_request_duration_seconds", 0.03, operation="get_scene")
+    metrics.observe("math3d_request_duration_seconds", 3.0, operation="get_scene")
+    metrics.flush()
+    name, op = "math3d_request_duration_seconds", 'operation="get_scene"'
+    assert not MetricSeries.objects.filter(labels=f'{op},le="0.025"').exists()
+    assert _value(f"{name}_bucket", f'{op},le="0.05"') == 1
+    assert _value(f"{name}_bucket", f'{op},le="5.0"') == 2
+    assert _value(f"{name}_bucket", f'{op},le="+Inf"') == 2
+    assert _value(f"{name}_count", op) == 2
+    assert _value(f"{name}_sum", op) == pytest.approx(3.03)
+
+
+@pytest.mark.django_db
+def test_render_orders_buckets_and_skips_unknown_families():
+    metrics.observe("math3d_request_duration_seconds", 0.2, operation="a")
+    metrics.inc("math3d_render_nudge_failures_total")
+    metrics.flush()
+    MetricSeries.objects.create(name="retired_total", value=1)
+    lines = metrics.render(
+        {"math3d_render_cap": ("Cap.", [('period="day"', 150)])}
+    ).splitlines()
+    assert lines[:5] == [
+        "# HELP math3d_render_nudge_failures_total "
+        + metrics.FAMILIES["math3d_render_nudge_failures_total"][1],
+        "# TYPE math3d_render_nudge_failures_total counter",
+        "math3d_render_nudge_failures_total 1",
+        "# HELP math3d_request_duration_seconds "
+        + metrics.FAMILIES["math3d_request_duration_seconds"][1],
+        "# TYPE math3d_request_duration_seconds histogram",
+    ]
+    bounds = [line.split('le="')[1].split('"')[0] for line in lines if "le=" in line]
+    assert bounds == ["0.25", "0.5", "1.0", "2.5", "5.0", "10.0", "+Inf"]
+    assert lines[-5:-3] == [
+        'math3d_request_duration_seconds_sum{operation="a"} 0.2',
+        'math3d_request_duration_seconds_count{operation="a"} 1',
+    ]
+    assert lines[-1] == 'math3d_render_cap{period="day"} 150'
+    assert not any("retired_total" in line for line in lines)
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_increments():
+    metrics.inc("math3d_render_nudge_failures_total")
+    with mock.patch("main.metrics.connection.cursor", side_effect=RuntimeError):
+        metrics.flush()
+    metrics.flush()
+    assert _value("math3d_render_nudge_failures_total") == 1
+
+
+@pytest.mark.django_db
+def test_due_flush_waits_for_the_transaction_to_end(settings):
+    settings.METRICS_FLUSH_INTERVAL = 0
+    with mock.patch("main.metrics.flush") as flush:
+        with transaction.atomic():
+            metrics.inc("math3d_render_nudge_failures_total")
+        flush.assert_not_called()
+    assert metrics._buffer
@@ -1,7 +1,17 @@
+import logging
+import time
+from collections import Counter, defaultdict
 from collections.abc import Callable
+from contextlib import ExitStack
 
 from django.conf import settings
-from django.http import HttpRequest, HttpResponseBase
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+
+from main import instrumentation
+
+logger = logging.getLogger(__name__)
 
 
 class ScopedCorsCredentialsMiddleware:
@@ -29,3 +39,84 @@ class ScopedCorsCredentialsMiddleware:
         if request.headers.get("Origin") not in settings.CREDENTIALED_CORS_ORIGINS:
             response.headers.pop("Access-Control-Allow-Credentials", None)
         return response
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Measure each request: query count, DB time, ninja schema time (input
+    parsing/validation plus response validation/rendering, see
+    main/instrumentation.py), total time and response size.
+
+    The numbers go out as a Server-Timing header, which browser devtools show
+    per request, and as one ``request`` log line in logfmt, with the same
+    values in the record's ``instrumentation`` attribute for structured
+    handlers. Requests slower than SLOW_REQUEST_MS also log their SQL, most
+    repeated statements first, so an N+1 is visible from one log line. The SQL
+    is logged with its placeholders, never its parameters.
+
+    Opt-in with REQUEST_INSTRUMENTATION: unset, Django drops the middleware at
+    startup and the ninja decorators fall straight through. Listed first so
+    its total covers the rest of the middleware stack too.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        stats = instrumentation.RequestStats()
+        token = instrumentation.activate(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.record_query))
+                response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        response["Server-Timing"] = (
+            f'db;dur={stats.db_ms:.1f};desc="{stats.queries} queries", '
+            f"schema;dur={stats.schema_ms:.1f}, "
+            f"total;dur={total_ms:.1f}"
+        )
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "operation": stats.operation or "-",
+            "status": response.status_code,
+            "queries": stats.queries,
+            "db_ms": round(stats.db_ms, 1),
+            "schema_ms": round(stats.schema_ms, 1),
+            "total_ms": round(total_ms, 1),
+            # Streamed bodies (e.g. WhiteNoise files) have no length up front.
+            "bytes": (
+                len(response.content) if isinstance(response, HttpResponse) else "-"
+            ),
+        }
+        message = " ".join(f"{name}={value}" for name, value in record.items())
+        logger.info("request %s", message, extra={"instrumentation": record})
+
+        if total_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "slow request %s\n%s",
+                message,
+                _format_sql(stats.sql),
+                extra={"instrumentation": record},
+            )
+        return response
+
+
+def _format_sql(sql: list[tuple[float, str]]) -> str:
+    """One line per distinct statement: how often it ran, its total time."""
+    counts: Counter[str] = Counter()
+    durations: defaultdict[str, float] = defaultdict(float)
+    for duration_ms, statement in sql:
+        counts[statement] += 1
+        durations[statement] += duration_ms
+    return "\n".join(
+        f"  {count}x {durations[statement]:.1f}ms {statement}"
+        for statement, count in counts.most_common()
+    )
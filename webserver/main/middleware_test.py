@@ -2,10 +2,18 @@
 Request-level tests for ScopedCorsCredentialsMiddleware: origins in
 CORS_ALLOWED_ORIGINS but not in CREDENTIALED_CORS_ORIGINS get anonymous CORS
 only — no Access-Control-Allow-Credentials header (issue #1184).
+
+And for RequestInstrumentationMiddleware's Server-Timing header and log lines.
 """
 
+import logging
+import re
+
+import pytest
 from django.test import Client, override_settings
 
+from scenes.factories import SceneFactory
+
 SPA_ORIGIN = "https://app.example.org"
 ANON_ORIGIN = "https://legacy.example.org"
 
@@ -44,3 +52,68 @@ def test_preflight_from_anonymous_origin_gets_no_credentials_header():
     )
     assert response.headers["Access-Control-Allow-Origin"] == ANON_ORIGIN
     assert "Access-Control-Allow-Credentials" not in response.headers
+
+
+instrumented = override_settings(REQUEST_INSTRUMENTATION=True, SLOW_REQUEST_MS=1000)
+
+
+@pytest.fixture
+def middleware_log(caplog):
+    """caplog, fed from main.middleware (the "main" logger doesn't propagate)."""
+    logger = logging.getLogger("main.middleware")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def _timings(response) -> dict[str, float]:
+    return {
+        name: float(duration)
+        for name, duration in re.findall(
+            r"(\w+);dur=([\d.]+)", response.headers["Server-Timing"]
+        )
+    }
+
+
+def test_instrumentation_is_off_by_default():
+    assert "Server-Timing" not in Client().get("/health").headers
+
+
+@pytest.mark.django_db
+@instrumented
+def test_instrumentation_server_timing_header():
+    scene = SceneFactory.create(archived=False)
+    response = Client().get(f"/v1/scenes/{scene.key}/")
+    assert response.status_code == 200
+    timings = _timings(response)
+    assert timings.keys() == {"db", "schema", "total"}
+    assert timings["total"] >= timings["db"]
+    assert '"1 queries"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.django_db
+@instrumented
+def test_instrumentation_logs_one_line_per_request(middleware_log):
+    SceneFactory.create_batch(3, archived=False)
+    response = Client().get("/v1/scenes/")
+    [record] = middleware_log.records
+    stats = record.instrumentation  # type: ignore[attr-defined]
+    assert stats["operation"] == "list_scenes"
+    assert stats["status"] == 200
+    assert stats["bytes"] == len(response.content)
+    assert stats["queries"] >= 1
+    assert stats["schema_ms"] > 0
+    assert f"queries={stats['queries']}" in record.getMessage()
+
+
+@pytest.mark.django_db
+@override_settings(REQUEST_INSTRUMENTATION=True, SLOW_REQUEST_MS=0)
+def test_slow_request_logs_its_sql_grouped(middleware_log):
+    scene = SceneFactory.create(archived=False)
+    Client().get(f"/v1/scenes/{scene.key}/")
+    [_, record] = middleware_log.records
+    message = record.getMessage()
+    assert message.startswith("slow request ")
+    assert re.search(r"\n  1x [\d.]+ms SELECT .*scenes_scene", message)
+    # Placeholders, not the parameter values.
+    assert scene.key not in message.split("\n", 1)[1]
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class MetricSeries(models.Model):
+    """One Prometheus counter series, e.g. ``math3d_scene_writes_total`` with
+    labels ``op="create"``: the total across every worker process since the
+    row was created. Workers buffer increments in memory and add them here in
+    batches (main/metrics.py); GET /metrics reads the table, so a scrape sees
+    every worker, not just the one that answered it."""
+
+    name = models.CharField(max_length=200)
+    # Rendered label set, exactly as it appears between the braces of the
+    # exposition line; "" for an unlabelled series.
+    labels = models.CharField(max_length=500, blank=True, default="")
+    value = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "labels"], name="metricseries_name_labels_unique"
+            ),
+        ]
@@ -0,0 +1,41 @@
+"""Schema-driven column projection for ninja list routes.
+
+A route that returns a queryset under a narrow response schema still selects
+every column by default. For scenes that includes the ``items``/``item_order``
+JSONB blobs, each up to hundreds of KB, which are fetched and decoded only to
+be thrown away. ``project(queryset, Schema)`` narrows the queryset with
+``.only()`` to the model fields the schema renders.
+
+A schema field maps to the model field of the same (attribute, not alias)
+name, which makes a ForeignKey field load its ``<name>_id`` column. Schema
+fields with no matching model field (resolver-computed values) are skipped.
+A resolver that reads some other column should list it in ``extra``: a column
+the projection omits is lazily fetched per row, which is correct but turns
+one query into N.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from ninja import Schema
+
+
+def schema_columns(
+    schema: type[Schema], model: type[Model], extra: tuple[str, ...] = ()
+) -> tuple[str, ...]:
+    """The concrete ``model`` fields ``schema`` renders, plus ``extra``."""
+    columns = []
+    for name in schema.model_fields:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete:
+            columns.append(name)
+    return (*columns, *extra)
+
+
+def project(
+    queryset: QuerySet, schema: type[Schema], extra: tuple[str, ...] = ()
+) -> QuerySet:
+    """``queryset`` loading only the columns ``schema`` renders (plus the pk)."""
+    return queryset.only(*schema_columns(schema, queryset.model, extra))
@@ -0,0 +1,39 @@
+import pytest
+
+from main.projection import project, schema_columns
+from scenes.factories import SceneFactory
+from scenes.models import Scene
+from scenes.schemas import MiniSceneSchema, SceneMetaSchema
+
+
+def test_schema_columns_maps_fields_and_foreign_keys():
+    # `author` is resolved off author_id; the FK field name loads that column.
+    assert set(schema_columns(MiniSceneSchema, Scene)) == {
+        "title",
+        "key",
+        "author",
+        "created_date",
+        "modified_date",
+        "archived",
+    }
+
+
+def test_schema_columns_appends_extra():
+    assert schema_columns(SceneMetaSchema, Scene, ("modified_date",)) == (
+        "title",
+        "modified_date",
+    )
+
+
+@pytest.mark.django_db
+def test_project_skips_unrendered_columns(django_assert_num_queries):
+    SceneFactory.create_batch(2)
+    with django_assert_num_queries(1) as ctx:
+        scenes = list(project(Scene.objects.all(), MiniSceneSchema))
+        # Rendering touches only projected fields: no per-row refetch.
+        [MiniSceneSchema.model_validate(scene).model_dump() for scene in scenes]
+    sql = ctx.captured_queries[0]["sql"]
+    table = Scene._meta.db_table
+    assert f'"{table}"."author_id"' in sql
+    assert f'"{table}"."items"' not in sql
+    assert f'"{table}"."item_order"' not in sql
@@ -66,12 +66,45 @@ APP_BASE_URL = ENV.APP_BASE_URL
 SCREENSHOTS_ORIGIN = ENV.SCREENSHOTS_ORIGIN
 RENDER_SECRET = ENV.RENDER_SECRET  # noqa: S105 (name, not a secret literal) pragma: allowlist secret
 
+# Edge caching of public scene reads and purge-on-write (scenes/edge.py).
+# Unset purge URL ⇒ purging is dark; edge copies expire at their s-maxage.
+SCENE_CACHE_CONTROL = ENV.SCENE_CACHE_CONTROL
+SCENE_META_CACHE_CONTROL = ENV.SCENE_META_CACHE_CONTROL
+EDGE_PURGE_URL = ENV.EDGE_PURGE_URL
+EDGE_PURGE_SECRET = ENV.EDGE_PURGE_SECRET  # noqa: S105 pragma: allowlist secret
+
 # Per-period reservation caps (ADR-0002 cost protection). Plain constants: they
 # rarely change and aren't secret. Monthly ceiling bounds spend to ≤ $10;
 # daily is an anti-burst sub-cap.
 RENDER_MONTHLY_CAP = 1500
 RENDER_DAILY_CAP = 150
 
+# Render outbox retries (ADR-0003): a failed nudge is retried after
+# RENDER_RETRY_BACKOFF seconds, doubling per attempt, and dropped after
+# RENDER_OUTBOX_MAX_ATTEMPTS (30s .. 8min, ~16 min in all).
+RENDER_RETRY_BACKOFF = 30
+RENDER_OUTBOX_MAX_ATTEMPTS = 6
+
+# Quiet period, in seconds, before an edited scene is rendered: each content
+# edit pushes its queued render this far out, so a burst of autosaves spends
+# one render slot, not one per save. Creates are not delayed (first share
+# should show an image).
+RENDER_DEBOUNCE_SECONDS = 60
+
+# Seconds a worker buffers scene views before writing them to times_accessed
+# in one bulk UPDATE (scenes/view_counts.py). Bounds how stale the counter is.
+SCENE_VIEW_FLUSH_INTERVAL = 30
+
+# Prometheus metrics (main/metrics.py): seconds a worker buffers increments
+# before adding them to the shared MetricSeries table. GET /metrics requires
+# METRICS_TOKEN as a bearer token; unset ⇒ the endpoint is dark.
+METRICS_FLUSH_INTERVAL = 15
+METRICS_TOKEN = ENV.METRICS_TOKEN  # noqa: S105 pragma: allowlist secret
+
+# Opt-in per-request query/timing instrumentation (main/middleware.py).
+REQUEST_INSTRUMENTATION = ENV.REQUEST_INSTRUMENTATION
+SLOW_REQUEST_MS = ENV.SLOW_REQUEST_MS
+
 DEBUG = False
 
 # Secure cookie defaults — only relaxed for local dev (no TLS).
@@ -174,6 +207,9 @@ SITE_ID = 1
 NINJA_PAGINATION_PER_PAGE = 20
 
 MIDDLEWARE = [
+    # Outermost, so it times the whole stack. Drops out unless
+    # REQUEST_INSTRUMENTATION is set.
+    "main.middleware.RequestInstrumentationMiddleware",
     # Must precede CorsMiddleware; see the class docstring.
     "main.middleware.ScopedCorsCredentialsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -301,6 +337,26 @@ DATABASES = {
     )
 }
 
+# Caches
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+#
+# `scenes` backs the read-through cache for GET /v1/scenes/{key}/
+# (scenes/cache.py). LocMemCache is a bounded LRU (MAX_ENTRIES) private to each
+# process, so a write only invalidates its own worker's copy; TIMEOUT bounds how
+# long the other workers can serve a stale scene. Swap in a shared backend to
+# make invalidation global.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "scenes": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "scenes",
+        "TIMEOUT": 60,
+        "OPTIONS": {"MAX_ENTRIES": 500},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -19,11 +19,12 @@ from django.http import HttpResponseRedirect
 from django.urls import include, path
 
 from main.api import api
-from main.views import health
+from main.views import health, prometheus_metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("health", health),
+    path("metrics", prometheus_metrics),
     path("v1/", api.urls),
     path("_allauth/", include("allauth.headless.urls")),
     path("", lambda request: HttpResponseRedirect("/v1/docs")),
@@ -1,7 +1,14 @@
+import hmac
+
 from django.conf import settings
-from django.http import HttpRequest, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.utils import timezone
 from django.views.decorators.http import require_safe
 
+from main import metrics
+from main.models import MetricSeries
+from scenes.models import RenderDay, RenderMonth, RenderRequest
+
 
 @require_safe
 def health(request: HttpRequest) -> JsonResponse:
@@ -12,3 +19,59 @@ def health(request: HttpRequest) -> JsonResponse:
     clients, and its URL is stable across API versions.
     """
     return JsonResponse({"status": "ok", "version": settings.APP_VERSION})
+
+
+@require_safe
+def prometheus_metrics(request: HttpRequest) -> HttpResponse:
+    """Prometheus scrape target: the shared counters (main/metrics.py) plus
+    gauges read at scrape time from the render ledgers.
+
+    A plain Django view for the same reasons as ``health``. Requires
+    ``Authorization: Bearer <METRICS_TOKEN>``; with no token configured it
+    404s, like any other unconfigured feature.
+    """
+    token = settings.METRICS_TOKEN
+    given = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not token or not hmac.compare_digest(given.encode(), token.encode()):
+        raise Http404
+    # This worker's buffer; the others' reach the table within
+    # METRICS_FLUSH_INTERVAL.
+    metrics.flush()
+
+    today = timezone.now().date()
+    day = RenderDay.objects.filter(day=today).first()
+    month = RenderMonth.objects.filter(month=today.replace(day=1)).first()
+    gauges: metrics.Gauges = {
+        "math3d_render_reservations": (
+            "Render slots reserved in the current UTC period.",
+            [
+                ('period="day"', day.count if day else 0),
+                ('period="month"', month.count if month else 0),
+            ],
+        ),
+        "math3d_render_outbox_pending": (
+            "Scene keys queued in the render outbox.",
+            [("", RenderRequest.objects.count())],
+        ),
+        "math3d_render_cap": (
+            "Render slot cap per UTC period.",
+            [
+                ('period="day"', settings.RENDER_DAILY_CAP),
+                ('period="month"', settings.RENDER_MONTHLY_CAP),
+            ],
+        ),
+    }
+    lookups = dict(
+        MetricSeries.objects.filter(
+            name="math3d_scene_cache_lookups_total"
+        ).values_list("labels", "value")
+    )
+    hits, misses = lookups.get('result="hit"', 0), lookups.get('result="miss"', 0)
+    if hits + misses:
+        gauges["math3d_scene_cache_hit_ratio"] = (
+            "Scene cache hits over lookups, since the counters began.",
+            [("", hits / (hits + misses))],
+        )
+    return HttpResponse(
+        metrics.render(gauges), content_type="text/plain; version=0.0.4"
+    )
@@ -1,5 +1,8 @@
+import pytest
 from django.test import Client, override_settings
 
+from scenes.factories import SceneFactory
+
 
 @override_settings(APP_VERSION="2026.07.03.1")
 def test_health_endpoint_reports_ok_and_version():
@@ -16,3 +19,36 @@ def test_health_endpoint_allows_head():
 
 def test_health_endpoint_rejects_unsafe_methods():
     assert Client().post("/health").status_code == 405
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("header", [None, "Bearer wrong"])
+@override_settings(METRICS_TOKEN="scrape")  # pragma: allowlist secret
+def test_metrics_requires_the_token(header):
+    headers = {"Authorization": header} if header else {}
+    assert Client().get("/metrics", headers=headers).status_code == 404
+
+
+@override_settings(METRICS_TOKEN="")
+def test_metrics_is_dark_without_a_token():
+    assert (
+        Client().get("/metrics", headers={"Authorization": "Bearer "}).status_code
+        == 404
+    )
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_TOKEN="scrape")  # pragma: allowlist secret
+def test_metrics_exports_operation_latency_and_ledger():
+    scene = SceneFactory.create(archived=False)
+    Client().get(f"/v1/scenes/{scene.key}/")
+    Client().get(f"/v1/scenes/{scene.key}/")
+    response = Client().get("/metrics", headers={"Authorization": "Bearer scrape"})
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert 'math3d_request_duration_seconds_count{operation="get_scene"}' in body
+    assert 'math3d_scene_reads_total{kind="scene"}' in body
+    assert 'math3d_render_cap{period="month"} 1500' in body
+    assert 'math3d_render_reservations{period="day"} 0' in body
+    assert "math3d_scene_cache_hit_ratio " in body
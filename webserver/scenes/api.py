@@ -1,67 +1,447 @@
-from typing import List
+import json
+from typing import List, NoReturn, Optional, cast
 
-from django.db.models import F
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from ninja import Query, Router, Status
 from ninja.errors import HttpError
-from ninja.pagination import LimitOffsetPagination, paginate
+from ninja.pagination import paginate
+from ninja.responses import NinjaJSONEncoder
 
+from main import metrics
 from main.ninja_auth import session_auth
-from scenes.legacy_scene_utils.migrate_scene import migrate_scene
+from main.projection import project, schema_columns
+from scenes.cache import (
+    CachedScene,
+    cache_scene,
+    cache_scenes,
+    get_cached_scene,
+    get_cached_scenes,
+    invalidate_scene,
+    invalidate_scenes,
+)
+from scenes.conditional import (
+    check_not_modified,
+    is_conditional,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from scenes.edge import edge_headers, schedule_purge
+from scenes.legacy_scene_utils.migrate_scene import (
+    TRANSLATOR_VERSION,
+    migrate_scene,
+    migrate_scenes,
+)
 from scenes.models import LegacyScene, Scene
+from scenes.pagination import ScenePagination
 from scenes.schemas import (
     LegacySceneInSchema,
     LegacySceneOutSchema,
     MiniSceneSchema,
+    SceneBatchResultSchema,
+    SceneBatchSchema,
+    SceneBulkResultSchema,
+    SceneBulkSchema,
     SceneCreateSchema,
     SceneFilterSchema,
+    SceneItemsPatchSchema,
     SceneMetaSchema,
     ScenePatchSchema,
     SceneSchema,
+    SceneSearchSchema,
 )
 from scenes.screenshots import schedule_render
+from scenes.search import find_scenes
+from scenes.serialization import CONTENT_TYPE, SERIALIZATION_VERSION, serialize_scene
+from scenes.view_counts import record_legacy_view, record_scene_view
 
 scenes_router = Router()
 
 
-def _require_owner(scene: Scene, request, action: str) -> None:
-    """Raise 403 unless the requester owns the scene."""
-    if scene.author_id != request.user.id:
-        raise HttpError(403, f"You do not have permission to {action} this scene.")
+def _deny_write(key: str, action: str) -> NoReturn:
+    """After an owner-scoped write matched no row: 404 if there's no such
+    scene, else 403. Only failed writes pay for this lookup."""
+    if not Scene.objects.filter(key=key).exists():
+        raise Http404
+    raise HttpError(403, f"You do not have permission to {action} this scene.")
+
+
+# Owner-scoped writes are raw SQL: the ORM's update() can't return the row
+# (the response body needs it) and delete() goes through the cascade
+# collector. Nothing references Scene by foreign key, so a plain DELETE
+# loses nothing. The WHERE clause is the permission check, so ownership is
+# checked and the write done in one round trip, without first loading the
+# items blob just to compare author_id.
+_SCENE = Scene._meta.db_table
+_FIELDS = {field.name: field for field in Scene._meta.concrete_fields}
+
+
+def _columns(names) -> str:
+    return ", ".join(
+        connection.ops.quote_name(cast(str, _FIELDS[name].column)) for name in names
+    )
+
+
+# What serialize_scene() reads, plus the pk RawQuerySet requires.
+_SERIALIZED_COLUMNS = _columns(("id", *schema_columns(SceneSchema, Scene)))
+
+
+def _update_owned(key: str, author_id: int, values: dict) -> Optional[Scene]:
+    """Set ``values`` (field name -> value) and bump ``modified_date`` on the
+    scene ``key`` if ``author_id`` owns it. Returns the updated scene, or
+    None if no row matched. The stored body is cleared in the same
+    statement, so a GET can never serve the pre-edit body; the caller
+    stores the new one."""
+    values = {**values, "modified_date": timezone.now()}
+    fields = [_FIELDS[name] for name in values]
+    assignments = ", ".join(
+        f"{connection.ops.quote_name(cast(str, field.column))} = %s" for field in fields
+    )
+    params = [
+        field.get_db_prep_save(values[field.name], connection) for field in fields
+    ]
+    updated = Scene.objects.raw(
+        f"UPDATE {_SCENE} SET {assignments}, serialized = NULL "
+        f"WHERE key = %s AND author_id = %s RETURNING {_SERIALIZED_COLUMNS}",
+        [*params, key, author_id],
+    )
+    return next(iter(updated), None)
+
+
+# Applies a SceneItemsPatchSchema to the stored JSON in the UPDATE itself:
+# the items are never read into Python, and two concurrent deltas to one
+# scene both land, since Postgres re-evaluates the SET against the row
+# version the first one wrote. Stored items keep their positions (the
+# array's order is immaterial; itemOrder is the layout); new ids are
+# appended in request order. A removed id leaves itemOrder both as a key
+# (a removed folder's child list) and from every list that names it.
+_PATCH_ITEMS_SQL = f"""
+    WITH upsert AS (
+        SELECT item, ord
+        FROM jsonb_array_elements(%(upsert)s::jsonb) WITH ORDINALITY AS u(item, ord)
+    )
+    UPDATE {_SCENE} AS scene SET
+        items = (
+            SELECT COALESCE(jsonb_agg(item ORDER BY appended, ord), '[]'::jsonb)
+            FROM (
+                SELECT COALESCE(upsert.item, stored.item) AS item,
+                       false AS appended, stored.ord
+                FROM jsonb_array_elements(scene.items)
+                     WITH ORDINALITY AS stored(item, ord)
+                LEFT JOIN upsert ON upsert.item->'id' = stored.item->'id'
+                WHERE stored.item->>'id' <> ALL(%(remove)s::text[])
+                UNION ALL
+                SELECT upsert.item, true, upsert.ord
+                FROM upsert
+                WHERE NOT EXISTS (
+                    SELECT FROM jsonb_array_elements(scene.items) AS stored(item)
+                    WHERE stored.item->'id' = upsert.item->'id'
+                )
+            ) AS merged
+        ),
+        item_order = COALESCE(
+            (
+                SELECT jsonb_object_agg(entry.key, (
+                    SELECT COALESCE(jsonb_agg(child ORDER BY ord), '[]'::jsonb)
+                    FROM jsonb_array_elements(entry.value)
+                         WITH ORDINALITY AS children(child, ord)
+                    WHERE child #>> '{{}}' <> ALL(%(remove)s::text[])
+                ))
+                FROM jsonb_each(scene.item_order - %(remove)s::text[]) AS entry
+            ),
+            '{{}}'::jsonb
+        ) || %(item_order)s::jsonb,
+        modified_date = %(now)s,
+        serialized = NULL
+    WHERE scene.key = %(key)s AND scene.author_id = %(author_id)s
+    RETURNING {_columns(("id", *schema_columns(MiniSceneSchema, Scene)))}
+"""
+
+
+def _delete_owned(key: str, author_id: int) -> bool:
+    with connection.cursor() as cur:
+        cur.execute(
+            f"DELETE FROM {_SCENE} WHERE key = %s AND author_id = %s",
+            [key, author_id],
+        )
+        return cur.rowcount > 0
+
+
+# Bulk writes are one statement: the owner-scoped write in a CTE, joined
+# back to which of the keys exist at all, so each key's outcome (written,
+# someone else's, missing) comes back with the write. Updates clear the
+# stored body, which the next GET regenerates.
+_BULK_WRITES = {
+    "archive": f"UPDATE {_SCENE} SET archived = true",
+    "unarchive": f"UPDATE {_SCENE} SET archived = false",
+    "retitle": f"UPDATE {_SCENE} SET title = %(title)s",
+    "delete": f"DELETE FROM {_SCENE}",
+}
+_BULK_SQL = f"""
+    WITH target AS (
+        SELECT key FROM {_SCENE} WHERE key = ANY(%(keys)s::text[])
+    ), written AS (
+        {{write}}
+        WHERE key = ANY(%(keys)s::text[]) AND author_id = %(author_id)s
+        RETURNING key
+    )
+    SELECT target.key, written.key IS NOT NULL
+    FROM target LEFT JOIN written USING (key)
+"""
+
+
+def _bulk_owned(
+    action: str, keys: list[str], author_id: int, title: Optional[str]
+) -> dict[str, str]:
+    """Apply ``action`` to those of ``keys`` that ``author_id`` owns. Returns
+    each key's outcome: "ok", "forbidden" or "not_found"."""
+    write = _BULK_WRITES[action]
+    if action != "delete":
+        write += ", modified_date = %(now)s, serialized = NULL"
+    results = dict.fromkeys(keys, "not_found")
+    with connection.cursor() as cur:
+        cur.execute(
+            _BULK_SQL.format(write=write),
+            {
+                "keys": keys,
+                "author_id": author_id,
+                "title": title,
+                "now": timezone.now(),
+            },
+        )
+        for key, written in cur.fetchall():
+            results[key] = "ok" if written else "forbidden"
+    return results
+
+
+def _scene_response(body: bytes, status: int = 200) -> HttpResponse:
+    """A ``SceneSchema`` response from a pre-serialized body. Returning an
+    HttpResponse bypasses ninja's response validation; ``body`` already has
+    exactly the bytes ninja would render (scenes/serialization.py)."""
+    return HttpResponse(body, status=status, content_type=CONTENT_TYPE)
+
+
+def _with_stale_legacy(scenes):
+    """Annotate ``scenes`` with ``stale_legacy``: whether each came from a
+    LegacyScene not yet migrated under the current TRANSLATOR_VERSION. The
+    EXISTS is a unique-index probe."""
+    return scenes.annotate(
+        stale_legacy=Exists(
+            LegacyScene.objects.filter(key=OuterRef("key")).exclude(
+                translator_version=TRANSLATOR_VERSION
+            )
+        )
+    )
+
+
+def _scene_row(key: str, *fields: str):
+    """``fields`` of the Scene at ``key`` (or None), plus ``stale_legacy``.
+    One query."""
+    return (
+        _with_stale_legacy(Scene.objects.filter(key=key))
+        .values_list(*fields, "stale_legacy", named=True)
+        .first()
+    )
+
+
+def _migrate_stale_legacy(key: str) -> bool:
+    """Migrate the LegacyScene at ``key`` if it is un-migrated or was migrated
+    by an older translator. False if there is nothing to migrate."""
+    legacy = (
+        LegacyScene.objects.filter(key=key)
+        .exclude(translator_version=TRANSLATOR_VERSION)
+        .first()
+    )
+    if legacy is None:
+        return False
+    # migrate_scene copies the legacy count, which lags by the views still
+    # buffered — harmless for a counter.
+    record_legacy_view(key)
+    migrate_scene(legacy)
+    return True
+
+
+def _serialized_scene(key: str) -> CachedScene:
+    """The stored GET body for ``key`` and its ``modified_date``, from a
+    narrow column fetch, migrating a legacy key first if it needs it.
+
+    A body that is missing (bulk writes bypass ``Scene.save()``) or stamped
+    with an old SERIALIZATION_VERSION is regenerated and written back. The
+    write-back is conditional on ``modified_date`` so it can't overwrite the
+    body of a save that landed in between.
+    """
+    fields = ("serialized", "serialized_version", "modified_date")
+    row = _scene_row(key, *fields)
+    if (row is None or row.stale_legacy) and _migrate_stale_legacy(key):
+        row = _scene_row(key, *fields)
+    if row is None:
+        raise Http404
+    if row.serialized is not None and row.serialized_version == SERIALIZATION_VERSION:
+        return bytes(row.serialized), row.modified_date
+    scene = Scene.objects.get(key=key)
+    return _store_serialized(scene), scene.modified_date
+
+
+def _store_serialized(scene: Scene) -> bytes:
+    """Regenerate ``scene``'s stored GET body and write it back, unless a save
+    has landed since ``scene`` was read."""
+    body = serialize_scene(scene)
+    Scene.objects.filter(pk=scene.pk, modified_date=scene.modified_date).update(
+        serialized=body, serialized_version=SERIALIZATION_VERSION
+    )
+    return body
+
+
+def _scenes_by_key(keys: list[str], *fields: str) -> dict[str, Scene]:
+    """The Scenes at ``keys`` with only ``fields`` loaded, from one
+    ``key IN (...)`` query. Legacy keys that are un-migrated or due for
+    re-migration are migrated first, together, and fetched again."""
+
+    def fetch(keys):
+        # defer(None) first: only() alone keeps the manager's deferral of
+        # `serialized`, which would then be loaded by a query per scene.
+        scenes = _with_stale_legacy(Scene.objects.filter(key__in=keys)).defer(None)
+        return {scene.key: scene for scene in scenes.only("key", *fields)}
+
+    scenes = fetch(keys)
+    stale = [key for key in keys if key not in scenes or scenes[key].stale_legacy]
+    if stale:
+        legacy = list(
+            LegacyScene.objects.filter(key__in=stale).exclude(
+                translator_version=TRANSLATOR_VERSION
+            )
+        )
+        if legacy:
+            migrate_scenes(legacy)
+            scenes.update(fetch([scene.key for scene in legacy]))
+    return scenes
+
+
+def _serialized_scenes(keys: list[str]) -> dict[str, CachedScene]:
+    """``_serialized_scene`` for many keys, read through the cache. Keys with
+    no scene are absent."""
+    cached = get_cached_scenes(keys)
+    misses = [key for key in keys if key not in cached]
+    if not misses:
+        return cached
+    scenes = _scenes_by_key(misses, "serialized", "serialized_version", "modified_date")
+    fetched = {
+        key: (bytes(scene.serialized), scene.modified_date)
+        for key, scene in scenes.items()
+        if scene.serialized is not None
+        and scene.serialized_version == SERIALIZATION_VERSION
+    }
+    # Bodies that are missing or stale: one query for the full rows, then a
+    # conditional write-back each, as in _serialized_scene.
+    if len(fetched) < len(scenes):
+        for scene in Scene.objects.filter(key__in=scenes.keys() - fetched.keys()):
+            fetched[scene.key] = _store_serialized(scene), scene.modified_date
+    cache_scenes(fetched)
+    return {**cached, **fetched}
+
+
+def _batch_response(bodies: dict[str, bytes]) -> HttpResponse:
+    """A ``SceneBatchResultSchema`` response, spliced from per-scene bodies
+    with the separators ninja's renderer uses."""
+    entries = b", ".join(
+        json.dumps(key).encode() + b": " + body for key, body in bodies.items()
+    )
+    return HttpResponse(b'{"scenes": {' + entries + b"}}", content_type=CONTENT_TYPE)
+
+
+def _scene_etag(key: str, modified_date) -> str:
+    # Strong: a (key, modified_date, SERIALIZATION_VERSION) triple determines
+    # the body byte-for-byte.
+    return make_etag(key, modified_date.isoformat())
 
 
 @scenes_router.get("/", response=List[MiniSceneSchema], auth=None, by_alias=True)
-@paginate(LimitOffsetPagination)
-def list_scenes(request, filters: SceneFilterSchema = Query(...)):
-    return filters.filter(Scene.objects.all())
+@paginate(ScenePagination)
+def list_scenes(
+    request, response: HttpResponse, filters: SceneFilterSchema = Query(...)
+):
+    return project(filters.filter(Scene.objects.all()), MiniSceneSchema)
 
 
 @scenes_router.get(
     "/me/", response=List[MiniSceneSchema], auth=session_auth, by_alias=True
 )
-@paginate(LimitOffsetPagination)
-def my_scenes(request, filters: SceneFilterSchema = Query(...)):
-    return filters.filter(Scene.objects.filter(author_id=request.user.id))
+@paginate(ScenePagination)
+def my_scenes(request, response: HttpResponse, filters: SceneFilterSchema = Query(...)):
+    return project(
+        filters.filter(Scene.objects.filter(author_id=request.user.id)),
+        MiniSceneSchema,
+    )
+
+
+# Shadows a scene keyed "search", as /me/ shadows "me"; random keys don't
+# collide in practice.
+@scenes_router.get("/search/", response=List[MiniSceneSchema], auth=None, by_alias=True)
+def search_scenes(request, params: SceneSearchSchema = Query(...)):
+    """Scenes whose title or item descriptions match ``q``, best match first.
+
+    Full-text (stemmed, websearch syntax) over titles and item descriptions,
+    plus fuzzy title matching. Archived scenes are excluded.
+    """
+    scenes = project(Scene.objects.filter(archived=False), MiniSceneSchema)
+    return find_scenes(scenes, params.q, params.limit)
+
+
+@scenes_router.post(
+    "/batch/", response=SceneBatchResultSchema, auth=None, by_alias=True
+)
+def batch_scenes(request, payload: SceneBatchSchema):
+    """Fetch many scenes by key in one request.
+
+    ``fields: "full"`` returns each scene as ``GET /{key}/`` does (and counts
+    a view of each); ``"mini"`` returns the fields the list endpoints return,
+    without loading items. Legacy keys are migrated as on GET. Keys with no
+    scene are left out of the result.
+    """
+    keys = list(dict.fromkeys(payload.keys))
+    if payload.fields == "full":
+        scenes = _serialized_scenes(keys)
+        bodies = {key: scenes[key][0] for key in keys if key in scenes}
+        for key in bodies:
+            record_scene_view(key)
+    else:
+        scenes = _scenes_by_key(keys, *schema_columns(MiniSceneSchema, Scene))
+        bodies = {
+            key: json.dumps(
+                MiniSceneSchema.model_validate(scenes[key]).model_dump(by_alias=True),
+                cls=NinjaJSONEncoder,
+            ).encode()
+            for key in keys
+            if key in scenes
+        }
+    metrics.inc("math3d_scene_reads_total", len(bodies), kind="batch")
+    return _batch_response(bodies)
 
 
 @scenes_router.post("/", response={201: SceneSchema}, auth=None, by_alias=True)
 def create_scene(request, payload: SceneCreateSchema):
     author = request.user if request.user.is_authenticated else None
     scene = Scene(
-        items=[item.model_dump(mode="json") for item in payload.items],
-        item_order=payload.item_order,
-        archived=payload.archived,
-        author=author,
+        item_order=payload.item_order, archived=payload.archived, author=author
     )
+    # Validated once, by ninja parsing the payload; save() reuses that.
+    scene.set_validated_items([item.model_dump(mode="json") for item in payload.items])
     if payload.title is not None:
         scene.title = payload.title
-    scene.save()  # full_clean() re-validates items (defense in depth)
+    scene.save()
+    metrics.inc("math3d_scene_writes_total", op="create")
+    invalidate_scene(scene.key)
     schedule_render(scene.key)
-    return Status(201, scene)
+    return _scene_response(cast(bytes, scene.serialized), status=201)  # set by save()
 
 
 @scenes_router.get("/{key}/meta/", response=SceneMetaSchema, auth=None)
-def get_scene_meta(request, key: str):
+def get_scene_meta(request, key: str, response: HttpResponse):
     """Read-only title lookup for the edge OG Worker.
 
     Serves only migrated (``Scene``) scenes, and does so with no side effects:
@@ -70,57 +450,160 @@ def get_scene_meta(request, key: str):
     then serves the branded default card, and the scene picks up per-scene
     metadata once it's opened in-app (which migrates it).
     """
-    scene = get_object_or_404(Scene.objects.only("title"), key=key)
+    scene = get_object_or_404(Scene.objects.only("title", "modified_date"), key=key)
+    etag = make_etag(key, scene.modified_date.isoformat(), "meta")
+    headers = edge_headers(key, settings.SCENE_META_CACHE_CONTROL)
+    check_not_modified(request, etag, scene.modified_date, headers)
+    set_validators(response, etag, scene.modified_date, headers)
     return {"title": scene.title}
 
 
 @scenes_router.get("/{key}/", response=SceneSchema, auth=None, by_alias=True)
 def get_scene(request, key: str):
-    if LegacyScene.objects.filter(key=key).exists():
-        # v0 parity: re-migrate on every legacy-key GET. The .update() below then
-        # stacks on the count migrate_scene carries over — harmless for a view counter.
-        legacy = LegacyScene.objects.get(key=key)
-        legacy.times_accessed += 1
-        legacy.save()
-        migrate_scene(legacy)
-
-    scene = get_object_or_404(Scene, key=key)
-    # Atomic counter that skips Scene.save()'s full_clean() and modified_date
-    # bump (viewing is not modifying); fixes the v0 no-save bug.
-    Scene.objects.filter(pk=scene.pk).update(times_accessed=F("times_accessed") + 1)
-    scene.times_accessed += 1  # reflect on the in-memory instance for the response
-    return scene
+    headers = edge_headers(key, settings.SCENE_CACHE_CONTROL)
+    metrics.inc("math3d_scene_reads_total", kind="scene")
+    cached = get_cached_scene(key)
+    if cached is None and is_conditional(request):
+        # Revalidation on a cache miss: answer from modified_date alone,
+        # before the body is fetched. A legacy key that is un-migrated (no row
+        # yet) or due for re-migration takes the full path below.
+        row = _scene_row(key, "modified_date")
+        if (
+            row is not None
+            and not row.stale_legacy
+            and (
+                response := not_modified(
+                    request,
+                    _scene_etag(key, row.modified_date),
+                    row.modified_date,
+                    headers,
+                )
+            )
+        ):
+            record_scene_view(key)
+            return response
+    if cached is None:
+        # A legacy key is migrated on its first GET and again only after a
+        # TRANSLATOR_VERSION bump (v0 re-migrated on every GET); otherwise
+        # this is a single Scene query.
+        cached = _serialized_scene(key)
+        cache_scene(key, cached)
+    body, modified_date = cached
+    # Buffered (scenes/view_counts.py): no write on the read path, and never
+    # Scene.save()'s full_clean() and modified_date bump (viewing is not
+    # modifying); fixes the v0 no-save bug. A 304 is still a view.
+    record_scene_view(key)
+    etag = _scene_etag(key, modified_date)
+    if response := not_modified(request, etag, modified_date, headers):
+        return response
+    response = _scene_response(body)
+    set_validators(response, etag, modified_date, headers)
+    return response
 
 
 @scenes_router.patch("/{key}/", response=SceneSchema, auth=session_auth, by_alias=True)
 def update_scene(request, key: str, payload: ScenePatchSchema):
-    scene = get_object_or_404(Scene, key=key)
-    _require_owner(scene, request, "modify")
-    data = payload.dict(exclude_unset=True)
-    if "items" in data:
-        scene.items = [item.model_dump(mode="json") for item in payload.items]
-    if "item_order" in data:
-        scene.item_order = data["item_order"]
-    if "title" in data:
-        scene.title = data["title"]
-    if "archived" in data:
-        scene.archived = data["archived"]
-    scene.save()
+    # Items are excluded so they're dumped once, below, not twice.
+    values = payload.dict(exclude_unset=True, exclude={"items"})
+    if "items" in payload.model_fields_set:
+        # Validated once, by ninja parsing the payload. That is also all
+        # full_clean() would check, so the write skips it.
+        values["items"] = [item.model_dump(mode="json") for item in payload.items]
+    scene = _update_owned(key, request.user.id, values)
+    if scene is None:
+        _deny_write(key, "modify")
+    if "items" in values:
+        scene.set_validated_items(values["items"])
+    else:
+        # Every writer stores items dumped from validated MathItem models
+        # (this API, pull_scenes, legacy migration), so they are rendered as
+        # stored, as Scene.save() does for a title-only save.
+        scene.items_validated = True
+    body = serialize_scene(scene)
+    # Conditional, like _serialized_scene's write-back: a later save's body
+    # must not be overwritten by this one.
+    Scene.objects.filter(pk=scene.pk, modified_date=scene.modified_date).update(
+        serialized=body, serialized_version=SERIALIZATION_VERSION
+    )
+    metrics.inc("math3d_scene_writes_total", op="update")
+    invalidate_scene(scene.key)
+    schedule_purge(scene.key)
     # Only content edits change the rendered PNG; a title/archived-only patch
-    # must not burn a render slot (bulk archive/rename would drain the cap).
-    if data.keys() & {"items", "item_order"}:
-        schedule_render(scene.key)
+    # must not burn a render slot.
+    # Debounced: an editing session's saves coalesce into one render.
+    if payload.model_fields_set & {"items", "item_order"}:
+        schedule_render(scene.key, delay=settings.RENDER_DEBOUNCE_SECONDS)
+    return _scene_response(body)
+
+
+@scenes_router.patch(
+    "/{key}/items/", response=MiniSceneSchema, auth=session_auth, by_alias=True
+)
+def patch_scene_items(request, key: str, payload: SceneItemsPatchSchema):
+    """Edit some of a scene's items without resending the rest.
+
+    Only the upserted items are validated, and the stored items are patched
+    in place by the database. The response is the scene's metadata, not its
+    body: the stored GET body is regenerated by the next read rather than
+    rendered on every autosave. An empty delta writes nothing.
+    """
+    if not (payload.upsert or payload.remove or payload.item_order):
+        scene = project(
+            Scene.objects.filter(key=key, author_id=request.user.id), MiniSceneSchema
+        ).first()
+        if scene is None:
+            _deny_write(key, "modify")
+        return scene
+    params = {
+        "upsert": json.dumps([item.model_dump(mode="json") for item in payload.upsert]),
+        "remove": payload.remove,
+        "item_order": json.dumps(payload.item_order),
+        "now": timezone.now(),
+        "key": key,
+        "author_id": request.user.id,
+    }
+    scene = next(iter(Scene.objects.raw(_PATCH_ITEMS_SQL, params)), None)
+    if scene is None:
+        _deny_write(key, "modify")
+    metrics.inc("math3d_scene_writes_total", op="update_items")
+    invalidate_scene(key)
+    schedule_purge(key)
+    schedule_render(key, delay=settings.RENDER_DEBOUNCE_SECONDS)
     return scene
 
 
 @scenes_router.delete("/{key}/", response={204: None}, auth=session_auth)
 def delete_scene(request, key: str):
-    scene = get_object_or_404(Scene, key=key)
-    _require_owner(scene, request, "delete")
-    scene.delete()
+    if not _delete_owned(key, request.user.id):
+        _deny_write(key, "delete")
+    metrics.inc("math3d_scene_writes_total", op="delete")
+    invalidate_scene(key)
+    schedule_purge(key)
     return Status(204, None)  # matches authentication/api.py's Status(204, None)
 
 
+@scenes_router.post(
+    "/me/bulk/", response=SceneBulkResultSchema, auth=session_auth, by_alias=True
+)
+def bulk_update_scenes(request, payload: SceneBulkSchema):
+    """Archive, unarchive, delete or retitle many of your scenes at once.
+
+    Keys you don't own, or that don't exist, are reported and left alone;
+    the rest are written in one statement.
+    """
+    keys = list(dict.fromkeys(payload.keys))
+    results = _bulk_owned(payload.action, keys, request.user.id, payload.title)
+    written = [key for key, result in results.items() if result == "ok"]
+    if written:
+        metrics.inc(
+            "math3d_scene_writes_total", len(written), op=f"bulk_{payload.action}"
+        )
+        invalidate_scenes(written)
+        schedule_purge(*written)
+    # No renders: none of these actions changes what the PNG shows.
+    return {"results": results}
+
+
 legacy_router = Router()
 
 
@@ -133,6 +616,6 @@ def create_legacy(request, payload: LegacySceneInSchema):
 @legacy_router.get("/{key}/", response=LegacySceneOutSchema, auth=None)
 def get_legacy(request, key: str):
     scene = get_object_or_404(LegacyScene, key=key)
-    scene.times_accessed += 1
-    scene.save()
+    metrics.inc("math3d_scene_reads_total", kind="legacy")
+    record_legacy_view(key)
     return scene
@@ -1,14 +1,21 @@
+import datetime
 from unittest import mock
 
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from authentication.factories import CustomUserFactory
 from scenes.factories import SceneFactory
-from scenes.legacy_scene_utils.migrate_scene import migrate_scene
-from scenes.models import LegacyScene, Scene
+from scenes.cache import invalidate_scene
+from scenes.legacy_scene_utils import migrate_scene as migrate_scene_module
+from scenes.legacy_scene_utils.migrate_scene import TRANSLATOR_VERSION, migrate_scene
+from scenes.models import LegacyScene, RenderRequest, Scene
 from scenes.tests.data import default_scene
+from scenes.view_counts import flush as flush_view_counts
 
 LIST_URL = "/v1/scenes/"
 ME_URL = "/v1/scenes/me/"
@@ -31,8 +38,9 @@ def test_list_returns_limitoffset_envelope_id_asc():
     response = Client().get(LIST_URL)
     assert response.status_code == 200
     body = response.json()
-    assert set(body.keys()) == {"items", "count"}
+    assert set(body.keys()) == {"items", "count", "next"}
     assert body["count"] == 2
+    assert body["next"] is None
     keys = [item["key"] for item in body["items"]]
     assert keys == [s1.key, s2.key]  # id-asc (Scene.Meta.ordering = ["id"])
 
@@ -52,6 +60,15 @@ def test_list_item_shape_aliases_dates():
     assert "items" not in item and "itemOrder" not in item
 
 
+@pytest.mark.django_db
+def test_list_query_skips_item_columns(django_assert_num_queries):
+    SceneFactory.create()
+    with django_assert_num_queries(2) as ctx:  # count + page
+        Client().get(LIST_URL)
+    page_sql = ctx.captured_queries[-1]["sql"]
+    assert f'"{Scene._meta.db_table}"."items"' not in page_sql
+
+
 @pytest.mark.django_db
 def test_list_default_limit_is_20():
     for _ in range(21):
@@ -69,6 +86,14 @@ def test_list_title_filter_icontains():
     assert [i["title"] for i in body["items"]] == ["Alpha Curve"]
 
 
+@pytest.mark.django_db
+def test_list_title_filter_escapes_like_wildcards():
+    SceneFactory.create(title="50% off")
+    SceneFactory.create(title="500 points")
+    body = Client().get(LIST_URL, {"title": "50%"}).json()
+    assert [i["title"] for i in body["items"]] == ["50% off"]
+
+
 @pytest.mark.django_db
 def test_list_archived_filter():
     SceneFactory.create(archived=True)
@@ -122,6 +147,7 @@ def test_legacy_get_increments_and_saves_times_accessed():
     response = Client().get(f"{LEGACY_URL}{scene.key}/")
     assert response.status_code == 200
     assert response.json() == {"key": scene.key, "dehydrated": {"a": 1}}
+    flush_view_counts()  # views are buffered; see scenes/view_counts.py
     scene.refresh_from_db()
     assert scene.times_accessed == 1
 
@@ -229,6 +255,7 @@ def test_get_increments_and_persists_times_accessed():
     scene = SceneFactory.create()
     assert scene.times_accessed == 0
     Client().get(_detail(scene.key))
+    flush_view_counts()  # views are buffered; see scenes/view_counts.py
     scene.refresh_from_db()
     assert scene.times_accessed == 1
 
@@ -238,8 +265,9 @@ def test_get_does_not_bump_modified_date():
     scene = SceneFactory.create()
     before = scene.modified_date
     Client().get(_detail(scene.key))
+    flush_view_counts()
     scene.refresh_from_db()
-    assert scene.modified_date == before  # .update() counter, not save()
+    assert scene.modified_date == before  # bulk UPDATE counter, not save()
 
 
 @pytest.mark.django_db
@@ -256,6 +284,61 @@ def test_get_legacy_key_migrates_then_returns_scene():
     assert response.json()["isLegacy"] is True
 
 
+@pytest.mark.django_db
+def test_get_legacy_key_stamps_migration_marker():
+    legacy = LegacyScene.objects.create(dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+    Client().get(_detail(legacy.key))
+    legacy.refresh_from_db()
+    assert legacy.migrated_at is not None
+    assert legacy.translator_version == TRANSLATOR_VERSION
+
+
+@pytest.mark.django_db
+def test_get_migrated_legacy_key_is_one_query(django_assert_num_queries):
+    legacy = LegacyScene.objects.create(dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+    Client().get(_detail(legacy.key))
+    Scene.objects.filter(key=legacy.key).update(title="Edited", serialized=None)
+    invalidate_scene(legacy.key)
+    # Warm the stored body, so the next miss is the steady state.
+    Client().get(_detail(legacy.key))
+    invalidate_scene(legacy.key)
+    with mock.patch.object(migrate_scene_module, "ItemMigrator") as migrator:
+        with django_assert_num_queries(1):
+            response = Client().get(_detail(legacy.key))
+    migrator.assert_not_called()
+    assert response.json()["title"] == "Edited"  # not re-translated
+
+
+@pytest.mark.django_db
+def test_get_remigrates_legacy_key_after_translator_version_bump(monkeypatch):
+    legacy = LegacyScene.objects.create(dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+    Client().get(_detail(legacy.key))
+    Scene.objects.filter(key=legacy.key).update(title="Edited", serialized=None)
+    invalidate_scene(legacy.key)
+    monkeypatch.setattr(migrate_scene_module, "TRANSLATOR_VERSION", "next")
+    monkeypatch.setattr("scenes.api.TRANSLATOR_VERSION", "next")
+    assert Client().get(_detail(legacy.key)).json()["title"] == "Old"
+    legacy.refresh_from_db()
+    assert legacy.translator_version == "next"
+
+
+@pytest.mark.django_db
+def test_conditional_get_skips_304_for_stale_legacy_key(monkeypatch):
+    legacy = LegacyScene.objects.create(dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+    etag = Client().get(_detail(legacy.key)).headers["ETag"]
+    invalidate_scene(legacy.key)
+    monkeypatch.setattr(migrate_scene_module, "TRANSLATOR_VERSION", "next")
+    monkeypatch.setattr("scenes.api.TRANSLATOR_VERSION", "next")
+    with mock.patch.object(migrate_scene_module, "schedule_purge") as purge:
+        response = Client().get(_detail(legacy.key), headers={"If-None-Match": etag})
+    # Re-translated, so a new version: the old validators no longer match.
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    purge.assert_called_once_with(legacy.key)
+    legacy.refresh_from_db()
+    assert legacy.translator_version == "next"
+
+
 @pytest.mark.django_db
 def test_get_reserved_legacy_key_returns_404_not_500():
     # A legacy scene with a reserved key must not 500 the GET (constraint blocks creation).
@@ -269,6 +352,15 @@ def test_get_reserved_legacy_key_returns_404_not_500():
     assert resp.status_code == 404
 
 
+@pytest.mark.django_db
+def test_get_reserved_legacy_key_is_not_retried():
+    LegacyScene.objects.create(key="a", dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+    Client().get(_detail("a"))
+    with mock.patch("scenes.api.migrate_scene") as migrate:
+        assert Client().get(_detail("a")).status_code == 404
+    migrate.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_migrate_scene_reraises_non_key_validation_error(monkeypatch):
     # A legacy scene with a valid key but invalid items must fail loudly — the
@@ -302,6 +394,23 @@ def test_patch_author_can_update_title():
     assert scene.item_order == original_item_order
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("data", [{"title": "Renamed"}, {"archived": True}])
+def test_patch_renders_stored_items_without_validating_them(data):
+    """Every writer stores items dumped from validated MathItem models, so a
+    patch that leaves them alone doesn't validate them again."""
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me)
+    # Not a MathItem (no isCollapsed): validating it would fail the request.
+    stored = [{"id": "x", "type": "FOLDER", "properties": {"description": "d"}}]
+    Scene.objects.filter(pk=scene.pk).update(items=stored)
+    client = Client()
+    client.force_login(me)
+    resp = client.patch(_detail(scene.key), data=data, content_type="application/json")
+    assert resp.status_code == 200
+    assert resp.json()["items"] == stored
+
+
 @pytest.mark.django_db
 def test_patch_updates_item_order_only():
     # Pins that the camelCase-aliased `itemOrder` field round-trips through
@@ -373,7 +482,7 @@ def test_delete_anonymous_gets_403():
 
 @pytest.mark.django_db
 def test_delete_non_author_gets_403():
-    # v0 parity: the ownership check (_require_owner) must fire on DELETE, not just
+    # v0 parity: the ownership check (_deny_write) must fire on DELETE, not just
     # PATCH — a logged-in non-owner cannot delete someone else's scene.
     scene = SceneFactory.create(author=CustomUserFactory.create())
     other = CustomUserFactory.create()
@@ -383,6 +492,55 @@ def test_delete_non_author_gets_403():
     assert Scene.objects.filter(key=scene.key).exists()
 
 
+def _scene_queries(ctx) -> list[str]:
+    return [q["sql"] for q in ctx.captured_queries if "scenes_scene" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_patch_checks_ownership_in_the_update_itself():
+    """No read of the row (and its items) before the write: the owner-scoped
+    UPDATE, then the conditional write of the new stored body."""
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me, archived=False)
+    client = Client()
+    client.force_login(me)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.patch(
+            _detail(scene.key),
+            data={"title": "Renamed"},
+            content_type="application/json",
+        )
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Renamed"
+    queries = _scene_queries(ctx)
+    assert [sql.split()[0] for sql in queries] == ["UPDATE", "UPDATE"]
+    assert '"items" =' not in queries[0]
+    stored = Scene.objects.values_list("serialized", flat=True).get(pk=scene.pk)
+    assert bytes(stored) == resp.content
+
+
+@pytest.mark.django_db
+def test_delete_is_one_statement():
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me)
+    client = Client()
+    client.force_login(me)
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.delete(_detail(scene.key)).status_code == 204
+    assert [sql.split()[0] for sql in _scene_queries(ctx)] == ["DELETE"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method", ["patch", "delete"])
+def test_owner_scoped_write_to_unknown_key_is_404(method):
+    client = Client()
+    client.force_login(CustomUserFactory.create())
+    resp = getattr(client, method)(
+        _detail("nonexistent"), data={"title": "x"}, content_type="application/json"
+    )
+    assert resp.status_code == 404
+
+
 @pytest.mark.django_db
 def test_delete_author_gets_204():
     me = CustomUserFactory.create()
@@ -393,49 +551,410 @@ def test_delete_author_gets_204():
     assert not Scene.objects.filter(key=scene.key).exists()
 
 
-@pytest.mark.django_db(transaction=True)
-def test_create_scene_nudges_render_on_commit():
-    # transaction=True so on_commit fires as in production (autocommit views).
+@pytest.fixture
+def render_on(settings):
+    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
+    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
+
+
+@pytest.mark.django_db
+def test_create_scene_queues_render(render_on):
     # Build the body from default_scene() like the neighboring POST tests — an
     # empty items list would 400 on validation and fail for the wrong reason.
     data = default_scene()
     body = {"items": data["items"], "itemOrder": data["itemOrder"]}
-    with mock.patch("scenes.screenshots.maybe_render") as maybe:
+    with mock.patch("scenes.screenshots.nudge_render") as nudge:
         resp = Client().post(LIST_URL, data=body, content_type="application/json")
     assert resp.status_code == 201
-    maybe.assert_called_once_with(resp.json()["key"])
+    # Queued in the outbox (ADR-0003), not nudged inline, and due at once:
+    # a new scene's first share should show an image.
+    nudge.assert_not_called()
+    queued = RenderRequest.objects.get(key=resp.json()["key"])
+    assert queued.not_before <= timezone.now()
 
 
-@pytest.mark.django_db(transaction=True)
-def test_update_scene_nudges_render_on_content_change():
+@pytest.mark.django_db
+def test_update_scene_queues_debounced_render_on_content_change(render_on, settings):
+    settings.RENDER_DEBOUNCE_SECONDS = 60
     me = CustomUserFactory.create()
     scene = SceneFactory.create(author=me)
     client = Client()
     client.force_login(me)
     data = default_scene()
-    with mock.patch("scenes.screenshots.maybe_render") as maybe:
-        resp = client.patch(
-            _detail(scene.key),
-            data={"items": data["items"], "itemOrder": data["itemOrder"]},
-            content_type="application/json",
-        )
+    resp = client.patch(
+        _detail(scene.key),
+        data={"items": data["items"], "itemOrder": data["itemOrder"]},
+        content_type="application/json",
+    )
     assert resp.status_code == 200
-    maybe.assert_called_once_with(scene.key)
+    wait = RenderRequest.objects.get(key=scene.key).not_before - timezone.now()
+    assert wait > datetime.timedelta(seconds=55)
 
 
-@pytest.mark.django_db(transaction=True)
-def test_update_scene_skips_render_on_metadata_only_change():
+@pytest.mark.django_db
+def test_update_scene_skips_render_on_metadata_only_change(render_on):
     # Title/archived don't change the rendered PNG (the frame page draws only the
     # 3D scene), so a metadata-only patch must not burn a render slot.
     me = CustomUserFactory.create()
     scene = SceneFactory.create(author=me)
     client = Client()
     client.force_login(me)
-    with mock.patch("scenes.screenshots.maybe_render") as maybe:
+    resp = client.patch(
+        _detail(scene.key),
+        data={"title": "Renamed"},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert not RenderRequest.objects.exists()
+
+
+def _items_url(key):
+    return f"/v1/scenes/{key}/items/"
+
+
+@pytest.fixture
+def owned_scene():
+    me = CustomUserFactory.create()
+    data = default_scene()
+    scene = SceneFactory.create(
+        author=me, items=data["items"], item_order=data["itemOrder"]
+    )
+    client = Client()
+    client.force_login(me)
+    return scene, client
+
+
+@pytest.mark.django_db
+def test_patch_items_upserts_removes_and_merges_item_order(owned_scene):
+    scene, client = owned_scene
+    before = scene.modified_date
+    stored = {item["id"]: item for item in scene.items}
+    edited = {**stored["1"], "properties": {**stored["1"]["properties"]}}
+    edited["properties"]["description"] = "Edited"
+    added = {
+        "id": "new",
+        "type": "FOLDER",
+        "properties": {"description": "New", "isCollapsed": "false"},
+    }
+    resp = client.patch(
+        _items_url(scene.key),
+        data={
+            "upsert": [edited, added],
+            "remove": ["initialFolder"],
+            "itemOrder": {"main": ["new"], "new": ["1"]},
+        },
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    assert resp.json()["key"] == scene.key
+    scene.refresh_from_db()
+    # In place, minus the removed one; the new one appended.
+    assert [item["id"] for item in scene.items] == [
+        *(key for key in stored if key != "initialFolder"),
+        "new",
+    ]
+    assert scene.items[0] == edited
+    assert scene.item_order == {
+        "axes": ["axis-x", "axis-y", "axis-z", "grid-xy", "grid-yz", "grid-zx"],
+        "setup": ["cameraFolder", "axes"],
+        "cameraFolder": ["camera"],
+        "main": ["new"],
+        "new": ["1"],
+    }
+    assert scene.modified_date > before
+
+
+@pytest.mark.django_db
+def test_patch_items_remove_drops_the_id_from_its_folder(owned_scene):
+    scene, client = owned_scene
+    resp = client.patch(
+        _items_url(scene.key),
+        data={"remove": ["camera"]},
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+    scene.refresh_from_db()
+    assert scene.item_order["cameraFolder"] == []
+    assert scene.item_order["setup"] == ["cameraFolder", "axes"]
+
+
+@pytest.mark.django_db
+def test_patch_items_is_one_statement_and_get_regenerates_the_body(owned_scene):
+    scene, client = owned_scene
+    with CaptureQueriesContext(connection) as ctx:
         resp = client.patch(
-            _detail(scene.key),
-            data={"title": "Renamed"},
+            _items_url(scene.key),
+            data={"remove": ["1"]},
+            content_type="application/json",
+        )
+    assert resp.status_code == 200
+    assert [sql.split()[0] for sql in _scene_queries(ctx)] == ["WITH"]
+    body = Client().get(_detail(scene.key)).json()
+    assert "1" not in [item["id"] for item in body["items"]]
+    assert "1" not in body["itemOrder"]
+
+
+@pytest.mark.django_db
+def test_patch_items_validates_only_the_upserted_items(owned_scene):
+    scene, client = owned_scene
+    resp = client.patch(
+        _items_url(scene.key),
+        data={"upsert": [{"id": "x", "type": "FOLDER", "properties": {}}]},
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+    # Unvalidated stored items aren't looked at: a delta that leaves them
+    # alone still applies.
+    Scene.objects.filter(pk=scene.pk).update(items=[*scene.items, {"id": "junk"}])
+    resp = client.patch(
+        _items_url(scene.key), data={"remove": ["1"]}, content_type="application/json"
+    )
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_empty_patch_items_writes_nothing(owned_scene, render_on):
+    scene, client = owned_scene
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.patch(
+            _items_url(scene.key), data={}, content_type="application/json"
+        )
+    assert resp.status_code == 200
+    assert resp.json()["key"] == scene.key
+    assert [sql.split()[0] for sql in _scene_queries(ctx)] == ["SELECT"]
+    stored = Scene.objects.defer(None).get(pk=scene.pk)
+    assert stored.modified_date == scene.modified_date
+    assert stored.serialized is not None
+    assert not RenderRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_patch_items_rejects_an_id_named_twice(owned_scene):
+    scene, client = owned_scene
+    item = scene.items[0]
+    resp = client.patch(
+        _items_url(scene.key),
+        data={"upsert": [item], "remove": [item["id"]]},
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_patch_items_is_owner_scoped():
+    scene = SceneFactory.create(author=CustomUserFactory.create())
+    client = Client()
+    client.force_login(CustomUserFactory.create())
+    data = {"remove": ["initialFolder"]}
+    assert (
+        client.patch(
+            _items_url(scene.key), data=data, content_type="application/json"
+        ).status_code
+        == 403
+    )
+    assert (
+        client.patch(
+            _items_url("nonexistent"), data=data, content_type="application/json"
+        ).status_code
+        == 404
+    )
+    scene.refresh_from_db()
+    assert scene.items[0]["id"] == "initialFolder"
+
+
+BULK_URL = "/v1/scenes/me/bulk/"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "action, extra, expected",
+    [
+        ("archive", {}, {"archived": True}),
+        ("unarchive", {}, {"archived": False}),
+        ("retitle", {"title": "Renamed"}, {"title": "Renamed"}),
+    ],
+)
+def test_bulk_update_writes_only_my_scenes(action, extra, expected):
+    me = CustomUserFactory.create()
+    mine = SceneFactory.create_batch(3, author=me, archived=(action == "unarchive"))
+    theirs = SceneFactory.create(author=CustomUserFactory.create(), title="Theirs")
+    client = Client()
+    client.force_login(me)
+    keys = [scene.key for scene in mine] + [theirs.key, "nonexistent"]
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(
+            BULK_URL,
+            data={"keys": keys, "action": action, **extra},
             content_type="application/json",
         )
     assert resp.status_code == 200
-    maybe.assert_not_called()
+    assert len(_scene_queries(ctx)) == 1
+    assert resp.json()["results"] == {
+        **{scene.key: "ok" for scene in mine},
+        theirs.key: "forbidden",
+        "nonexistent": "not_found",
+    }
+    for scene in mine:
+        assert Scene.objects.filter(pk=scene.pk, **expected).exists()
+    theirs_before = (theirs.title, theirs.archived, theirs.modified_date)
+    theirs.refresh_from_db()
+    assert (theirs.title, theirs.archived, theirs.modified_date) == theirs_before
+
+
+@pytest.mark.django_db
+def test_bulk_update_clears_the_stored_body_and_cache():
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me, title="Old")
+    assert Client().get(_detail(scene.key)).json()["title"] == "Old"  # cached
+    client = Client()
+    client.force_login(me)
+    client.post(
+        BULK_URL,
+        data={"keys": [scene.key], "action": "retitle", "title": "New"},
+        content_type="application/json",
+    )
+    assert Client().get(_detail(scene.key)).json()["title"] == "New"
+
+
+@pytest.mark.django_db
+def test_bulk_delete():
+    me = CustomUserFactory.create()
+    mine = SceneFactory.create(author=me)
+    theirs = SceneFactory.create(author=CustomUserFactory.create())
+    client = Client()
+    client.force_login(me)
+    resp = client.post(
+        BULK_URL,
+        data={"keys": [mine.key, theirs.key], "action": "delete"},
+        content_type="application/json",
+    )
+    assert resp.json()["results"] == {mine.key: "ok", theirs.key: "forbidden"}
+    assert list(Scene.objects.values_list("key", flat=True)) == [theirs.key]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"keys": ["a"], "action": "retitle"},
+        {"keys": ["a"], "action": "archive", "title": "x"},
+        {"keys": [], "action": "archive"},
+        {"keys": ["a"], "action": "publish"},
+    ],
+)
+def test_bulk_rejects_malformed_requests(data):
+    client = Client()
+    client.force_login(CustomUserFactory.create())
+    resp = client.post(BULK_URL, data=data, content_type="application/json")
+    assert resp.status_code == 400
+
+
+def test_bulk_requires_auth():
+    resp = Client().post(
+        BULK_URL,
+        data={"keys": ["a"], "action": "archive"},
+        content_type="application/json",
+    )
+    assert resp.status_code == 403
+
+
+BATCH_URL = "/v1/scenes/batch/"
+
+
+def _batch(keys, **extra):
+    return Client().post(
+        BATCH_URL, data={"keys": keys, **extra}, content_type="application/json"
+    )
+
+
+@pytest.mark.django_db
+def test_batch_full_matches_get_in_request_order():
+    s1, s2 = SceneFactory.create_batch(2)
+    SceneFactory.create()  # not requested
+    resp = _batch([s2.key, "nonexistent", s1.key], fields="full")
+    assert resp.status_code == 200
+    scenes = resp.json()["scenes"]
+    assert list(scenes) == [s2.key, s1.key]
+    for scene in (s1, s2):
+        assert scenes[scene.key] == Client().get(_detail(scene.key)).json()
+
+
+@pytest.mark.django_db
+def test_batch_mini_skips_item_columns():
+    scenes = SceneFactory.create_batch(3)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = _batch([scene.key for scene in scenes])
+    (query,) = _scene_queries(ctx)
+    assert '"items"' not in query and '"item_order"' not in query
+    item = resp.json()["scenes"][scenes[0].key]
+    assert set(item) == {
+        "title",
+        "key",
+        "author",
+        "createdDate",
+        "modifiedDate",
+        "archived",
+    }
+
+
+@pytest.mark.django_db
+def test_batch_full_fetches_stored_bodies_in_one_query(django_assert_num_queries):
+    scenes = SceneFactory.create_batch(3)
+    keys = [scene.key for scene in scenes]
+    # The stored-body fetch; then every body comes from the cache.
+    with django_assert_num_queries(1):
+        _batch(keys, fields="full")
+    with django_assert_num_queries(0):
+        resp = _batch(keys, fields="full")
+    assert list(resp.json()["scenes"]) == keys
+
+
+@pytest.mark.django_db
+def test_batch_full_regenerates_missing_bodies():
+    scene = SceneFactory.create()
+    Scene.objects.filter(pk=scene.pk).update(title="Bulk-written", serialized=None)
+    resp = _batch([scene.key], fields="full")
+    assert resp.json()["scenes"][scene.key]["title"] == "Bulk-written"
+    assert Scene.objects.get(pk=scene.pk).serialized is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", ["mini", "full"])
+def test_batch_migrates_legacy_keys_together(fields):
+    legacies = [
+        LegacyScene.objects.create(dehydrated=LEGACY_DEHYDRATED_FIXTURE)
+        for _ in range(2)
+    ]
+    keys = [legacy.key for legacy in legacies]
+    with mock.patch(
+        "scenes.api.migrate_scenes", wraps=migrate_scene_module.migrate_scenes
+    ) as migrate:
+        resp = _batch(keys, fields=fields)
+    migrate.assert_called_once()
+    scenes = resp.json()["scenes"]
+    assert list(scenes) == keys
+    assert all(scene["title"] == "Old" for scene in scenes.values())
+
+
+@pytest.mark.django_db
+def test_batch_full_counts_views_and_mini_does_not():
+    scene = SceneFactory.create()
+    _batch([scene.key])
+    _batch([scene.key], fields="full")
+    flush_view_counts()
+    scene.refresh_from_db()
+    assert scene.times_accessed == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"keys": []},
+        {"keys": ["a"] * 101},
+        {"keys": ["a"], "fields": "items"},
+    ],
+)
+def test_batch_rejects_malformed_requests(data):
+    resp = Client().post(BATCH_URL, data=data, content_type="application/json")
+    assert resp.status_code == 400
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ScenesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "scenes"
+
+    def ready(self):
+        from scenes import lookups  # noqa: F401 (registers the lookups)
@@ -0,0 +1,98 @@
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Max, Min
+from django.test.utils import CaptureQueriesContext
+
+from scenes.factories import SceneFactory
+from scenes.management.commands import audit_scene_items
+from scenes.models import Scene
+
+BAD_ITEMS = [{"id": "x", "type": "FOLDER", "properties": {"description": "d"}}]
+
+
+def _audit(*args):
+    out = StringIO()
+    call_command("audit_scene_items", *args, stdout=out)
+    return out.getvalue()
+
+
+def _validations():
+    return mock.patch.object(
+        audit_scene_items.MATH_ITEM_LIST_ADAPTER,
+        "validate_python",
+        wraps=audit_scene_items.MATH_ITEM_LIST_ADAPTER.validate_python,
+    )
+
+
+@pytest.mark.django_db
+def test_audit_buckets_failures_across_shards(tmp_path):
+    SceneFactory.create_batch(3)
+    bad = SceneFactory.create_batch(2)
+    Scene.objects.filter(pk__in=[s.pk for s in bad]).update(items=BAD_ITEMS)
+    out_path = tmp_path / "audit.jsonl"
+    output = _audit("--chunk-size", "2", "--out", str(out_path))
+    assert "scanned 5 · passed 3 (0 cached) · failed 2" in output
+    assert "FOLDER / missing / properties.isCollapsed" in output
+    lines = out_path.read_text().splitlines()
+    assert {json.loads(line)["key"] for line in lines} == {s.key for s in bad}
+
+
+@pytest.mark.django_db
+def test_audit_limit_caps_scanned_scenes():
+    SceneFactory.create_batch(4)
+    assert "scanned 3 ·" in _audit("--limit", "3", "--chunk-size", "2")
+
+
+@pytest.mark.django_db
+def test_audit_cache_skips_known_passes(tmp_path):
+    SceneFactory.create_batch(2)
+    bad = SceneFactory.create()
+    Scene.objects.filter(pk=bad.pk).update(items=BAD_ITEMS)
+    cache = str(tmp_path / "cache.json")
+    _audit("--cache", cache)
+    with _validations() as validate:
+        output = _audit("--cache", cache)
+    # Only the failing scene is validated again.
+    assert validate.call_count == 1
+    assert "passed 2 (2 cached) · failed 1" in output
+
+
+@pytest.mark.django_db
+def test_audit_cache_is_discarded_on_schema_change(tmp_path):
+    SceneFactory.create_batch(2)
+    cache = str(tmp_path / "cache.json")
+    _audit("--cache", cache)
+    with (
+        mock.patch.object(audit_scene_items, "schema_version", return_value="new"),
+        _validations() as validate,
+    ):
+        output = _audit("--cache", cache)
+    assert validate.call_count == 2
+    assert "(0 cached)" in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_audit_with_jobs_merges_worker_results():
+    SceneFactory.create_batch(4)
+    bad = SceneFactory.create()
+    Scene.objects.filter(pk=bad.pk).update(items=BAD_ITEMS)
+    output = _audit("--jobs", "2", "--chunk-size", "2")
+    assert "scanned 5 · passed 4 (0 cached) · failed 1" in output
+    assert "FOLDER / missing / properties.isCollapsed" in output
+
+
+@pytest.mark.django_db
+def test_audit_shard_fetches_items_a_batch_at_a_time(monkeypatch):
+    SceneFactory.create_batch(5)
+    monkeypatch.setattr(audit_scene_items, "_FETCH_SIZE", 2)
+    bounds = Scene.objects.aggregate(lo=Min("id"), hi=Max("id"))
+    with CaptureQueriesContext(connection) as ctx:
+        result = audit_scene_items.audit_shard((bounds["lo"], bounds["hi"], False))
+    assert (result.scanned, result.passed) == (5, 5)
+    fetches = [q["sql"] for q in ctx.captured_queries if "MD5" not in q["sql"]]
+    assert len(fetches) == 3
@@ -0,0 +1,76 @@
+"""Read-through cache for scene reads (GET /v1/scenes/{key}/).
+
+Entries live in the ``scenes`` cache alias (``settings.CACHES``), keyed by
+scene key, and hold the scene's pre-serialized response body
+(scenes/serialization.py) plus its ``modified_date`` — so a hit skips the
+legacy lookup and the row fetch entirely, revalidation (scenes/conditional.py)
+included.
+
+Every write path that changes what GET serves calls ``invalidate_scene``.
+The default backend is a per-process, bounded-LRU ``LocMemCache``: invalidation
+only reaches the process that made the write, so another gunicorn worker can
+serve a stale entry for at most the alias ``TIMEOUT``. Pointing the alias at a
+shared backend (Redis, Memcached) makes invalidation global; nothing here
+depends on the backend.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from django.core.cache import caches
+
+from main import metrics
+
+SCENE_CACHE_ALIAS = "scenes"
+
+# (body, modified_date)
+CachedScene = tuple[bytes, datetime]
+
+
+def _cache_key(key: str) -> str:
+    return f"scene:{key}"
+
+
+def get_cached_scene(key: str) -> Optional[CachedScene]:
+    entry = caches[SCENE_CACHE_ALIAS].get(_cache_key(key))
+    metrics.inc(
+        "math3d_scene_cache_lookups_total",
+        result="miss" if entry is None else "hit",
+    )
+    return entry
+
+
+def get_cached_scenes(keys: list[str]) -> dict[str, CachedScene]:
+    """``get_cached_scene`` for many keys in one cache round trip. Misses are
+    absent from the result."""
+    cache_keys = {_cache_key(key): key for key in keys}
+    found = caches[SCENE_CACHE_ALIAS].get_many(list(cache_keys))
+    entries = {cache_keys[cache_key]: entry for cache_key, entry in found.items()}
+    if entries:
+        metrics.inc("math3d_scene_cache_lookups_total", len(entries), result="hit")
+    if len(keys) > len(entries):
+        metrics.inc(
+            "math3d_scene_cache_lookups_total", len(keys) - len(entries), result="miss"
+        )
+    return entries
+
+
+def cache_scene(key: str, entry: CachedScene) -> None:
+    caches[SCENE_CACHE_ALIAS].set(_cache_key(key), entry)
+
+
+def cache_scenes(entries: dict[str, CachedScene]) -> None:
+    """``cache_scene`` for many keys in one cache round trip."""
+    caches[SCENE_CACHE_ALIAS].set_many(
+        {_cache_key(key): entry for key, entry in entries.items()}
+    )
+
+
+def invalidate_scene(key: str) -> None:
+    """Drop ``key``'s entry. Call after any write that changes the served scene."""
+    caches[SCENE_CACHE_ALIAS].delete(_cache_key(key))
+
+
+def invalidate_scenes(keys: list[str]) -> None:
+    """``invalidate_scene`` for many keys in one cache round trip."""
+    caches[SCENE_CACHE_ALIAS].delete_many([_cache_key(key) for key in keys])
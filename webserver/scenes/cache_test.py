@@ -0,0 +1,93 @@
+import pytest
+from django.test import Client
+
+from authentication.factories import CustomUserFactory
+from scenes.cache import get_cached_scene, invalidate_scene
+from scenes.factories import SceneFactory
+from scenes.legacy_scene_utils.migrate_scene import migrate_scene
+from scenes.models import LegacyScene, Scene
+
+
+def _detail(key):
+    return f"/v1/scenes/{key}/"
+
+
+@pytest.mark.django_db
+def test_get_populates_cache():
+    scene = SceneFactory.create()
+    assert get_cached_scene(scene.key) is None
+    body = Client().get(_detail(scene.key)).content
+    assert get_cached_scene(scene.key) == (body, scene.modified_date)
+
+
+@pytest.mark.django_db
+def test_cache_hit_skips_legacy_lookup_and_row_fetch(django_assert_num_queries):
+    scene = SceneFactory.create()
+    client = Client()
+    client.get(_detail(scene.key))
+    # The view is buffered, so a hit touches the database not at all.
+    with django_assert_num_queries(0):
+        response = client.get(_detail(scene.key))
+    assert response.json()["key"] == scene.key
+
+
+@pytest.mark.django_db
+def test_unknown_key_is_not_cached():
+    assert Client().get(_detail("nonexistent")).status_code == 404
+    assert get_cached_scene("nonexistent") is None
+
+
+@pytest.mark.django_db
+def test_patch_invalidates_cached_scene():
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me)
+    client = Client()
+    client.force_login(me)
+    client.get(_detail(scene.key))
+    client.patch(
+        _detail(scene.key), data={"title": "Renamed"}, content_type="application/json"
+    )
+    assert client.get(_detail(scene.key)).json()["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_delete_invalidates_cached_scene():
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me)
+    client = Client()
+    client.force_login(me)
+    client.get(_detail(scene.key))
+    assert client.delete(_detail(scene.key)).status_code == 204
+    assert client.get(_detail(scene.key)).status_code == 404
+
+
+@pytest.mark.django_db
+def test_migrate_scene_invalidates_cached_scene():
+    legacy = LegacyScene.objects.create(
+        dehydrated={
+            "folders": {},
+            "mathSymbols": {},
+            "mathGraphics": {},
+            "sliderValues": {},
+            "sortableTree": {"root": []},
+            "metadata": {"creationDate": '"2020-01-01T00:00:00Z"', "title": "Old"},
+        }
+    )
+    Client().get(_detail(legacy.key))
+    assert get_cached_scene(legacy.key) is not None
+    migrate_scene(LegacyScene.objects.get(pk=legacy.pk))
+    assert get_cached_scene(legacy.key) is None
+
+
+@pytest.mark.django_db
+def test_invalidate_scene_drops_entry():
+    scene = SceneFactory.create()
+    Client().get(_detail(scene.key))
+    # serialized=None, like any write that bypasses save() (see scenes/api.py).
+    Scene.objects.filter(pk=scene.pk).update(
+        title="Changed behind the cache", serialized=None
+    )
+    invalidate_scene(scene.key)
+    assert (
+        Client().get(_detail(scene.key)).json()["title"] == "Changed behind the cache"
+    )
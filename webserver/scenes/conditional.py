@@ -0,0 +1,94 @@
+"""Conditional GET (ETag / Last-Modified / 304) for scene reads.
+
+Validators derive from ``modified_date``, which ``TimestampedModel.stamp``
+bumps on every content write, so a revalidation can be answered from one
+timestamp column without loading ``items``. ETags also fold in
+SERIALIZATION_VERSION: a change to the response format must invalidate copies
+clients already hold even though no scene changed.
+
+Views under ``@paginate`` can't return a response of their own, so a matched
+precondition is raised as ``NotModified`` and turned back into its response by
+the handler in main/api.py — the same way ``Http404`` escapes a view.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Mapping, Optional
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from scenes.serialization import SERIALIZATION_VERSION
+
+
+class NotModified(Exception):
+    """Carries the 304 (or 412, for a failed If-Match) that ends the request."""
+
+    def __init__(self, response: HttpResponseBase):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """An ETag over ``parts``. Use ``weak`` when the parts only approximate
+    the body (e.g. an aggregate over a list) rather than determine it."""
+    raw = "|".join(str(part) for part in (SERIALIZATION_VERSION, *parts))
+    etag = quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+    return f"W/{etag}" if weak else etag
+
+
+def is_conditional(request: HttpRequest) -> bool:
+    """Whether the request carries validators worth checking before a fetch."""
+    return "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+
+
+def set_validators(
+    response: HttpResponseBase,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> None:
+    """Set the validators, plus any other caching ``headers``, on ``response``."""
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+
+
+def not_modified(
+    request: HttpRequest,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Optional[HttpResponseBase]:
+    """The 304 (or 412) to send if the request's validators match, else None.
+
+    ``headers`` are the caching headers (Cache-Control etc.) the 200 would
+    carry, which a 304 must repeat too. Precedence (If-None-Match over
+    If-Modified-Since, GET/HEAD only for 304) is Django's, via
+    ``get_conditional_response``.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None and response.status_code == 304:
+        # A 304 must repeat the validators a 200 would have sent (RFC 9110).
+        set_validators(response, etag, last_modified, headers)
+    return response
+
+
+def check_not_modified(
+    request: HttpRequest,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> None:
+    """``not_modified``, raised as ``NotModified`` for views under @paginate."""
+    response = not_modified(request, etag, last_modified, headers)
+    if response is not None:
+        raise NotModified(response)
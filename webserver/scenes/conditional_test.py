@@ -0,0 +1,139 @@
+import pytest
+from django.test import Client
+
+from scenes.cache import invalidate_scene
+from scenes.factories import SceneFactory
+from scenes.models import Scene
+from scenes.view_counts import flush as flush_view_counts
+
+
+def _detail(key):
+    return f"/v1/scenes/{key}/"
+
+
+def _meta(key):
+    return f"/v1/scenes/{key}/meta/"
+
+
+LIST = "/v1/scenes/"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [_detail, _meta])
+def test_200_carries_validators(url):
+    scene = SceneFactory.create()
+    response = Client().get(url(scene.key))
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+    assert "Last-Modified" in response.headers
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [_detail, _meta])
+def test_matching_etag_is_304(url):
+    scene = SceneFactory.create()
+    client = Client()
+    etag = client.get(url(scene.key)).headers["ETag"]
+    response = client.get(url(scene.key), headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_if_modified_since_is_304():
+    scene = SceneFactory.create()
+    client = Client()
+    last_modified = client.get(_detail(scene.key)).headers["Last-Modified"]
+    response = client.get(
+        _detail(scene.key), headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [_detail, _meta])
+def test_save_changes_etag(url):
+    scene = SceneFactory.create()
+    client = Client()
+    etag = client.get(url(scene.key)).headers["ETag"]
+    scene.title = "Renamed"
+    scene.save()
+    invalidate_scene(scene.key)  # as every API write path does
+    response = client.get(url(scene.key), headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_uncached_revalidation_skips_body_fetch(django_assert_num_queries):
+    scene = SceneFactory.create()
+    etag = Client().get(_detail(scene.key)).headers["ETag"]
+    invalidate_scene(scene.key)
+    # Only the modified_date lookup: no legacy check, no body fetch.
+    with django_assert_num_queries(1) as ctx:
+        response = Client().get(_detail(scene.key), headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert "serialized" not in ctx.captured_queries[0]["sql"]
+    assert "items" not in ctx.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_cached_revalidation_makes_no_queries(django_assert_num_queries):
+    scene = SceneFactory.create()
+    etag = Client().get(_detail(scene.key)).headers["ETag"]
+    with django_assert_num_queries(0):
+        response = Client().get(_detail(scene.key), headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_304_still_counts_a_view():
+    scene = SceneFactory.create()
+    client = Client()
+    etag = client.get(_detail(scene.key)).headers["ETag"]
+    client.get(_detail(scene.key), headers={"If-None-Match": etag})
+    flush_view_counts()
+    assert Scene.objects.get(pk=scene.pk).times_accessed == 2
+
+
+@pytest.mark.django_db
+def test_missing_key_with_validators_is_404():
+    response = Client().get(_detail("nope"), headers={"If-None-Match": '"abc"'})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_list_revalidates_until_the_filtered_set_changes():
+    SceneFactory.create_batch(2)
+    client = Client()
+    first = client.get(LIST)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert client.get(LIST, headers={"If-None-Match": etag}).status_code == 304
+
+    SceneFactory.create()
+    response = client.get(LIST, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_on_delete_and_with_query():
+    scenes = SceneFactory.create_batch(2)
+    client = Client()
+    etag = client.get(LIST).headers["ETag"]
+    assert client.get(f"{LIST}?limit=1").headers["ETag"] != etag
+
+    Scene.objects.filter(pk=scenes[0].pk).delete()
+    assert client.get(LIST, headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_on_edit():
+    scene = SceneFactory.create()
+    client = Client()
+    etag = client.get(LIST).headers["ETag"]
+    scene.title = "Edited"
+    scene.save()
+    assert client.get(LIST, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,96 @@
+"""Edge (CDN) caching for public scene reads.
+
+``get_scene_meta`` always emits ``settings.SCENE_META_CACHE_CONTROL``: the
+endpoint is side-effect free, so an edge hit loses nothing. ``get_scene``
+emits ``settings.SCENE_CACHE_CONTROL`` only when it is set. An edge hit never
+reaches Django, so it is neither counted in ``times_accessed`` nor re-migrated
+from a legacy key. That is acceptable once views are counted elsewhere (e.g.
+by the edge).
+
+Both responses are tagged ``Surrogate-Key: scene-<key>``. Saves and deletes
+queue that key in the purge outbox (``schedule_purge``), and the ``purger``
+process (``drain_purge_outbox --loop``) purges queued keys through
+``settings.EDGE_PURGE_URL``, many per request. Purging is dark while the URL
+is unset, in which case edge copies age out at their ``s-maxage``.
+"""
+
+import json
+import logging
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+
+from main.constants import BACKEND_USER_AGENT
+from scenes.models import EdgePurge
+
+logger = logging.getLogger(__name__)
+
+
+def surrogate_key(key: str) -> str:
+    return f"scene-{key}"
+
+
+def edge_headers(key: str, cache_control: str) -> dict[str, str]:
+    """Headers for a public read of ``key``; none if ``cache_control`` is unset."""
+    if not cache_control:
+        return {}
+    return {"Cache-Control": cache_control, "Surrogate-Key": surrogate_key(key)}
+
+
+def purge(keys: list[str]) -> None:
+    """Best-effort POST of ``{"surrogate_keys": [...]}`` to the purge URL.
+    ~2s timeout, no retry. Swallows errors: a failed purge leaves an edge copy
+    to expire at its s-maxage, which must not stop the drainer (or a pull)."""
+    if not settings.EDGE_PURGE_URL:
+        return
+    req = urllib.request.Request(
+        settings.EDGE_PURGE_URL,
+        data=json.dumps({"surrogate_keys": [surrogate_key(k) for k in keys]}).encode(),
+        headers={
+            "content-type": "application/json",
+            "authorization": f"Bearer {settings.EDGE_PURGE_SECRET}",
+            "user-agent": BACKEND_USER_AGENT,
+        },
+        method="POST",
+    )
+    try:
+        urllib.request.urlopen(req, timeout=2.0).close()
+    except Exception:
+        logger.warning("edge purge failed for keys=%s", keys, exc_info=True)
+
+
+def schedule_purge(*keys: str) -> None:
+    """Queue ``keys`` in the purge outbox, for ``drain_purge_outbox``.
+
+    The rows are written in the caller's transaction, so no purge can reach
+    the edge before the write commits (the edge would re-fetch the old row),
+    and the write pays one INSERT rather than a round trip to the purge URL.
+    Never raises; the savepoint keeps a failed insert from breaking an
+    enclosing transaction.
+    """
+    if not settings.EDGE_PURGE_URL:
+        return
+    try:
+        with transaction.atomic():
+            EdgePurge.objects.bulk_create(
+                [EdgePurge(key=key) for key in keys], ignore_conflicts=True
+            )
+    except Exception:
+        logger.warning("schedule_purge failed for keys=%s", keys, exc_info=True)
+
+
+def drain_purge_outbox(batch_size: int = 500) -> int:
+    """Purge up to ``batch_size`` queued keys in one request; return how
+    many. Safe to run concurrently: rows are claimed with SKIP LOCKED. They
+    are deleted before the request is sent, so a failed purge isn't retried
+    and those copies age out at their ``s-maxage``, as ``purge`` documents."""
+    if not settings.EDGE_PURGE_URL:
+        return 0
+    with transaction.atomic():
+        queued = EdgePurge.objects.select_for_update(skip_locked=True)
+        claimed = list(queued.order_by("id")[:batch_size])
+        EdgePurge.objects.filter(pk__in=[row.pk for row in claimed]).delete()
+    if claimed:
+        purge([row.key for row in claimed])
+    return len(claimed)
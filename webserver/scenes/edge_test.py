@@ -0,0 +1,138 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from authentication.factories import CustomUserFactory
+from main.constants import BACKEND_USER_AGENT
+from scenes import edge
+from scenes.factories import SceneFactory
+from scenes.models import EdgePurge
+
+
+def _detail(key):
+    return f"/v1/scenes/{key}/"
+
+
+@pytest.mark.django_db
+def test_meta_is_edge_cacheable_by_default(settings):
+    scene = SceneFactory.create()
+    response = Client().get(f"{_detail(scene.key)}meta/")
+    assert response.headers["Cache-Control"] == settings.SCENE_META_CACHE_CONTROL
+    assert response.headers["Surrogate-Key"] == f"scene-{scene.key}"
+
+
+@pytest.mark.django_db
+def test_scene_emits_no_cache_headers_unless_configured(settings):
+    scene = SceneFactory.create()
+    response = Client().get(_detail(scene.key))
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Key" not in response.headers
+
+    settings.SCENE_CACHE_CONTROL = "public, s-maxage=600"
+    response = Client().get(_detail(scene.key))
+    assert response.headers["Cache-Control"] == "public, s-maxage=600"
+    assert response.headers["Surrogate-Key"] == f"scene-{scene.key}"
+
+
+@pytest.mark.django_db
+def test_304_repeats_cache_headers(settings):
+    settings.SCENE_CACHE_CONTROL = "public, s-maxage=600"
+    scene = SceneFactory.create()
+    etag = Client().get(_detail(scene.key)).headers["ETag"]
+    response = Client().get(_detail(scene.key), headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "public, s-maxage=600"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("method", "data"),
+    [("patch", json.dumps({"title": "New"})), ("delete", None)],
+)
+def test_write_purges(method, data):
+    user = CustomUserFactory.create()
+    scene = SceneFactory.create(author=user)
+    client = Client()
+    client.force_login(user)
+    with mock.patch("scenes.api.schedule_purge") as schedule_purge:
+        response = getattr(client, method)(
+            _detail(scene.key), data=data, content_type="application/json"
+        )
+    assert response.status_code in (200, 204)
+    schedule_purge.assert_called_once_with(scene.key)
+
+
+def _purge_on(settings):
+    settings.EDGE_PURGE_URL = "https://edge.example/purge"
+
+
+@pytest.mark.django_db
+def test_schedule_purge_queues_each_key_once(settings):
+    _purge_on(settings)
+    edge.schedule_purge("abc", "def")
+    edge.schedule_purge("abc")
+    assert sorted(EdgePurge.objects.values_list("key", flat=True)) == ["abc", "def"]
+
+
+@pytest.mark.django_db
+def test_schedule_purge_is_dark_without_url(settings):
+    settings.EDGE_PURGE_URL = ""
+    edge.schedule_purge("abc")
+    assert not EdgePurge.objects.exists()
+
+
+@pytest.mark.django_db
+def test_schedule_purge_swallows_errors(settings):
+    _purge_on(settings)
+    with mock.patch.object(EdgePurge.objects, "bulk_create", side_effect=RuntimeError):
+        edge.schedule_purge("abc")  # must not raise
+
+
+@pytest.mark.django_db
+def test_drain_purges_a_batch_in_one_request(settings):
+    _purge_on(settings)
+    edge.schedule_purge("a1", "a2", "a3")
+    with mock.patch("scenes.edge.purge") as purge:
+        assert edge.drain_purge_outbox(batch_size=2) == 2
+    purge.assert_called_once_with(["a1", "a2"])
+    assert list(EdgePurge.objects.values_list("key", flat=True)) == ["a3"]
+
+
+@pytest.mark.django_db
+def test_drain_purge_command_once(settings):
+    _purge_on(settings)
+    edge.schedule_purge("abc")
+    out = io.StringIO()
+    with mock.patch("scenes.edge.purge") as purge:
+        call_command("drain_purge_outbox", stdout=out)
+    purge.assert_called_once_with(["abc"])
+    assert out.getvalue().strip() == "purged=1"
+
+
+def test_purge_is_dark_without_url(settings):
+    settings.EDGE_PURGE_URL = ""
+    with mock.patch("urllib.request.urlopen") as urlopen:
+        edge.purge(["abc"])
+    urlopen.assert_not_called()
+
+
+def test_purge_posts_surrogate_keys(settings):
+    settings.EDGE_PURGE_URL = "https://edge.example/purge"
+    settings.EDGE_PURGE_SECRET = "s3cret"  # noqa: S105 pragma: allowlist secret
+    with mock.patch("urllib.request.urlopen") as urlopen:
+        edge.purge(["abc"])
+    req = urlopen.call_args.args[0]
+    assert req.full_url == "https://edge.example/purge"
+    assert json.loads(req.data) == {"surrogate_keys": ["scene-abc"]}
+    assert req.get_header("Authorization") == "Bearer s3cret"
+    assert req.get_header("User-agent") == BACKEND_USER_AGENT
+
+
+def test_purge_swallows_errors(settings):
+    settings.EDGE_PURGE_URL = "https://edge.example/purge"
+    with mock.patch("urllib.request.urlopen", side_effect=OSError):
+        edge.purge(["abc"])  # must not raise
@@ -1,14 +1,29 @@
 import logging
 
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 
+from scenes.cache import invalidate_scene, invalidate_scenes
+from scenes.edge import schedule_purge
 from scenes.legacy_scene_utils.translate import ItemMigrator
-from scenes.models import Scene, LegacyScene, is_reserved_key_error
+from scenes.models import (
+    RESERVED_KEY_VALIDATOR,
+    LegacyScene,
+    Scene,
+    is_reserved_key_error,
+)
 
 from scenes.legacy_scene_utils.default_data import set_defaults
 
 logger = logging.getLogger(__name__)
 
+# Stamped on each LegacyScene by migrate_scene. Bump it whenever a change to
+# this module, translate.py or default_data.py alters the translated output:
+# GET re-migrates legacy keys whose stamp doesn't match, one at a time as they
+# are read. (`migrate_legacy_data` re-migrates them all up front.)
+TRANSLATOR_VERSION = "1"
+
 
 def parse_value(value: str, default: float) -> float:
     """
@@ -42,7 +57,12 @@ def get_axis_scales(old_items: dict) -> tuple[float, float, float]:
     return x_scale, y_scale, z_scale
 
 
-def migrate_scene(legacy_scene: LegacyScene):
+def translate_legacy_scene(legacy_scene: LegacyScene) -> tuple[dict, str]:
+    """
+    Translate a legacy scene in memory, without touching the database: the
+    field values of its ``Scene`` (by field name) and its migration note.
+    Mutates ``legacy_scene.dehydrated``.
+    """
     set_defaults(legacy_scene)
 
     for item_id, item in legacy_scene.dehydrated["folders"].items():
@@ -104,16 +124,33 @@ def migrate_scene(legacy_scene: LegacyScene):
         if not item_order[folder_id] and folder_id not in item_order["main"]:
             del item_order[folder_id]
 
+    creation_date = legacy_scene.dehydrated["metadata"]["creationDate"].replace('"', "")
+    fields = {
+        "key": legacy_scene.key,
+        "items": items,
+        "item_order": legacy_scene.dehydrated["sortableTree"],
+        "title": legacy_scene.dehydrated["metadata"].get("title", "Untitled"),
+        "times_accessed": legacy_scene.times_accessed,
+        "is_legacy": True,
+        "created_date": creation_date,
+        "modified_date": creation_date,
+    }
+    return fields, "\n".join(issue.message for issue in migrator.log.issues())
+
+
+def migrate_scene(legacy_scene: LegacyScene):
+    fields, note = translate_legacy_scene(legacy_scene)
+    key = fields.pop("key")
+    # These are auto_now_add, auto_now columns and can't be modified
+    # in save(); they're written by the update() below.
+    dates = {name: fields.pop(name) for name in ("created_date", "modified_date")}
+    # The legacy count seeds a new Scene only: once migrated, views accrue on
+    # the Scene, and re-migrating must not reset them to the legacy count.
+    create_defaults = {**fields}
+    fields.pop("times_accessed")
     try:
-        scene, _created = Scene.objects.update_or_create(
-            key=legacy_scene.key,
-            defaults={
-                "items": items,
-                "item_order": legacy_scene.dehydrated["sortableTree"],
-                "title": legacy_scene.dehydrated["metadata"].get("title", "Untitled"),
-                "times_accessed": legacy_scene.times_accessed,
-                "is_legacy": True,
-            },
+        scene, created = Scene.objects.update_or_create(
+            key=key, defaults=fields, create_defaults=create_defaults
         )
     except ValidationError as e:
         if not is_reserved_key_error(e):
@@ -123,19 +160,92 @@ def migrate_scene(legacy_scene: LegacyScene):
         logger.warning(
             "Skipping migration of legacy scene with reserved key %r", legacy_scene.key
         )
+        # Stamped all the same: retrying can't succeed until the translator
+        # changes, and GET would otherwise retry on every read.
+        _mark_migrated(legacy_scene, _RESERVED_KEY_NOTE)
         return None
-    # These are auto_now_add, auto_now columns and can't be modified
-    # in save()
-    Scene.objects.filter(pk=scene.id).update(
-        created_date=legacy_scene.dehydrated["metadata"]["creationDate"].replace(
-            '"', ""
-        ),
-        modified_date=legacy_scene.dehydrated["metadata"]["creationDate"].replace(
-            '"', ""
-        ),
-    )
+    if not created:
+        # A re-migration rewrote the scene: keep the modified_date save()
+        # stamped, so ETags and Last-Modified move, and purge edge copies.
+        del dates["modified_date"]
+    # The body save() serialized carries the old dates; clear it so the next
+    # GET regenerates it (scenes/api.py).
+    Scene.objects.filter(pk=scene.id).update(serialized=None, **dates)
+    invalidate_scene(scene.key)
+    if not created:
+        schedule_purge(scene.key)
+
+    _mark_migrated(legacy_scene, note)
+
+
+# Scene columns a batch migration overwrites on an existing row: the same set
+# migrate_scene's update_or_create() and update() write. author, archived and
+# times_accessed (seeded from the legacy count on insert only) keep their
+# current values.
+_UPSERT_FIELDS = [
+    "items",
+    "item_order",
+    "title",
+    "is_legacy",
+    "created_date",
+    "modified_date",
+    "serialized",
+]
+_MARKER_FIELDS = ["migration_note", "migrated_at", "translator_version"]
+_RESERVED_KEY_NOTE = "Skipped: reserved key."
+
+
+def migrate_scenes(legacy_scenes: list[LegacyScene]) -> int:
+    """
+    Batch ``migrate_scene``. Translates every scene in memory, then writes the
+    Scenes with one upsert and stamps the legacy rows with one UPDATE. Both
+    happen in one transaction, so a batch is either fully migrated and
+    stamped or not at all. Returns the number of Scenes written.
+
+    There is no ``full_clean()``: ``translate_item`` builds MathItem models,
+    so the items are valid by construction, and reserved keys are checked
+    here.
+    """
+    scenes = []
+    now = timezone.now()
+    for legacy_scene in legacy_scenes:
+        try:
+            RESERVED_KEY_VALIDATOR(legacy_scene.key)
+        except ValidationError:
+            logger.warning(
+                "Skipping migration of legacy scene with reserved key %r",
+                legacy_scene.key,
+            )
+            note = _RESERVED_KEY_NOTE
+        else:
+            fields, note = translate_legacy_scene(legacy_scene)
+            # Regenerated on first read, as after migrate_scene.
+            scenes.append(Scene(**fields, serialized=None))
+        legacy_scene.migration_note = note
+        legacy_scene.migrated_at = now
+        legacy_scene.translator_version = TRANSLATOR_VERSION
+
+    with transaction.atomic():
+        # Re-migrated scenes get a new modified_date, as in migrate_scene.
+        keys = [scene.key for scene in scenes]
+        existing = set(Scene.objects.filter(key__in=keys).values_list("key", flat=True))
+        for scene in scenes:
+            if scene.key in existing:
+                scene.modified_date = now
+        Scene.objects.bulk_create(
+            scenes,
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=_UPSERT_FIELDS,
+        )
+        LegacyScene.objects.bulk_update(legacy_scenes, _MARKER_FIELDS)
+        schedule_purge(*existing)
+    invalidate_scenes(keys)
+    return len(scenes)
 
-    legacy_scene.migration_note = "\n".join(
-        (issue.message for issue in migrator.log.issues())
-    )
-    legacy_scene.save(update_fields=["migration_note"])
+
+def _mark_migrated(legacy_scene: LegacyScene, note: str) -> None:
+    legacy_scene.migration_note = note
+    legacy_scene.migrated_at = timezone.now()
+    legacy_scene.translator_version = TRANSLATOR_VERSION
+    legacy_scene.save(update_fields=_MARKER_FIELDS)
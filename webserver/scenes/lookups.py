@@ -0,0 +1,25 @@
+"""Custom field lookups (registered in ScenesConfig.ready)."""
+
+from django.db.models import TextField
+from django.db.models.lookups import PatternLookup
+
+
+@TextField.register_lookup
+class TrigramIContains(PatternLookup):
+    """``icontains`` spelled as ``ILIKE``, so a ``gin_trgm_ops`` index applies.
+
+    Postgres compiles Django's own ``icontains`` to
+    ``UPPER(col::text) LIKE UPPER(...)``. That expression matches no index on the
+    bare column, so even ``title_gin_trgm_index`` goes unused and the filter
+    scans. ``col ILIKE '%...%'`` has the same semantics and is served by the
+    trigram index (for patterns of three or more characters).
+    """
+
+    lookup_name = "trigram_icontains"
+    param_pattern = "%%%s%%"
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        # PatternLookup.process_rhs escapes %/_ and wraps the value in %...%.
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
@@ -6,17 +6,31 @@ bad scene), this never writes and never stops early — it scans the whole table
 and buckets failures by `(item type, error type, field path)` so a corpus of
 100k scenes collapses to the handful of distinct problems worth acting on.
 
+The table is scanned in id-range shards, which `--jobs N` spreads across N
+worker processes. `--cache PATH` remembers which items passed, by content
+hash, under the current schema version. A repeat audit skips those scenes
+without fetching their items. A schema change discards the whole cache.
+Failures are never cached, so the report and `--out` are always complete.
+
     docker compose run --rm webserver uv run ./manage.py audit_scene_items
     docker compose run --rm webserver uv run ./manage.py audit_scene_items --legacy-only
     docker compose run --rm webserver uv run ./manage.py audit_scene_items --out db-snapshots/audit.jsonl
+    docker compose run --rm webserver uv run ./manage.py audit_scene_items --jobs 8 --cache db-snapshots/audit-cache.json
 """
 
+import hashlib
 import json
+import multiprocessing
 import os
 from collections import Counter
+from dataclasses import dataclass, field
+from itertools import batched
 
 import tqdm
 from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min, TextField
+from django.db.models.functions import MD5, Cast
 from pydantic import ValidationError as PydanticValidationError
 
 from scenes.models import Scene
@@ -24,6 +38,18 @@ from scenes.schemas.math_items import MATH_ITEM_LIST_ADAPTER, MathItemType
 
 _ITEM_TYPE_VALUES = {m.value for m in MathItemType}
 
+# Hashes (of items that passed under the current schema) loaded from --cache.
+# A module global so forked workers inherit it instead of each task pickling
+# the whole set.
+_known_passes: set[str] = set()
+
+
+def schema_version() -> str:
+    """Fingerprint of the math-item schema; a cached pass is valid only under
+    the version it was recorded with."""
+    schema = json.dumps(MATH_ITEM_LIST_ADAPTER.json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode()).hexdigest()[:12]
+
 
 def _signature(error, items):
     """Reduce one Pydantic error to a stable (item_type, error_type, field) key.
@@ -51,6 +77,95 @@ def _signature(error, items):
     return (item_type or "?", error["type"], field or "(root)")
 
 
+@dataclass
+class AuditResult:
+    scanned: int = 0
+    passed: int = 0
+    failed: int = 0
+    cached: int = 0
+    buckets: Counter = field(default_factory=Counter)
+    examples: dict = field(default_factory=dict)
+    # (key, errors) per failed scene, for --out.
+    failures: list = field(default_factory=list)
+    # Hashes of items that passed validation in this run, for --cache.
+    passes: list = field(default_factory=list)
+
+    def merge(self, other: "AuditResult") -> None:
+        self.scanned += other.scanned
+        self.passed += other.passed
+        self.failed += other.failed
+        self.cached += other.cached
+        self.buckets.update(other.buckets)
+        for sig, key in other.examples.items():
+            self.examples.setdefault(sig, key)
+        self.passes += other.passes
+
+
+# Scenes whose items are fetched and validated together. A shard is read
+# this many rows at a time, so a worker never holds more than this many
+# items blobs, whatever --chunk-size is.
+_FETCH_SIZE = 100
+
+
+def audit_shard(shard: tuple[int, int, bool]) -> AuditResult:
+    """Validate the scenes with ids in ``[lo, hi]``. Items whose hash is a
+    known pass are counted without being fetched. Runs in a pool worker."""
+    lo, hi, legacy_only = shard
+    qs = Scene.objects.filter(id__range=(lo, hi))
+    if legacy_only:
+        qs = qs.filter(is_legacy=True)
+    # jsonb's text form is canonical (sorted keys, normalized whitespace), so
+    # equal items hash equally whatever JSON they were written as.
+    hashes = (
+        qs.annotate(items_hash=MD5(Cast("items", TextField())))
+        .order_by("id")
+        .values_list("id", "items_hash")
+        .iterator(chunk_size=_FETCH_SIZE)
+    )
+    result = AuditResult()
+    for batch in batched(hashes, _FETCH_SIZE):
+        result.scanned += len(batch)
+        pending = {pk: digest for pk, digest in batch if digest not in _known_passes}
+        result.cached += len(batch) - len(pending)
+        result.passed += len(batch) - len(pending)
+        if not pending:
+            continue
+        rows = Scene.objects.filter(id__in=pending).values_list("id", "key", "items")
+        for pk, key, items in rows:
+            try:
+                MATH_ITEM_LIST_ADAPTER.validate_python(items)
+                result.passed += 1
+                result.passes.append(pending[pk])
+            except PydanticValidationError as exc:
+                result.failed += 1
+                errors = exc.errors()
+                for err in errors:
+                    sig = _signature(err, items)
+                    result.buckets[sig] += 1
+                    result.examples.setdefault(sig, key)
+                result.failures.append((key, errors))
+    return result
+
+
+def _load_cache(path: str, version: str) -> set[str]:
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return set()
+    if cache.get("schema_version") != version:
+        return set()
+    return set(cache["passed"])
+
+
+def _save_cache(path: str, version: str, passed: set[str]) -> None:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"schema_version": version, "passed": sorted(passed)}, f)
+
+
 class Command(BaseCommand):
     help = "Validate stored Scene.items against the Pydantic schema (read-only)."
 
@@ -64,7 +179,7 @@ class Command(BaseCommand):
             "--chunk-size",
             type=int,
             default=1000,
-            help="Rows per fetch chunk (default: 1000).",
+            help="Scene ids per shard (default: 1000).",
         )
         parser.add_argument(
             "--limit",
@@ -76,21 +191,53 @@ class Command(BaseCommand):
             type=str,
             help="Write full per-scene failures as JSONL to this path.",
         )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Worker processes to validate shards in (default: 1, in-process).",
+        )
+        parser.add_argument(
+            "--cache",
+            type=str,
+            help=(
+                "Read and update a content-hash cache of passing items at this "
+                "path; scenes whose items already passed under the current "
+                "schema are not re-validated."
+            ),
+        )
 
     def handle(self, *args, **options):
+        global _known_passes
+
         qs = Scene.objects.all()
         if options["legacy_only"]:
             qs = qs.filter(is_legacy=True)
-        qs = qs.values("key", "items")
         if options["limit"]:
-            qs = qs[: options["limit"]]
+            # Cap the id range at the limit-th scene, so shards stay ranges.
+            ids = qs.order_by("id").values_list("id", flat=True)
+            cap = list(ids[options["limit"] - 1 : options["limit"]])
+            if cap:
+                qs = qs.filter(id__lte=cap[0])
+        bounds = qs.aggregate(lo=Min("id"), hi=Max("id"))
 
         total = qs.count()
         self.stdout.write(f"Auditing {total} scenes...")
 
-        scanned = passed = failed = 0
-        buckets: Counter = Counter()
-        examples: dict = {}
+        version = schema_version()
+        _known_passes = (
+            _load_cache(options["cache"], version) if options["cache"] else set()
+        )
+
+        step = options["chunk_size"]
+        shards = []
+        if bounds["lo"] is not None:
+            shards = [
+                (lo, min(lo + step - 1, bounds["hi"]), options["legacy_only"])
+                for lo in range(bounds["lo"], bounds["hi"] + 1, step)
+            ]
+
+        result = AuditResult()
         out = None
         if options["out"]:
             parent = os.path.dirname(options["out"])
@@ -98,41 +245,51 @@ class Command(BaseCommand):
                 os.makedirs(parent, exist_ok=True)
             out = open(options["out"], "w")
 
+        progress = tqdm.tqdm(total=total, desc="Validating")
         try:
-            rows = qs.iterator(chunk_size=options["chunk_size"])
-            for row in tqdm.tqdm(rows, total=total, desc="Validating"):
-                scanned += 1
-                try:
-                    MATH_ITEM_LIST_ADAPTER.validate_python(row["items"])
-                    passed += 1
-                except PydanticValidationError as exc:
-                    failed += 1
-                    errors = exc.errors()
-                    for err in errors:
-                        sig = _signature(err, row["items"])
-                        buckets[sig] += 1
-                        examples.setdefault(sig, row["key"])
-                    if out:
+            for shard_result in self._run(shards, options["jobs"]):
+                result.merge(shard_result)
+                progress.update(shard_result.scanned)
+                if out:
+                    for key, errors in shard_result.failures:
                         out.write(
-                            json.dumps(
-                                {"key": row["key"], "errors": errors}, default=str
-                            )
+                            json.dumps({"key": key, "errors": errors}, default=str)
                             + "\n"
                         )
         finally:
+            progress.close()
             if out:
                 out.close()
 
-        self._report(scanned, passed, failed, buckets, examples)
+        if options["cache"]:
+            _save_cache(options["cache"], version, _known_passes | set(result.passes))
+
+        self._report(result)
         if options["out"]:
             self.stdout.write(f"\nFull per-scene failures written to {options['out']}")
 
-    def _report(self, scanned, passed, failed, buckets, examples):
+    def _run(self, shards, jobs):
+        """Yield each shard's AuditResult, in-process or from a worker pool."""
+        if jobs <= 1:
+            for shard in shards:
+                yield audit_shard(shard)
+            return
+        # Forked workers must not share the parent's database socket; with
+        # none open, each worker connects on its first query.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(jobs) as pool:
+            yield from pool.imap_unordered(audit_shard, shards)
+
+    def _report(self, result):
         self.stdout.write("")
-        style = self.style.SUCCESS if failed == 0 else self.style.WARNING
+        style = self.style.SUCCESS if result.failed == 0 else self.style.WARNING
         self.stdout.write(
-            style(f"scanned {scanned} · passed {passed} · failed {failed}")
+            style(
+                f"scanned {result.scanned} · passed {result.passed} "
+                f"({result.cached} cached) · failed {result.failed}"
+            )
         )
+        buckets, examples = result.buckets, result.examples
         if not buckets:
             return
 
@@ -0,0 +1,58 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from scenes.edge import drain_purge_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge the scene keys queued in the purge outbox from the edge "
+        "(scenes/edge.py): once, or continuously with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Keys purged per request (default: 500)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining; sleep --interval seconds whenever the outbox is idle",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Idle poll interval in seconds with --loop (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                purged = drain_purge_outbox(options["batch_size"])
+            except Exception:
+                if not options["loop"]:
+                    raise
+                # A database blip must not kill the purger; the claim rolled
+                # back, so its rows are still queued.
+                logger.exception("draining the purge outbox failed")
+                close_old_connections()
+                time.sleep(options["interval"])
+                continue
+            if purged:
+                self.stdout.write(f"purged={purged}")
+            if not options["loop"]:
+                return
+            # A long-lived process: drop connections the server has closed
+            # or that outlived CONN_MAX_AGE, as a request cycle would.
+            close_old_connections()
+            if purged < options["batch_size"]:
+                time.sleep(options["interval"])
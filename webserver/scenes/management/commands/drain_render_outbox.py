@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from scenes.screenshots import drain_render_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Nudge the render Worker for the scenes queued in the render outbox "
+        "(ADR-0003): once, or continuously with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Outbox rows claimed per batch (default: 50)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining; sleep --interval seconds whenever the outbox is idle",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Idle poll interval in seconds with --loop (default: 2)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = drain_render_outbox(options["batch_size"])
+            except Exception:
+                if not options["loop"]:
+                    raise
+                # A database blip must not kill the worker; claimed rows
+                # come back when their lease ends.
+                logger.exception("draining the render outbox failed")
+                close_old_connections()
+                time.sleep(options["interval"])
+                continue
+            if result.claimed:
+                self.stdout.write(
+                    f"rendered={result.rendered} retried={result.retried} "
+                    f"dropped={result.dropped} declined={result.declined}"
+                )
+            if not options["loop"]:
+                return
+            # A long-lived process: drop connections the server has closed
+            # or that outlived CONN_MAX_AGE, as a request cycle would.
+            close_old_connections()
+            if result.claimed < options["batch_size"]:
+                time.sleep(options["interval"])
@@ -1,11 +1,43 @@
+import multiprocessing
+from typing import Optional
+
 import tqdm
 from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min
 
 from scenes.models import LegacyScene
-from scenes.legacy_scene_utils.migrate_scene import migrate_scene
+from scenes.legacy_scene_utils.migrate_scene import TRANSLATOR_VERSION, migrate_scenes
+
+
+def _selected(resume: bool, keys: Optional[list[str]]):
+    legacy_scenes = LegacyScene.objects.all()
+    if resume:
+        # The per-row marker is the checkpoint: migrate_scenes() commits it
+        # in the same transaction as the batch's Scenes.
+        legacy_scenes = legacy_scenes.exclude(translator_version=TRANSLATOR_VERSION)
+    if keys:
+        legacy_scenes = legacy_scenes.filter(key__in=keys)
+    return legacy_scenes
+
+
+def migrate_batch(batch: tuple[int, int, bool, Optional[list[str]]]) -> int:
+    """Migrate the selected legacy scenes with pks in ``[lo, hi]``; runs in a
+    pool worker. Returns how many it processed."""
+    lo, hi, resume, keys = batch
+    legacy_scenes = list(_selected(resume, keys).filter(pk__range=(lo, hi)))
+    if legacy_scenes:
+        migrate_scenes(legacy_scenes)
+    return len(legacy_scenes)
 
 
 class Command(BaseCommand):
+    help = (
+        "Migrate LegacyScenes into Scenes in batches, optionally across worker "
+        "processes. Each batch commits together with its migration markers, so "
+        "an interrupted run can be continued with --resume."
+    )
+
     def add_arguments(self, parser):
         parser.add_argument(
             "-l",
@@ -19,16 +51,64 @@ class Command(BaseCommand):
             "--filter",
             dest="filter",
             type=str,
-            help="Filter the scenes fetched by a SQL WHERE clause",
+            help="Only migrate the legacy scenes with these comma-separated keys",
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes (default: 1, in-process)",
+        )
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Scenes translated and written per batch (default: 500)",
+        )
+
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help=(
+                "Skip legacy scenes already migrated under the current "
+                "translator version, e.g. by an interrupted earlier run"
+            ),
         )
 
     def handle(self, *args, **options):
         limit = options["limit"]
-        legacy_scenes = LegacyScene.objects.all()
-        if options["filter"]:
-            legacy_scenes = legacy_scenes.filter(key__in=options["filter"].split(","))
-        elif limit:
-            legacy_scenes = legacy_scenes[:limit]
-
-        for legacy_scene in tqdm.tqdm(legacy_scenes):
-            migrate_scene(legacy_scene)
+        keys = options["filter"].split(",") if options["filter"] else None
+        legacy_scenes = _selected(options["resume"], keys)
+        if limit and not keys:
+            # Cap the pk range at the limit-th scene, so batches stay ranges.
+            pks = legacy_scenes.order_by("pk").values_list("pk", flat=True)
+            cap = list(pks[limit - 1 : limit])
+            if cap:
+                legacy_scenes = legacy_scenes.filter(pk__lte=cap[0])
+        bounds = legacy_scenes.aggregate(lo=Min("pk"), hi=Max("pk"))
+
+        # Only pk ranges cross the process boundary; each worker loads its
+        # own batch's dehydrated blobs.
+        step = options["batch_size"]
+        batches = []
+        if bounds["lo"] is not None:
+            batches = [
+                (lo, min(lo + step - 1, bounds["hi"]), options["resume"], keys)
+                for lo in range(bounds["lo"], bounds["hi"] + 1, step)
+            ]
+
+        progress = tqdm.tqdm(total=legacy_scenes.count())
+        if options["workers"] <= 1:
+            for batch in batches:
+                progress.update(migrate_batch(batch))
+        else:
+            # Forked workers must not share the parent's database socket;
+            # with none open, each worker connects on its first query.
+            connections.close_all()
+            context = multiprocessing.get_context("fork")
+            with context.Pool(options["workers"]) as pool:
+                for migrated in pool.imap(migrate_batch, batches):
+                    progress.update(migrated)
+        progress.close()
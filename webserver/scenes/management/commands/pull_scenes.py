@@ -1,10 +1,37 @@
+import json
+import time
+from datetime import timedelta
+from itertools import batched
+
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connections
+from django.db import connection, connections, transaction
+from django.db.models import Max
 from django.conf import settings
+from django.utils import timezone
 import dj_database_url
 from tqdm import tqdm
-from scenes.models import Scene, LegacyScene, is_reserved_key_error
+from scenes.cache import invalidate_scene, invalidate_scenes
+from scenes.edge import purge
+from scenes.models import (
+    RESERVED_KEY_VALIDATOR,
+    PullWatermark,
+    Scene,
+    LegacyScene,
+    is_reserved_key_error,
+)
+from scenes.validators import validate_math_items_by_key
+
+# The columns a pull copies from the source. Everything else (author, dates,
+# the stored GET body, legacy migration markers) is local.
+SCENE_FIELDS = ["key", "items", "item_order", "title", "archived", "times_accessed"]
+LEGACY_SCENE_FIELDS = [
+    "key",
+    "times_accessed",
+    "last_accessed",
+    "dehydrated",
+    "migration_note",
+]
 
 
 def upsert_scene(scene_dict) -> bool:
@@ -14,8 +41,14 @@ def upsert_scene(scene_dict) -> bool:
     Non-key validation failures (e.g. invalid items) re-raise so the pull fails
     loudly rather than silently skipping corrupt data as if it were reserved.
     """
+    key = scene_dict["key"]
+    if _is_reserved(key):
+        return False
+    # Stored dumped, as upsert_scenes stores them; save() validates again.
+    items = validate_math_items_by_key({key: scene_dict["items"]})[key]
     try:
-        Scene.objects.update_or_create(key=scene_dict["key"], defaults=scene_dict)
+        Scene.objects.update_or_create(key=key, defaults={**scene_dict, "items": items})
+        invalidate_scene(key)
         return True
     except ValidationError as e:
         if is_reserved_key_error(e):
@@ -23,6 +56,132 @@ def upsert_scene(scene_dict) -> bool:
         raise
 
 
+# --incremental re-reads this much before each watermark. Source timestamps
+# are taken at save(), not at commit, so a transaction that commits after a
+# pull read its mark can carry an older timestamp; the overlap picks it up on
+# the next run. Re-pulling a row is a harmless no-op upsert.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def _is_reserved(key: str) -> bool:
+    try:
+        RESERVED_KEY_VALIDATOR(key)
+    except ValidationError:
+        return True
+    return False
+
+
+# The columns a pulled row's GET body (and so its modified_date) depends on.
+# times_accessed is copied too, but a change to it alone is no new version.
+_CONTENT_FIELDS = ["items", "item_order", "title", "archived"]
+
+
+def _row(fields: list[str], alias: str) -> str:
+    return "(" + ", ".join(f"{alias}.{field}" for field in fields) + ")"
+
+
+# Raw SQL: bulk_create(update_conflicts=True) can't make the update
+# conditional, and re-pulled rows are mostly unchanged. Those are left alone;
+# rows whose view count alone moved keep their modified_date and stored body.
+_CONTENT_CHANGED = (
+    f"{_row(_CONTENT_FIELDS, 'scene')} IS DISTINCT FROM "
+    f"{_row(_CONTENT_FIELDS, 'EXCLUDED')}"
+)
+_UPSERT_SCENES_SQL = f"""
+    INSERT INTO {Scene._meta.db_table} AS scene (
+        {", ".join(SCENE_FIELDS)},
+        is_legacy, serialized_version, created_date, modified_date
+    )
+    SELECT {", ".join(f"r.{field}" for field in SCENE_FIELDS)},
+           false, '', %(now)s, %(now)s
+    FROM jsonb_to_recordset(%(rows)s::jsonb) AS r(
+        key text, items jsonb, item_order jsonb, title text,
+        archived boolean, times_accessed integer
+    )
+    ON CONFLICT (key) DO UPDATE SET
+        {", ".join(f"{field} = EXCLUDED.{field}" for field in SCENE_FIELDS[1:])},
+        modified_date = CASE WHEN {_CONTENT_CHANGED}
+            THEN EXCLUDED.modified_date ELSE scene.modified_date END,
+        serialized = CASE WHEN {_CONTENT_CHANGED}
+            THEN NULL ELSE scene.serialized END
+    WHERE {_row(SCENE_FIELDS[1:], "scene")}
+        IS DISTINCT FROM {_row(SCENE_FIELDS[1:], "EXCLUDED")}
+    RETURNING key, modified_date = %(now)s
+"""
+
+
+def upsert_scenes(scene_dicts: list[dict]) -> list[str]:
+    """
+    Batch ``upsert_scene``: one Pydantic validation for every scene's items,
+    then one INSERT ... ON CONFLICT (key) DO UPDATE. Returns the reserved keys
+    that were skipped.
+
+    Same contract as ``upsert_scene``: invalid items raise, naming the keys,
+    and nothing from the batch is written. Items are stored as dumped from
+    the validated models, as the API stores them. A row whose content changed has
+    ``modified_date`` bumped as ``save()`` would, and its stored body cleared
+    to be regenerated on its next read; an unchanged row is not written.
+    """
+    reserved = [d["key"] for d in scene_dicts if _is_reserved(d["key"])]
+    rows = [d for d in scene_dicts if d["key"] not in reserved]
+    items = validate_math_items_by_key({d["key"]: d["items"] for d in rows})
+    rows = [{**d, "items": items[d["key"]]} for d in rows]
+    params = {"now": timezone.now(), "rows": json.dumps(rows)}
+    with connection.cursor() as cur:
+        cur.execute(_UPSERT_SCENES_SQL, params)
+        changed = [key for key, bumped in cur.fetchall() if bumped]
+    invalidate_scenes(changed)
+    return reserved
+
+
+def upsert_legacy_scenes(legacy_scene_dicts: list[dict]) -> None:
+    """Batch ``LegacyScene.objects.update_or_create``: one upsert statement."""
+    LegacyScene.objects.bulk_create(
+        [LegacyScene(**d) for d in legacy_scene_dicts],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=LEGACY_SCENE_FIELDS[1:],
+    )
+
+
+def _since(mark):
+    return mark - WATERMARK_OVERLAP if mark is not None else None
+
+
+def delete_missing_keys(model, source_keys, chunk_size, keep_keys_of=None) -> list[str]:
+    """Delete the ``model`` rows whose key is not in ``source_keys`` (any
+    iterable, consumed in chunks), nor in ``keep_keys_of``'s table if given;
+    return the deleted keys."""
+    # Raw SQL: the ORM can't stage keys in a temp table or anti-join on one.
+    # Neither model has reverse relations, so skipping the ORM's delete
+    # collector skips no cascades. The table is dropped by each call, not at
+    # commit, so two calls in one outer transaction don't collide.
+    keep = ""
+    if keep_keys_of is not None:
+        keep = (
+            f"AND NOT EXISTS (SELECT 1 FROM {keep_keys_of._meta.db_table} k "
+            "WHERE k.key = t.key)"
+        )
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE pull_source_keys (key text PRIMARY KEY)")
+        for chunk in batched(source_keys, chunk_size):
+            cur.execute(
+                "INSERT INTO pull_source_keys SELECT unnest(%s::text[])",
+                [list(chunk)],
+            )
+        cur.execute(
+            f"""
+            DELETE FROM {model._meta.db_table} AS t
+            WHERE NOT EXISTS (SELECT 1 FROM pull_source_keys s WHERE s.key = t.key)
+            {keep}
+            RETURNING t.key
+            """
+        )
+        deleted = [key for (key,) in cur.fetchall()]
+        cur.execute("DROP TABLE pull_source_keys")
+        return deleted
+
+
 class Command(BaseCommand):
     help = "Pull Scene and LegacyScene data from an external database."
 
@@ -39,6 +198,30 @@ class Command(BaseCommand):
             default=500,
             help="Number of records to process in each chunk (default: 500)",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help=(
+                "Validate and upsert each chunk in one statement instead of "
+                "row by row, and report rows/sec"
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Bulk-pull only rows changed since the last successful "
+                "incremental pull from the same source (implies --bulk)"
+            ),
+        )
+        parser.add_argument(
+            "--tombstones",
+            action="store_true",
+            help=(
+                "Afterwards, delete local scenes and legacy scenes whose key is "
+                "not in the source, including any created locally"
+            ),
+        )
 
     def fetch_scenes(self, source_db, chunk_size):
         """
@@ -117,6 +300,111 @@ class Command(BaseCommand):
                 key=legacy_scene_dict["key"], defaults=legacy_scene_dict
             )
 
+    def _stream(self, queryset, fields, chunk_size, desc):
+        """Chunks of ``fields`` dicts. On Postgres, ``iterator()`` reads
+        through a server-side cursor, so only one chunk is held at a time."""
+        rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+        total = queryset.count()
+        self.stdout.write(f"Total {desc} to fetch: {total}")
+        with tqdm(total=total, desc=f"Fetching {desc}") as progress:
+            for chunk in batched(rows, chunk_size):
+                yield list(chunk)
+                progress.update(len(chunk))
+
+    def _report_rate(self, desc, rows, started):
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f"Upserted {rows} {desc} in {elapsed:.1f}s ({rate:.0f} rows/sec)"
+        )
+
+    def fetch_scenes_bulk(self, source_db, chunk_size, since=None):
+        """``fetch_scenes``, one upsert per chunk, optionally only the scenes
+        modified at or after ``since``. Returns the skipped reserved keys."""
+        started = time.perf_counter()
+        rows = 0
+        reserved_keys = []
+        scenes = Scene.objects.using(source_db)
+        if since is not None:
+            scenes = scenes.filter(modified_date__gte=since)
+        for chunk in self._stream(scenes, SCENE_FIELDS, chunk_size, "scenes"):
+            reserved_keys += upsert_scenes(chunk)
+            rows += len(chunk)
+        self._report_rate("scenes", rows, started)
+        return reserved_keys
+
+    def fetch_legacy_scenes_bulk(self, source_db, chunk_size, since=None):
+        """``fetch_legacy_scenes``, one upsert per chunk, optionally only the
+        legacy scenes accessed at or after ``since``."""
+        started = time.perf_counter()
+        rows = 0
+        legacy_scenes = LegacyScene.objects.using(source_db)
+        if since is not None:
+            legacy_scenes = legacy_scenes.filter(last_accessed__gte=since)
+        for chunk in self._stream(
+            legacy_scenes, LEGACY_SCENE_FIELDS, chunk_size, "legacy scenes"
+        ):
+            upsert_legacy_scenes(chunk)
+            rows += len(chunk)
+        self._report_rate("legacy scenes", rows, started)
+
+    def pull_incremental(self, source_db, source, chunk_size):
+        """Bulk-pull the rows changed since ``source``'s watermark, then
+        advance it. Returns the skipped reserved keys."""
+        watermark = PullWatermark.objects.filter(pk=source).first() or PullWatermark(
+            source=source
+        )
+        # Read before streaming: a row changed mid-pull is pulled either now
+        # or by the next run.
+        scene_mark = Scene.objects.using(source_db).aggregate(
+            mark=Max("modified_date")
+        )["mark"]
+        legacy_mark = LegacyScene.objects.using(source_db).aggregate(
+            mark=Max("last_accessed")
+        )["mark"]
+
+        reserved_keys = self.fetch_scenes_bulk(
+            source_db, chunk_size, since=_since(watermark.scene_modified_date)
+        )
+        self.fetch_legacy_scenes_bulk(
+            source_db, chunk_size, since=_since(watermark.legacy_last_accessed)
+        )
+
+        # Only after both pulls succeed; a failed run retries from the old marks.
+        watermark.scene_modified_date = scene_mark or watermark.scene_modified_date
+        watermark.legacy_last_accessed = legacy_mark or watermark.legacy_last_accessed
+        watermark.modified = timezone.now()
+        watermark.save()
+        return reserved_keys
+
+    def delete_missing(self, source_db, chunk_size):
+        """Tombstone pass: delete the local rows whose key the source no
+        longer has. Only keys cross the wire. They are staged in a temp
+        table, and one anti-join DELETE per table removes the rest.
+
+        Legacy scenes go first. A Scene whose key is still a LegacyScene was
+        migrated from it, here or in the source, and is kept: the source may
+        not have migrated it yet, and its LegacyScene is stamped as migrated,
+        so GET would not re-create a deleted one.
+        """
+        for model, keep_keys_of in ((LegacyScene, None), (Scene, LegacyScene)):
+            source_keys = (
+                model.objects.using(source_db)
+                .order_by()
+                .values_list("key", flat=True)
+                .iterator(chunk_size=chunk_size)
+            )
+            deleted = delete_missing_keys(
+                model, source_keys, chunk_size, keep_keys_of=keep_keys_of
+            )
+            if model is Scene and deleted:
+                invalidate_scenes(deleted)
+                purge(deleted)
+            self.stdout.write(
+                f"Deleted {len(deleted)} {model._meta.verbose_name_plural} "
+                "missing from the source"
+            )
+
     def handle(self, *args, **kwargs):
         database_url = kwargs.get("database_url")
         chunk_size = kwargs["chunk_size"]
@@ -144,8 +432,17 @@ class Command(BaseCommand):
 
         # Fetch scenes and legacy scenes. Reserved keys are skipped (not fatal
         # mid-run) so both pulls complete; report them at the very end.
-        reserved_keys = self.fetch_scenes(source_db, chunk_size)
-        self.fetch_legacy_scenes(source_db, chunk_size)
+        if kwargs.get("incremental"):
+            source = f"{db_config['HOST']}:{db_config['PORT']}/{db_config['NAME']}"
+            reserved_keys = self.pull_incremental(source_db, source, chunk_size)
+        elif kwargs.get("bulk"):
+            reserved_keys = self.fetch_scenes_bulk(source_db, chunk_size)
+            self.fetch_legacy_scenes_bulk(source_db, chunk_size)
+        else:
+            reserved_keys = self.fetch_scenes(source_db, chunk_size)
+            self.fetch_legacy_scenes(source_db, chunk_size)
+        if kwargs.get("tombstones"):
+            self.delete_missing(source_db, chunk_size)
 
         self.stdout.write(self.style.SUCCESS("Successfully fetched all scenes."))
 
@@ -0,0 +1,130 @@
+import copy
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from authentication.factories import CustomUserFactory
+from scenes.cache import cache_scene, get_cached_scene
+from scenes.factories import SceneFactory
+from scenes.legacy_scene_utils.migrate_scene import (
+    TRANSLATOR_VERSION,
+    migrate_scene,
+    migrate_scenes,
+)
+from scenes.models import LegacyScene, Scene
+
+DEHYDRATED = {
+    "folders": {},
+    "mathSymbols": {},
+    "mathGraphics": {},
+    "sliderValues": {},
+    "sortableTree": {"root": []},
+    "metadata": {"creationDate": '"2020-01-01T00:00:00Z"', "title": "Old"},
+}
+
+
+def _legacy(**kwargs):
+    return LegacyScene.objects.create(dehydrated=copy.deepcopy(DEHYDRATED), **kwargs)
+
+
+@pytest.mark.django_db
+def test_migrate_scenes_matches_migrate_scene():
+    one, many = _legacy(times_accessed=3), _legacy(times_accessed=3)
+    migrate_scene(LegacyScene.objects.get(pk=one.pk))
+    assert migrate_scenes([LegacyScene.objects.get(pk=many.pk)]) == 1
+    fields = ["items", "item_order", "title", "times_accessed", "is_legacy"]
+    fields += ["created_date", "modified_date", "serialized"]
+    expected = Scene.objects.filter(key=one.key).values(*fields).get()
+    assert Scene.objects.filter(key=many.key).values(*fields).get() == expected
+    assert expected["created_date"] == datetime(2020, 1, 1, tzinfo=timezone.utc)
+    assert expected["serialized"] is None
+
+
+@pytest.mark.django_db
+def test_migrate_scenes_stamps_markers():
+    legacy = _legacy()
+    migrate_scenes([legacy])
+    legacy.refresh_from_db()
+    assert legacy.translator_version == TRANSLATOR_VERSION
+    assert legacy.migrated_at is not None
+
+
+@pytest.mark.django_db
+def test_migrate_scenes_skips_and_stamps_reserved_key():
+    reserved, ok = _legacy(key="a"), _legacy()
+    assert migrate_scenes([reserved, ok]) == 1
+    assert not Scene.objects.filter(key="a").exists()
+    reserved.refresh_from_db()
+    assert reserved.translator_version == TRANSLATOR_VERSION
+    assert reserved.migration_note == "Skipped: reserved key."
+
+
+@pytest.mark.django_db
+def test_migrate_scenes_upsert_keeps_author_and_archived():
+    me = CustomUserFactory.create()
+    legacy = _legacy()
+    SceneFactory.create(key=legacy.key, author=me, archived=True, title="Mine")
+    cache_scene(legacy.key, (b"{}", datetime.now(timezone.utc)))
+    migrate_scenes([legacy])
+    scene = Scene.objects.get(key=legacy.key)
+    assert (scene.title, scene.author_id, scene.archived) == ("Old", me.id, True)
+    assert get_cached_scene(legacy.key) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "migrate", [migrate_scene, lambda legacy: migrate_scenes([legacy])]
+)
+def test_remigration_keeps_views_accrued_since_first_migration(migrate):
+    legacy = _legacy(times_accessed=3)
+    migrate(LegacyScene.objects.get(pk=legacy.pk))
+    assert Scene.objects.get(key=legacy.key).times_accessed == 3
+    Scene.objects.filter(key=legacy.key).update(times_accessed=10)
+    migrate(LegacyScene.objects.get(pk=legacy.pk))
+    assert Scene.objects.get(key=legacy.key).times_accessed == 10
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "migrate", [migrate_scene, lambda legacy: migrate_scenes([legacy])]
+)
+def test_remigration_is_a_new_version(migrate):
+    legacy = _legacy()
+    migrate(LegacyScene.objects.get(pk=legacy.pk))
+    first = Scene.objects.get(key=legacy.key)
+    with mock.patch("scenes.legacy_scene_utils.migrate_scene.schedule_purge") as purge:
+        migrate(LegacyScene.objects.get(pk=legacy.pk))
+    again = Scene.objects.get(key=legacy.key)
+    assert again.created_date == first.created_date
+    assert again.modified_date > first.modified_date
+    purge.assert_called_once_with(legacy.key)
+
+
+@pytest.mark.django_db
+def test_command_resume_skips_migrated_scenes():
+    done, todo = _legacy(), _legacy()
+    migrate_scenes([done])
+    Scene.objects.filter(key=done.key).update(title="Edited")
+    call_command("migrate_legacy_data", "--resume", "--batch-size", "1")
+    assert Scene.objects.get(key=done.key).title == "Edited"
+    assert Scene.objects.get(key=todo.key).title == "Old"
+
+
+@pytest.mark.django_db
+def test_command_limit_and_filter():
+    first, second, third = _legacy(), _legacy(), _legacy()
+    call_command("migrate_legacy_data", "--limit", "2", "--batch-size", "1")
+    assert set(Scene.objects.values_list("key", flat=True)) == {first.key, second.key}
+    call_command("migrate_legacy_data", "--filter", f"{third.key},missing")
+    assert Scene.objects.filter(key=third.key).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_command_with_workers_migrates_every_batch():
+    legacy = [_legacy() for _ in range(5)]
+    call_command("migrate_legacy_data", "--workers", "2", "--batch-size", "2")
+    keys = {scene.key for scene in legacy}
+    assert Scene.objects.filter(key__in=keys, is_legacy=True).count() == 5
+    assert not LegacyScene.objects.exclude(translator_version=TRANSLATOR_VERSION)
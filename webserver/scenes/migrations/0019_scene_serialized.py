@@ -0,0 +1,24 @@
+# Generated by Django 6.0.7 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0018_render_ledgers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scene",
+            name="serialized",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="scene",
+            name="serialized_version",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:04
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CONCURRENTLY can't run in a transaction; it avoids locking the scenes
+    # table against writes while the index builds.
+    atomic = False
+
+    dependencies = [
+        ("scenes", "0019_scene_serialized"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="scene",
+            index=models.Index(fields=["author", "id"], name="scene_author_id_index"),
+        ),
+    ]
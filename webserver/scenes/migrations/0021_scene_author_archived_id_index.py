@@ -0,0 +1,25 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:31
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # See 0020: build without blocking writes to the scenes table.
+    atomic = False
+
+    dependencies = [
+        ("scenes", "0020_scene_author_id_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="scene",
+            index=models.Index(
+                fields=["author", "archived", "id"],
+                name="scene_author_archived_id_index",
+            ),
+        ),
+    ]
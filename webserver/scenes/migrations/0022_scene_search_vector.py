@@ -0,0 +1,53 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:17
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+import scenes.models
+
+
+class Migration(migrations.Migration):
+    # Rollout cost: adding a STORED generated column rewrites scenes_scene
+    # once, computing the vector for every existing row, under an ACCESS
+    # EXCLUSIVE lock. Reads and writes of scenes block for the whole rewrite,
+    # so run it in a maintenance window on a large table. The GIN index is
+    # then built CONCURRENTLY, as in 0020, so it adds no lock time of its
+    # own; that needs the migration to run outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("scenes", "0021_scene_author_archived_id_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scene",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "title", config="english", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        scenes.models._ItemDescriptions("items"),
+                        config="english",
+                        weight="B",
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scene",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="scene_search_vector_index"
+            ),
+        ),
+    ]
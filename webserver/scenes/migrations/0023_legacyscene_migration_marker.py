@@ -0,0 +1,22 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0022_scene_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legacyscene",
+            name="migrated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="legacyscene",
+            name="translator_version",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+    ]
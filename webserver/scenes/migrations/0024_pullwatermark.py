@@ -0,0 +1,27 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:41
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0023_legacyscene_migration_marker"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PullWatermark",
+            fields=[
+                (
+                    "source",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("scene_modified_date", models.DateTimeField(null=True)),
+                ("legacy_last_accessed", models.DateTimeField(null=True)),
+                ("modified", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
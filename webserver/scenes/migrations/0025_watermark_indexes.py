@@ -0,0 +1,28 @@
+# Generated by Django 6.0.7 on 2026-10-18 15:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # See 0020: build without blocking writes to the scenes tables.
+    atomic = False
+
+    dependencies = [
+        ("scenes", "0024_pullwatermark"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="legacyscene",
+            index=models.Index(
+                fields=["last_accessed"], name="legacyscene_last_accessed_index"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scene",
+            index=models.Index(
+                fields=["modified_date"], name="scene_modified_date_index"
+            ),
+        ),
+    ]
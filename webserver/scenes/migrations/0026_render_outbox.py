@@ -0,0 +1,41 @@
+# Generated by Django 6.0.7 on 2026-10-18 16:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0025_watermark_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RenderRequest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=80, unique=True)),
+                (
+                    "requested_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("not_before", models.DateTimeField(default=django.utils.timezone.now)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("reserved", models.BooleanField(default=False)),
+                ("last_error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["not_before"], name="renderrequest_due_index")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.7 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0026_render_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="renderrequest",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.7 on 2026-10-18 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenes", "0027_renderrequest_claimed_until"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EdgePurge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=80, unique=True)),
+            ],
+        ),
+    ]
@@ -1,12 +1,15 @@
 import random
+from typing import Optional
 
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db.models.functions import Length
 from django.utils import timezone
 
+from scenes.serialization import SERIALIZATION_VERSION, serialize_scene
 from scenes.validators import validate_math_items
 from authentication.models import CustomUser
 
@@ -62,6 +65,20 @@ class LegacyScene(models.Model):
     last_accessed = models.DateTimeField(auto_now=True)
     dehydrated = models.JSONField()
     migration_note = models.TextField(default="")
+    # When ``migrate_scene`` last translated this scene into a ``Scene``, and
+    # under which TRANSLATOR_VERSION. GET re-migrates only when the version is
+    # stale (scenes/api.py); blank means never migrated.
+    migrated_at = models.DateTimeField(null=True, blank=True)
+    translator_version = models.CharField(max_length=32, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # pull_scenes --incremental reads a source's rows by this
+            # watermark column.
+            models.Index(
+                fields=["last_accessed"], name="legacyscene_last_accessed_index"
+            ),
+        ]
 
 
 class TimestampedModel(models.Model):
@@ -83,12 +100,36 @@ class TimestampedModel(models.Model):
     class Meta:
         abstract = True
 
-    def save(self, *args, **kwargs):
+    def stamp(self) -> None:
+        """Stamp the write about to happen: modified_date, plus created_date on
+        the first save, from a single clock read. Subclasses extend this to
+        derive fields that must reflect the final timestamps."""
         now = timezone.now()
-        if not self.id:
+        if not self.pk:
             self.created_date = now
         self.modified_date = now
-        return super().save()
+
+    def save(self, *args, **kwargs):
+        self.stamp()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "modified_date"}
+        return super().save(*args, **kwargs)
+
+
+class SceneManager(models.Manager):
+    def get_queryset(self):
+        # `serialized` is a second copy of the whole scene that only GET reads
+        # (explicitly, via values_list); `search_vector` is only ever read
+        # inside search SQL. Keep both out of every other query.
+        return super().get_queryset().defer("serialized", "search_vector")
+
+
+class _ItemDescriptions(models.Func):
+    """Every item's ``properties.description``, as a JSON array."""
+
+    function = "jsonb_path_query_array"
+    template = "%(function)s(%(expressions)s, '$[*].properties.description')"
+    output_field = models.JSONField()
 
 
 class Scene(TimestampedModel):
@@ -116,6 +157,33 @@ class Scene(TimestampedModel):
 
     is_legacy = models.BooleanField(default=False)
 
+    # GET /v1/scenes/{key}/'s response body, rendered at save time, and the
+    # SERIALIZATION_VERSION it was rendered under. See scenes/serialization.py.
+    serialized = models.BinaryField(null=True, blank=True, editable=False)
+    serialized_version = models.CharField(
+        max_length=32, blank=True, default="", editable=False
+    )
+
+    # Full-text search document (scenes/search.py): the title, weighted above
+    # the item descriptions. A stored generated column, so Postgres keeps it
+    # current on every write path, including bulk ones that bypass save().
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config="english")
+        + SearchVector(_ItemDescriptions("items"), weight="B", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SceneManager()
+
+    # True while ``items`` holds what ``set_validated_items`` assigned; read
+    # by save() and serialize_scene(). Not a field.
+    items_validated = False
+
+    # Field values as loaded from the database (attname -> value), set by
+    # from_db(); None on an instance that wasn't loaded. See changed_fields().
+    _loaded_values: Optional[dict] = None
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -128,13 +196,112 @@ class Scene(TimestampedModel):
                 name="title_gin_trgm_index",
                 fields=["title"],
                 opclasses=["gin_trgm_ops"],
-            )
+            ),
+            # my_scenes' keyset pages (scenes/pagination.py): author_id = %s
+            # AND id > <cursor> ORDER BY id, read straight off the index.
+            models.Index(fields=["author", "id"], name="scene_author_id_index"),
+            # The same with the archived filter the "My Scenes" page sends by
+            # default. The index above still serves "include archived": an
+            # (author, archived, id) scan can't yield id order across both
+            # archived values.
+            models.Index(
+                fields=["author", "archived", "id"],
+                name="scene_author_archived_id_index",
+            ),
+            GinIndex(fields=["search_vector"], name="scene_search_vector_index"),
+            # pull_scenes --incremental's watermark column (see PullWatermark).
+            models.Index(fields=["modified_date"], name="scene_modified_date_index"),
         ]
         ordering = ["id"]
 
+    def set_validated_items(self, items: list) -> None:
+        """Assign ``items`` dumped from MathItem models that were just
+        validated (the API's request schemas). The next save() skips the
+        second validation, both in full_clean() and when rendering the
+        stored body. Anything else assigning ``items`` gets validated."""
+        self.items = items
+        self.items_validated = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # References, not copies: changed_fields() sees assignments, not
+        # in-place mutation of a JSON value.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self) -> Optional[list[str]]:
+        """Names of the fields assigned a different value since this scene
+        was loaded, or None if it wasn't loaded (a new scene): every field
+        counts as changed. A field that was deferred counts as changed once
+        it's been loaded or assigned.
+
+        Only assignment is seen. To change ``items`` or ``item_order`` in
+        place, assign the result (a copy) or pass ``update_fields``.
+        """
+        if self._loaded_values is None:
+            return None
+        changed = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.generated:
+                continue
+            if field.attname not in self.__dict__:
+                continue  # deferred and never touched
+            value = self.__dict__[field.attname]
+            if field.attname in self._loaded_values:
+                loaded = self._loaded_values[field.attname]
+                # Identity first: an untouched blob isn't compared at all.
+                if value is loaded or value == loaded:
+                    continue
+            changed.append(field.name)
+        return changed
+
     def save(self, *args, **kwargs):
-        self.full_clean()
-        return super().save(*args, **kwargs)
+        """Validate and write. An update of a loaded scene writes only its
+        changed fields (plus the timestamps and stored body), and validates
+        only those: a title-only edit neither re-validates ``items`` nor
+        checks ``key`` for uniqueness."""
+        changed = self.changed_fields()
+        if (
+            changed is not None
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = changed
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            # stamp() rewrites these on every save.
+            kwargs["update_fields"] = {
+                *update_fields,
+                "serialized",
+                "serialized_version",
+            }
+        exclude = set()
+        if update_fields is not None:
+            exclude = {f.name for f in self._meta.fields} - set(update_fields)
+            if "items" not in update_fields:
+                # The stored items were validated when they were written, so
+                # serialize_scene() can take them as they are, too.
+                self.items_validated = True
+        if self.items_validated:
+            exclude.add("items")
+        self.full_clean(exclude=exclude or None)
+        try:
+            result = super().save(*args, **kwargs)
+        finally:
+            self.items_validated = False
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+        return result
+
+    def stamp(self) -> None:
+        super().stamp()
+        # After the timestamps, so the stored body carries this write's dates.
+        self.serialized = serialize_scene(self)
+        self.serialized_version = SERIALIZATION_VERSION
 
 
 class RenderDay(models.Model):
@@ -156,3 +323,52 @@ class RenderMonth(models.Model):
     month = models.DateField(primary_key=True)
     count = models.PositiveIntegerField(default=0)
     modified = models.DateTimeField(default=timezone.now)
+
+
+class PullWatermark(models.Model):
+    """Per-source high-water marks for ``pull_scenes --incremental``: the
+    source's latest ``Scene.modified_date`` and ``LegacyScene.last_accessed``
+    as of the start of the last successful pull. ``source`` identifies the
+    source database as ``host:port/name`` (never its credentials)."""
+
+    source = models.CharField(max_length=255, primary_key=True)
+    scene_modified_date = models.DateTimeField(null=True)
+    legacy_last_accessed = models.DateTimeField(null=True)
+    modified = models.DateTimeField(default=timezone.now)
+
+
+class RenderRequest(models.Model):
+    """The render outbox (ADR-0003): one row per scene key awaiting a render.
+    A save inserts (or, for a key already queued, refreshes) the row in its
+    own transaction; ``drain_render_outbox`` reserves a slot and nudges the
+    Worker for rows whose ``not_before`` has passed, then deletes them.
+
+    ``not_before`` is the debounce and the retry backoff; ``claimed_until``
+    is a drainer's lease, kept apart so a save during a claim is due after
+    its own debounce, not after the lease. ``reserved`` records that this
+    request already holds a render slot, so a retried nudge doesn't reserve
+    a second one."""
+
+    key = models.CharField(max_length=80, unique=True)
+    # Bumped by every save that queues the key; a drainer deletes the row only
+    # if this is unchanged, so a save during the render queues another one.
+    requested_at = models.DateTimeField(default=timezone.now)
+    not_before = models.DateTimeField(default=timezone.now)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    reserved = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["not_before"], name="renderrequest_due_index"),
+        ]
+
+
+class EdgePurge(models.Model):
+    """The purge outbox: one row per scene key whose edge copies are due a
+    purge. A write inserts it in its own transaction (``schedule_purge``);
+    ``drain_purge_outbox`` deletes a batch of rows and purges their keys in
+    one request. A key queued twice before a drain is purged once."""
+
+    key = models.CharField(max_length=80, unique=True)
@@ -1,6 +1,9 @@
+import json
+
 import pytest
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from scenes.models import Scene, is_reserved_key_error
 from scenes.factories import SceneFactory
 
@@ -56,3 +59,70 @@ def test_is_reserved_key_error_false_for_invalid_items():
     with pytest.raises(ValidationError) as exc_info:
         Scene(**kwargs).save()
     assert not is_reserved_key_error(exc_info.value)
+
+
+def _update_sql(ctx) -> str:
+    [sql] = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    return sql
+
+
+@pytest.mark.django_db
+def test_title_only_save_writes_and_validates_only_the_title():
+    scene = Scene.objects.get(pk=SceneFactory.create().pk)
+    # Stored items that no longer validate: a title edit must not trip on them.
+    Scene.objects.filter(pk=scene.pk).update(items=[{"unexpected": "shape"}])
+    scene = Scene.objects.get(pk=scene.pk)
+    scene.title = "Renamed"
+    with CaptureQueriesContext(connection) as ctx:
+        scene.save()
+    # One UPDATE, and no uniqueness SELECT on key.
+    assert len(ctx.captured_queries) == 1
+    sql = _update_sql(ctx)
+    assert '"title"' in sql and '"modified_date"' in sql and '"serialized"' in sql
+    assert '"items"' not in sql and '"item_order"' not in sql
+    assert (
+        json.loads(Scene.objects.values_list("serialized", flat=True).get(pk=scene.pk))[
+            "title"
+        ]
+        == "Renamed"
+    )
+
+
+@pytest.mark.django_db
+def test_reassigning_equal_items_is_not_a_change():
+    scene = Scene.objects.get(pk=SceneFactory.create().pk)
+    scene.items = json.loads(json.dumps(scene.items))
+    assert scene.changed_fields() == []
+
+
+@pytest.mark.django_db
+def test_changed_items_are_validated():
+    scene = Scene.objects.get(pk=SceneFactory.create().pk)
+    scene.items = [{"unexpected": "shape"}]
+    assert scene.changed_fields() == ["items"]
+    with pytest.raises(ValidationError) as exc_info:
+        scene.save()
+    assert "items" in exc_info.value.error_dict
+
+
+@pytest.mark.django_db
+def test_explicit_update_fields_are_honored():
+    """TimestampedModel.save used to drop update_fields (and every other
+    argument) on the floor."""
+    scene = Scene.objects.get(pk=SceneFactory.create(archived=False).pk)
+    before = scene.modified_date
+    scene.title, scene.archived = "Renamed", True
+    scene.save(update_fields=["title"])
+    stored = Scene.objects.get(pk=scene.pk)
+    assert (stored.title, stored.archived) == ("Renamed", False)
+    assert stored.modified_date > before
+
+
+@pytest.mark.django_db
+def test_new_scene_is_fully_validated_and_tracked_after_save():
+    scene = Scene(**_valid_scene_kwargs("fresh"))
+    assert scene.changed_fields() is None
+    scene.save()
+    assert scene.changed_fields() == []
+    scene.title = "Second"
+    assert scene.changed_fields() == ["title"]
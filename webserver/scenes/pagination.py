@@ -0,0 +1,105 @@
+"""Keyset pagination for the scene list endpoints.
+
+``LimitOffsetPagination`` pays an OFFSET scan that grows with page depth plus
+a ``COUNT(*)`` on every page. ``ScenePagination`` keeps ``limit``/``offset``
+working and adds:
+
+- ``next``: an opaque cursor for the page after this one, or null on the last
+  page. Passing it back as ``cursor`` seeks straight to ``id > <last id>`` on
+  an index, so every page costs O(limit) however deep it is. The cursor is
+  ``id``-keyed because scenes list in ``id`` order (``Scene.Meta.ordering``).
+- ``count=false``: skip the ``COUNT(*)``; ``count`` is then null.
+
+Whether a next page exists comes from fetching ``limit + 1`` rows, not from the
+count. Pages also carry a weak ETag over what they list (scenes/conditional.py).
+It is computed from the page and the count, so a 304 saves the body's
+bandwidth and serialization but not the queries: the page is narrow (the list
+schemas carry no ``items``), and a validator that skipped the ``COUNT(*)``
+couldn't see a delete elsewhere in the filtered set. Views using this
+paginator must declare ``response: HttpResponse``.
+"""
+
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from math import inf
+from typing import Any, List, Optional
+
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from ninja import Field, Schema
+from ninja.conf import settings
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+from scenes.conditional import check_not_modified, make_etag, set_validators
+
+
+def _encode_cursor(last_id: int) -> str:
+    return urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise HttpError(400, "Invalid cursor.") from None
+
+
+class ScenePagination(PaginationBase):
+    class Input(Schema):
+        limit: int = Field(
+            settings.PAGINATION_PER_PAGE,
+            ge=1,
+            le=(
+                settings.PAGINATION_MAX_LIMIT
+                if settings.PAGINATION_MAX_LIMIT != inf
+                else None
+            ),
+        )
+        offset: int = Field(0, ge=0)
+        # Takes precedence over ``offset``.
+        cursor: Optional[str] = None
+        count: bool = True
+
+    class Output(Schema):
+        items: List[Any]
+        count: Optional[int]
+        next: Optional[str]
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        request: HttpRequest,
+        **params: Any,
+    ) -> Any:
+        limit: int = min(pagination.limit, settings.PAGINATION_MAX_LIMIT)
+        # Explicit so the seek and the page order can't disagree.
+        ordered = queryset.order_by("id")
+        if pagination.cursor is not None:
+            page = ordered.filter(id__gt=_decode_cursor(pagination.cursor))[: limit + 1]
+        else:
+            page = ordered[pagination.offset : pagination.offset + limit + 1]
+        rows = list(page)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        result = {
+            "items": rows,
+            "count": self._items_count(queryset) if pagination.count else None,
+            "next": _encode_cursor(rows[-1].id) if has_next else None,
+        }
+
+        # Weak: it covers what the page lists, not the bytes. Every write to a
+        # listed column goes through save() or an upsert that sets
+        # modified_date; the bulk .update()s (view counts, stored bodies,
+        # render outbox) touch no listed column.
+        etag = make_etag(
+            request.get_full_path(),
+            result["count"],
+            result["next"],
+            *(f"{row.key}@{row.modified_date.isoformat()}" for row in rows),
+            weak=True,
+        )
+        check_not_modified(request, etag)
+        set_validators(params["response"], etag)
+        return result
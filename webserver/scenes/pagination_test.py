@@ -0,0 +1,85 @@
+import pytest
+from django.test import Client
+
+from authentication.factories import CustomUserFactory
+from scenes.factories import SceneFactory
+
+LIST_URL = "/v1/scenes/"
+ME_URL = "/v1/scenes/me/"
+
+
+def _walk(client, url, **params):
+    """Follow ``next`` cursors from the first page; return every page."""
+    pages = [client.get(url, params).json()]
+    while pages[-1]["next"]:
+        pages.append(client.get(url, {**params, "cursor": pages[-1]["next"]}).json())
+    return pages
+
+
+@pytest.mark.django_db
+def test_cursor_walk_visits_every_scene_once_in_id_order():
+    scenes = SceneFactory.create_batch(7)
+    pages = _walk(Client(), LIST_URL, limit=3)
+    assert [len(p["items"]) for p in pages] == [3, 3, 1]
+    keys = [item["key"] for page in pages for item in page["items"]]
+    assert keys == [s.key for s in scenes]
+
+
+@pytest.mark.django_db
+def test_exact_multiple_has_no_dangling_page():
+    SceneFactory.create_batch(4)
+    pages = _walk(Client(), LIST_URL, limit=2)
+    assert len(pages) == 2
+    assert pages[-1]["next"] is None
+
+
+@pytest.mark.django_db
+def test_cursor_page_skips_count_and_offset(django_assert_num_queries):
+    SceneFactory.create_batch(3)
+    client = Client()
+    cursor = client.get(LIST_URL, {"limit": 1}).json()["next"]
+    with django_assert_num_queries(1) as ctx:
+        body = client.get(
+            LIST_URL, {"limit": 1, "cursor": cursor, "count": "false"}
+        ).json()
+    assert body["count"] is None
+    sql = ctx.captured_queries[0]["sql"]
+    assert "OFFSET" not in sql and "COUNT" not in sql
+
+
+@pytest.mark.django_db
+def test_offset_mode_still_counts_and_offers_a_cursor():
+    scenes = SceneFactory.create_batch(3)
+    body = Client().get(LIST_URL, {"limit": 1, "offset": 1}).json()
+    assert body["count"] == 3
+    assert [i["key"] for i in body["items"]] == [scenes[1].key]
+    after = Client().get(LIST_URL, {"limit": 1, "cursor": body["next"]}).json()
+    assert [i["key"] for i in after["items"]] == [scenes[2].key]
+
+
+@pytest.mark.django_db
+def test_cursor_respects_filters():
+    SceneFactory.create_batch(2, archived=True)
+    live = SceneFactory.create_batch(3, archived=False)
+    pages = _walk(Client(), LIST_URL, limit=2, archived="false")
+    keys = [item["key"] for page in pages for item in page["items"]]
+    assert keys == [s.key for s in live]
+
+
+@pytest.mark.django_db
+def test_me_cursor_walk_is_owner_scoped():
+    user = CustomUserFactory.create()
+    mine = SceneFactory.create_batch(3, author=user)
+    SceneFactory.create_batch(2)
+    client = Client()
+    client.force_login(user)
+    pages = _walk(client, ME_URL, limit=2)
+    keys = [item["key"] for page in pages for item in page["items"]]
+    assert keys == [s.key for s in mine]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", ["!!!", "bm90LWFuLWlk"])  # b64("not-an-id")
+def test_invalid_cursor_is_400(cursor):
+    response = Client().get(LIST_URL, {"cursor": cursor})
+    assert response.status_code == 400
@@ -1,10 +1,20 @@
+from datetime import datetime, timezone
+from io import StringIO
 from unittest import mock
 
 import pytest
 from django.core.exceptions import ValidationError
 from django.core.management.base import CommandError
-from scenes.management.commands.pull_scenes import Command, upsert_scene
-from scenes.models import Scene
+from scenes.management.commands.pull_scenes import (
+    WATERMARK_OVERLAP,
+    Command,
+    delete_missing_keys,
+    upsert_legacy_scenes,
+    upsert_scene,
+    upsert_scenes,
+)
+from scenes.legacy_scene_utils.migrate_scene import TRANSLATOR_VERSION
+from scenes.models import LegacyScene, PullWatermark, Scene
 from scenes.factories import SceneFactory
 
 
@@ -68,3 +78,218 @@ def test_handle_runs_legacy_pull_then_reports_skips():
             cmd.handle(database_url="postgres://u:p@localhost:5432/db", chunk_size=500)
     fetch_scenes.assert_called_once()
     fetch_legacy.assert_called_once()
+
+
+def _scene_dict(key, **overrides):
+    built = SceneFactory.build()
+    return {
+        "key": key,
+        "items": built.items,
+        "item_order": built.item_order,
+        "title": built.title,
+        "archived": False,
+        "times_accessed": 0,
+        **overrides,
+    }
+
+
+@pytest.mark.django_db
+def test_upsert_scenes_creates_and_updates_in_place():
+    existing = SceneFactory.create(title="Before")
+    old_modified = existing.modified_date
+    reserved = upsert_scenes(
+        [_scene_dict(existing.key, title="After"), _scene_dict("newkey")]
+    )
+    assert reserved == []
+    existing_after = Scene.objects.get(key=existing.key)
+    assert existing_after.title == "After"
+    assert existing_after.author_id == existing.author_id
+    assert existing_after.created_date == existing.created_date
+    assert existing_after.modified_date > old_modified
+    assert Scene.objects.filter(key="newkey").exists()
+    # Regenerated on the next read.
+    assert not Scene.objects.filter(serialized__isnull=False).exists()
+
+
+@pytest.mark.django_db
+def test_upsert_scenes_leaves_unchanged_rows_alone():
+    scene = SceneFactory.create()
+    source = _scene_dict(
+        scene.key, items=scene.items, item_order=scene.item_order, title=scene.title
+    )
+    upsert_scenes([{**source, "times_accessed": 5}])
+    after = Scene.objects.defer(None).get(key=scene.key)
+    # Only the view count moved: same version, same stored body.
+    assert after.times_accessed == 5
+    assert after.modified_date == scene.modified_date
+    assert bytes(after.serialized) == bytes(scene.serialized)
+
+    with mock.patch(
+        "scenes.management.commands.pull_scenes.invalidate_scenes"
+    ) as invalidate:
+        upsert_scenes([{**source, "times_accessed": 5}])
+    invalidate.assert_called_once_with([])
+
+
+@pytest.mark.django_db
+def test_upsert_scenes_skips_reserved():
+    assert upsert_scenes([_scene_dict("a"), _scene_dict("goodkey")]) == ["a"]
+    assert not Scene.objects.filter(key="a").exists()
+    assert Scene.objects.filter(key="goodkey").exists()
+
+
+@pytest.mark.django_db
+def test_upsert_scenes_raises_on_invalid_items_naming_the_key():
+    bad = _scene_dict("badkey", items=[{"unexpected": "shape"}])
+    with pytest.raises(ValidationError) as excinfo:
+        upsert_scenes([_scene_dict("goodkey"), bad])
+    assert set(excinfo.value.error_dict) == {"badkey"}
+    assert not Scene.objects.filter(key="goodkey").exists()
+
+
+@pytest.mark.django_db
+def test_upsert_legacy_scenes_creates_and_updates():
+    LegacyScene.objects.create(key="old", dehydrated={"v": 1})
+    accessed = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    upsert_legacy_scenes(
+        [
+            {
+                "key": key,
+                "times_accessed": 7,
+                "last_accessed": accessed,
+                "dehydrated": {"v": 2},
+                "migration_note": "",
+            }
+            for key in ("old", "new")
+        ]
+    )
+    for legacy in LegacyScene.objects.all():
+        assert legacy.dehydrated == {"v": 2}
+        assert legacy.times_accessed == 7
+
+
+@pytest.mark.django_db
+def test_fetch_scenes_bulk_streams_source_in_chunks():
+    SceneFactory.create_batch(3, title="Source")
+    cmd = Command(stdout=StringIO())
+    with mock.patch(
+        "scenes.management.commands.pull_scenes.upsert_scenes",
+        return_value=[],
+    ) as upsert:
+        # The local database stands in for the source.
+        assert cmd.fetch_scenes_bulk("default", chunk_size=2) == []
+    assert [len(call.args[0]) for call in upsert.call_args_list] == [2, 1]
+    assert "rows/sec" in cmd.stdout.getvalue()
+
+
+def test_handle_bulk_uses_bulk_fetches():
+    cmd = Command()
+    with (
+        mock.patch.object(cmd, "fetch_scenes_bulk", return_value=[]) as fetch_scenes,
+        mock.patch.object(cmd, "fetch_legacy_scenes_bulk") as fetch_legacy,
+        mock.patch.object(cmd, "fetch_scenes") as per_row,
+    ):
+        cmd.handle(
+            database_url="postgres://u:p@localhost:5432/db", chunk_size=500, bulk=True
+        )
+    fetch_scenes.assert_called_once()
+    fetch_legacy.assert_called_once()
+    per_row.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_fetch_scenes_bulk_since_skips_older_rows():
+    old, new = SceneFactory.create_batch(2)
+    Scene.objects.filter(pk=old.pk).update(
+        modified_date=datetime(2020, 1, 1, tzinfo=timezone.utc)
+    )
+    cmd = Command(stdout=StringIO())
+    with mock.patch(
+        "scenes.management.commands.pull_scenes.upsert_scenes", return_value=[]
+    ) as upsert:
+        cmd.fetch_scenes_bulk(
+            "default", 10, since=datetime(2021, 1, 1, tzinfo=timezone.utc)
+        )
+    assert [d["key"] for d in upsert.call_args.args[0]] == [new.key]
+
+
+@pytest.mark.django_db
+def test_pull_incremental_reads_from_watermark_then_advances_it():
+    scene = SceneFactory.create()
+    LegacyScene.objects.create(dehydrated={})
+    cmd = Command(stdout=StringIO())
+    with (
+        mock.patch.object(cmd, "fetch_scenes_bulk", return_value=[]) as fetch,
+        mock.patch.object(cmd, "fetch_legacy_scenes_bulk") as fetch_legacy,
+    ):
+        cmd.pull_incremental("default", "src", 500)
+        assert fetch.call_args.kwargs["since"] is None  # first run: everything
+        watermark = PullWatermark.objects.get(pk="src")
+        assert watermark.scene_modified_date == scene.modified_date
+        assert watermark.legacy_last_accessed is not None
+
+        cmd.pull_incremental("default", "src", 500)
+    assert fetch.call_args.kwargs["since"] == scene.modified_date - WATERMARK_OVERLAP
+    assert fetch_legacy.call_args.kwargs["since"] == (
+        watermark.legacy_last_accessed - WATERMARK_OVERLAP
+    )
+
+
+@pytest.mark.django_db
+def test_pull_incremental_keeps_watermark_when_a_pull_fails():
+    SceneFactory.create()
+    cmd = Command(stdout=StringIO())
+    with (
+        mock.patch.object(cmd, "fetch_scenes_bulk", side_effect=RuntimeError),
+        pytest.raises(RuntimeError),
+    ):
+        cmd.pull_incremental("default", "src", 500)
+    assert not PullWatermark.objects.filter(pk="src").exists()
+
+
+@pytest.mark.django_db
+def test_delete_missing_keys_deletes_only_absent_keys():
+    kept, gone = SceneFactory.create_batch(2)
+    deleted = delete_missing_keys(Scene, iter([kept.key, "elsewhere"]), chunk_size=1)
+    assert deleted == [gone.key]
+    assert list(Scene.objects.values_list("key", flat=True)) == [kept.key]
+
+
+@pytest.mark.django_db
+def test_delete_missing_purges_deleted_scenes():
+    SceneFactory.create()
+    cmd = Command(stdout=StringIO())
+    with (
+        mock.patch(
+            "scenes.management.commands.pull_scenes.delete_missing_keys",
+            side_effect=[[], ["gone"]],
+        ),
+        mock.patch("scenes.management.commands.pull_scenes.purge") as purge,
+    ):
+        cmd.delete_missing("default", 500)
+    purge.assert_called_once_with(["gone"])
+
+
+@pytest.mark.django_db
+def test_delete_missing_keys_keeps_scenes_migrated_from_legacy_scenes():
+    """A pulled legacy key, migrated here but not yet in the source: its Scene
+    is not in the source's Scene table, but must survive the tombstone."""
+    legacy = LegacyScene.objects.create(
+        key="pulledLegacy", dehydrated={}, translator_version=TRANSLATOR_VERSION
+    )
+    migrated = SceneFactory.create(key=legacy.key)
+    gone = SceneFactory.create()
+    deleted = delete_missing_keys(
+        Scene, iter([]), chunk_size=500, keep_keys_of=LegacyScene
+    )
+    assert deleted == [gone.key]
+    assert Scene.objects.filter(key=migrated.key).exists()
+
+
+@pytest.mark.django_db
+def test_delete_missing_keys_twice_in_one_transaction():
+    # pytest-django's db fixture wraps the test in a transaction.
+    kept = SceneFactory.create()
+    legacy = LegacyScene.objects.create(key="legacyKey", dehydrated={})
+    assert delete_missing_keys(LegacyScene, iter([legacy.key]), chunk_size=1) == []
+    assert delete_missing_keys(Scene, iter([kept.key]), chunk_size=1) == []
@@ -8,11 +8,17 @@ from scenes.schemas.scenes import (
     LegacySceneInSchema,
     LegacySceneOutSchema,
     MiniSceneSchema,
+    SceneBatchResultSchema,
+    SceneBatchSchema,
+    SceneBulkResultSchema,
+    SceneBulkSchema,
     SceneCreateSchema,
     SceneFilterSchema,
+    SceneItemsPatchSchema,
     SceneMetaSchema,
     ScenePatchSchema,
     SceneSchema,
+    SceneSearchSchema,
 )
 
 __all__ = [
@@ -23,9 +29,15 @@ __all__ = [
     "LegacySceneInSchema",
     "LegacySceneOutSchema",
     "MiniSceneSchema",
+    "SceneBatchResultSchema",
+    "SceneBatchSchema",
+    "SceneBulkResultSchema",
+    "SceneBulkSchema",
     "SceneCreateSchema",
     "SceneFilterSchema",
+    "SceneItemsPatchSchema",
     "SceneMetaSchema",
     "ScenePatchSchema",
     "SceneSchema",
+    "SceneSearchSchema",
 ]
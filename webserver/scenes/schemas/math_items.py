@@ -496,6 +496,9 @@ class MathItem(RootModel[_MathItemUnion]):
 # inferred type is correct.
 MATH_ITEM_LIST_ADAPTER = TypeAdapter(list[_MathItemUnion])
 
+# Many scenes' item lists at once, keyed by scene key (bulk ingestion).
+MATH_ITEM_LISTS_BY_KEY_ADAPTER = TypeAdapter(dict[str, list[_MathItemUnion]])
+
 
 # Public alias of the raw discriminated union, for use as an annotation by code
 # outside this module (e.g. the legacy translator's `translate_item` return
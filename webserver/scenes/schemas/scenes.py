@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Annotated, Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 from ninja import Field, FilterLookup, FilterSchema, Schema
-from pydantic import ConfigDict
+from pydantic import ConfigDict, model_validator
 
 from scenes.schemas.math_items import MathItem
 
@@ -73,11 +73,82 @@ class ScenePatchSchema(Schema):
     archived: Optional[bool] = None
 
 
+class SceneItemsPatchSchema(Schema):
+    """An item-level edit: the items to add or replace (matched by ``id``),
+    the ids to remove, and the ``itemOrder`` entries to set. Entries not
+    named are left as stored, and the entry of a removed id is dropped."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    upsert: List[MathItem] = Field(default_factory=list)
+    remove: List[str] = Field(default_factory=list)
+    item_order: Dict[str, List[str]] = Field(default_factory=dict, alias="itemOrder")
+
+    @model_validator(mode="after")
+    def _ids_named_once(self):
+        ids = [item.root.id for item in self.upsert] + self.remove
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each item id may appear only once in upsert and remove.")
+        return self
+
+
+# Enough for "select all" on a large library, in one request.
+BULK_MAX_KEYS = 1000
+
+
+class SceneBulkSchema(Schema):
+    """One action applied to many of your scenes. ``title`` is required by,
+    and only used for, ``retitle``."""
+
+    keys: List[str] = Field(min_length=1, max_length=BULK_MAX_KEYS)
+    action: Literal["archive", "unarchive", "delete", "retitle"]
+    title: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _title_iff_retitle(self):
+        if (self.action == "retitle") != (self.title is not None):
+            raise ValueError("title is required for retitle, and only for retitle.")
+        return self
+
+
+class SceneBulkResultSchema(Schema):
+    """Each requested key's outcome: ``ok``, ``forbidden`` (not your scene) or
+    ``not_found``."""
+
+    results: Dict[str, Literal["ok", "forbidden", "not_found"]]
+
+
+# One embed page's worth; each full scene can be hundreds of KB.
+BATCH_MAX_KEYS = 100
+
+
+class SceneBatchSchema(Schema):
+    """Scenes to fetch by key. ``fields`` is ``mini`` for the fields the list
+    endpoints return, or ``full`` for what ``GET /{key}/`` returns."""
+
+    keys: List[str] = Field(min_length=1, max_length=BATCH_MAX_KEYS)
+    fields: Literal["mini", "full"] = "mini"
+
+
+class SceneBatchResultSchema(Schema):
+    """The requested scenes, by key, in request order. Keys with no scene
+    are absent."""
+
+    scenes: Dict[str, Union[SceneSchema, MiniSceneSchema]]
+
+
 class SceneFilterSchema(FilterSchema):
-    title: Annotated[Optional[str], FilterLookup("title__icontains")] = None
+    # trigram_icontains, not icontains: same match, but uses the trigram
+    # index (scenes/lookups.py).
+    title: Annotated[Optional[str], FilterLookup("title__trigram_icontains")] = None
     archived: Optional[bool] = None  # exact; ignore_none default skips when absent
 
 
+class SceneSearchSchema(Schema):
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(20, ge=1, le=50)
+
+
 class LegacySceneInSchema(Schema):
     dehydrated: Any
 
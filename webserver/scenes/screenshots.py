@@ -1,21 +1,27 @@
-"""Backend-gated screenshot rendering (ADR-0002).
+"""Backend-gated screenshot rendering (ADR-0002, ADR-0003).
 
 The backend is the sole gatekeeper of the legitimate render path: a save
-reserves a slot from per-period ledgers (``reserve_render_slot``) before
-nudging the render Worker. Reservation is atomic and both-caps: renders never
-exceed reservations, reservations never exceed the caps.
+queues its scene key in the render outbox (``schedule_render``), and
+``drain_render_outbox`` reserves a slot from per-period ledgers
+(``reserve_render_slot``) before nudging the render Worker. Reservation is
+atomic and both-caps: renders never exceed reservations, reservations never
+exceed the caps.
 """
 
 import json
 import logging
 import urllib.request
+from dataclasses import dataclass
+from datetime import timedelta
 
 from django.conf import settings
 from django.db import connection, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 
+from main import metrics
 from main.constants import BACKEND_USER_AGENT
-from scenes.models import RenderDay, RenderMonth
+from scenes.models import RenderDay, RenderMonth, RenderRequest, Scene
 
 logger = logging.getLogger(__name__)
 
@@ -48,21 +54,26 @@ def _bump(sql: str, period, cap: int) -> bool:
 def reserve_render_slot() -> bool:
     """Grant iff both the current UTC day and month are under cap; bump both,
     all-or-nothing. A missing period row is created at 1 (implicit rollover)."""
+    result = _reserve()
+    metrics.inc("math3d_render_slots_total", result=result)
+    return result == "granted"
+
+
+def _reserve() -> str:
     today = timezone.now().date()  # UTC (USE_TZ, TIME_ZONE=UTC)
     month = today.replace(day=1)
     with transaction.atomic():
         if not _bump(_MONTH_SQL, month, settings.RENDER_MONTHLY_CAP):
-            return False  # over monthly cap (nothing changed)
+            return "denied_monthly"  # over monthly cap (nothing changed)
         if not _bump(_DAY_SQL, today, settings.RENDER_DAILY_CAP):
             transaction.set_rollback(True)  # undo the monthly bump
-            return False
-        return True
+            return "denied_daily"
+        return "granted"
 
 
 def nudge_render(key: str) -> None:
-    """Best-effort fire at the Worker's POST /render (secret-gated → 202).
-    ~2s timeout, no retry. Swallows transport errors — the render is a
-    best-effort side effect of the save."""
+    """Fire at the Worker's POST /render (secret-gated → 202), ~2s timeout.
+    Raises on a transport error or non-2xx; the outbox drain retries."""
     req = urllib.request.Request(
         f"{settings.SCREENSHOTS_ORIGIN}/render",
         data=json.dumps({"key": key}).encode(),
@@ -73,35 +84,159 @@ def nudge_render(key: str) -> None:
         },
         method="POST",
     )
-    try:
-        urllib.request.urlopen(req, timeout=2.0).close()
-    except Exception:
-        # Log-attribution only (a distinct line from a reserve failure), NOT the
-        # isolation guard — maybe_render's outer try is what protects the save.
-        logger.warning("nudge_render failed for key=%s", key, exc_info=True)
+    urllib.request.urlopen(req, timeout=2.0).close()
+
+
+def render_enabled() -> bool:
+    # Both must be set, or the feature is dark: an origin without a secret
+    # would reserve a slot then 403 at the Worker, burning cap for nothing.
+    return bool(settings.SCREENSHOTS_ORIGIN and settings.RENDER_SECRET)
+
+
+# Raw SQL: the debounce needs GREATEST() in the conflict update, which
+# bulk_create(update_conflicts=True) can't express (it copies EXCLUDED values
+# verbatim). xmax = 0 only on a freshly inserted row: how a request is told
+# apart from one coalesced into an already-queued row.
+_OUTBOX = RenderRequest._meta.db_table
+_SCHEDULE_SQL = f"""
+    INSERT INTO {_OUTBOX} AS o
+        (key, requested_at, not_before, attempts, reserved, last_error)
+    VALUES (%(key)s, %(now)s, %(not_before)s, 0, false, '')
+    ON CONFLICT (key) DO UPDATE SET
+        requested_at = EXCLUDED.requested_at,
+        attempts = 0,
+        not_before = GREATEST(o.not_before, EXCLUDED.not_before)
+    RETURNING xmax = 0
+"""
 
 
-def maybe_render(key: str) -> None:
-    """Reserve a slot and nudge the render Worker. Fully isolated — runs inline
-    via on_commit in autocommit views (scenes/api.py), so it must never
-    propagate: a failure here must still let the save return 2xx."""
+def schedule_render(key: str, delay: float = 0) -> None:
+    """Queue a render of ``key`` in the render outbox (ADR-0003), due in
+    ``delay`` seconds.
+
+    The row is written in the caller's transaction, so it commits with the
+    save (or not at all), and costs the save one INSERT rather than a Worker
+    round trip. A key already queued is refreshed, not duplicated: repeat
+    saves coalesce into one render. Each one also pushes the row's due time
+    out to its own ``delay``, so with a delay (the edit debounce,
+    RENDER_DEBOUNCE_SECONDS) only a burst's last save is rendered, once the
+    scene has been quiet that long. A failing row's backoff is never
+    shortened. A save while a drainer holds the row is due after its own
+    delay once that render ends, not after the claim's lease. Never raises;
+    the savepoint keeps a failed insert from breaking an enclosing
+    transaction.
+    """
+    if not render_enabled():
+        return
+    now = timezone.now()
     try:
-        # Both must be set, or the feature is dark: an origin without a secret
-        # would reserve a slot then 403 at the Worker, burning cap for nothing.
-        if not (settings.SCREENSHOTS_ORIGIN and settings.RENDER_SECRET):
-            return
-        if not reserve_render_slot():  # over cap → decline (coverage, not spend)
-            return
-        nudge_render(key)
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(
+                _SCHEDULE_SQL,
+                {"key": key, "now": now, "not_before": now + timedelta(seconds=delay)},
+            )
+            (inserted,) = cur.fetchone()
+        metrics.inc(
+            "math3d_render_requests_total",
+            result="queued" if inserted else "coalesced",
+        )
     except Exception:
-        logger.warning("maybe_render failed for key=%s", key, exc_info=True)
-
-
-def schedule_render(key: str) -> None:
-    """Fire maybe_render after the surrounding DB work commits.
-
-    create/update are autocommit views, so this on_commit hook runs inline
-    before the response. Wrapping them in a transaction would defer the nudge to
-    request-commit and demote reserve_render_slot's atomic() to a savepoint.
-    """
-    transaction.on_commit(lambda: maybe_render(key))
+        logger.warning("schedule_render failed for key=%s", key, exc_info=True)
+
+
+# How long a drainer owns the rows it claims. Must outlast a batch of nudges
+# (2s timeout each); a drainer that dies mid-batch releases them when it ends.
+_CLAIM_LEASE = timedelta(minutes=5)
+
+
+@dataclass
+class DrainResult:
+    rendered: int = 0
+    # Failed nudges, queued again with backoff.
+    retried: int = 0
+    # Given up on after RENDER_OUTBOX_MAX_ATTEMPTS.
+    dropped: int = 0
+    # Over cap, or the scene was deleted while queued.
+    declined: int = 0
+
+    @property
+    def claimed(self) -> int:
+        return self.rendered + self.retried + self.dropped + self.declined
+
+
+def drain_render_outbox(batch_size: int = 50) -> DrainResult:
+    """Render up to ``batch_size`` due outbox rows: reserve a slot for each
+    (once per request, however many attempts its nudge takes), nudge the
+    Worker, and delete the rows that are done. Safe to run concurrently:
+    rows are claimed with SKIP LOCKED and leased, not held locked, while the
+    nudges run."""
+    result = DrainResult()
+    if not render_enabled():
+        return result
+    now = timezone.now()
+    with transaction.atomic():
+        claimed = list(
+            RenderRequest.objects.select_for_update(skip_locked=True)
+            .filter(not_before__lte=now)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+            .order_by("not_before")[:batch_size]
+        )
+        RenderRequest.objects.filter(pk__in=[r.pk for r in claimed]).update(
+            claimed_until=now + _CLAIM_LEASE, attempts=F("attempts") + 1
+        )
+    if not claimed:
+        return result
+
+    live = set(
+        Scene.objects.filter(key__in=[r.key for r in claimed]).values_list(
+            "key", flat=True
+        )
+    )
+    done = []
+    for request in claimed:
+        request.attempts += 1
+        if request.key not in live:
+            result.declined += 1
+            done.append(request)
+            continue
+        if not request.reserved:
+            if not reserve_render_slot():  # over cap → decline (coverage, not spend)
+                result.declined += 1
+                done.append(request)
+                continue
+            RenderRequest.objects.filter(pk=request.pk).update(reserved=True)
+        try:
+            nudge_render(request.key)
+        except Exception as e:
+            logger.warning("nudge_render failed for key=%s", request.key, exc_info=True)
+            metrics.inc("math3d_render_nudge_failures_total")
+            if request.attempts >= settings.RENDER_OUTBOX_MAX_ATTEMPTS:
+                result.dropped += 1
+                done.append(request)
+            else:
+                result.retried += 1
+                backoff = settings.RENDER_RETRY_BACKOFF * 2 ** (request.attempts - 1)
+                RenderRequest.objects.filter(pk=request.pk).update(
+                    not_before=now + timedelta(seconds=backoff),
+                    claimed_until=None,
+                    last_error=repr(e),
+                )
+            continue
+        result.rendered += 1
+        done.append(request)
+
+    if done:
+        # Keep rows re-requested since the claim (their requested_at moved
+        # on): that save's content still needs a render, and a slot of its own.
+        completed = Q()
+        for request in done:
+            completed |= Q(pk=request.pk, requested_at=request.requested_at)
+        RenderRequest.objects.filter(completed).delete()
+        RenderRequest.objects.filter(pk__in=[r.pk for r in done]).update(
+            reserved=False, claimed_until=None
+        )
+
+    for outcome in ("rendered", "retried", "dropped", "declined"):
+        if count := getattr(result, outcome):
+            metrics.inc("math3d_render_outbox_total", count, result=outcome)
+    return result
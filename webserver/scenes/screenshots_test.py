@@ -1,14 +1,17 @@
 import datetime
+import io
 import threading
 from unittest import mock
 
 import pytest
+from django.core.management import call_command
 from django.db import connection
 from django.utils import timezone
 
 from main.constants import BACKEND_USER_AGENT
 from scenes import screenshots
-from scenes.models import RenderDay, RenderMonth
+from scenes.factories import SceneFactory
+from scenes.models import RenderDay, RenderMonth, RenderRequest
 from scenes.screenshots import reserve_render_slot
 
 
@@ -102,73 +105,232 @@ def test_no_over_grant_under_concurrency(settings):
     assert RenderDay.objects.get(pk=today).count == 55
 
 
-# These four mock reserve_render_slot, so they never touch the DB — no
-# django_db marker (it would add pointless per-test DB setup).
-def test_maybe_render_dark_when_origin_unset(settings):
+def test_nudge_render_sends_named_user_agent(settings):
+    # A named UA avoids Cloudflare's Browser Integrity Check, which 1010-blocks
+    # the default `Python-urllib` UA at the edge before the Worker runs.
+    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
+    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
+    with mock.patch("scenes.screenshots.urllib.request.urlopen") as urlopen:
+        screenshots.nudge_render("abc")
+    req = urlopen.call_args.args[0]
+    assert req.get_header("User-agent") == BACKEND_USER_AGENT
+
+
+@pytest.mark.django_db
+def test_reserve_counts_each_outcome_for_metrics(settings):
+    settings.RENDER_DAILY_CAP = 1
+    with mock.patch("scenes.screenshots.metrics.inc") as inc:
+        reserve_render_slot()
+        reserve_render_slot()
+    assert [call.kwargs["result"] for call in inc.call_args_list] == [
+        "granted",
+        "denied_daily",
+    ]
+
+
+# The render outbox (ADR-0003).
+
+
+@pytest.fixture
+def render_on(settings):
+    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
+    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
+
+
+def test_schedule_render_dark_when_origin_unset(settings):
+    # No django_db marker: the dark path must not touch the outbox.
     settings.SCREENSHOTS_ORIGIN = ""
-    with mock.patch.object(screenshots, "reserve_render_slot") as reserve:
-        screenshots.maybe_render("abc")
-    reserve.assert_not_called()
+    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
+    screenshots.schedule_render("abc")
 
 
-def test_maybe_render_dark_when_secret_unset(settings):
-    # Origin set but secret empty is still dark: otherwise a save would reserve a
-    # slot and then 403 at the Worker, burning cap with nothing to show for it.
+def test_schedule_render_dark_when_secret_unset(settings):
+    # Origin set but secret empty is still dark: otherwise the drain would
+    # reserve a slot and then 403 at the Worker, burning cap for nothing.
     settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
     settings.RENDER_SECRET = ""
+    screenshots.schedule_render("abc")
+
+
+@pytest.mark.django_db
+def test_schedule_render_coalesces_repeat_saves(render_on):
+    with mock.patch("scenes.screenshots.metrics.inc") as inc:
+        screenshots.schedule_render("abc")
+        first = RenderRequest.objects.get(key="abc")
+        RenderRequest.objects.filter(key="abc").update(attempts=3)
+        screenshots.schedule_render("abc")
+    again = RenderRequest.objects.get(key="abc")
+    assert again.requested_at > first.requested_at
+    assert again.attempts == 0
+    assert [call.kwargs["result"] for call in inc.call_args_list] == [
+        "queued",
+        "coalesced",
+    ]
+
+
+@pytest.mark.django_db
+def test_schedule_render_debounces_a_burst(render_on):
+    """Each save pushes the render out to its own quiet period, so only the
+    last save of a burst is rendered."""
+    screenshots.schedule_render("abc", delay=60)
+    first = RenderRequest.objects.get(key="abc").not_before
+    screenshots.schedule_render("abc", delay=60)
+    second = RenderRequest.objects.get(key="abc").not_before
+    assert second > first
+    assert second - timezone.now() > datetime.timedelta(seconds=55)
+
+
+@pytest.mark.django_db
+def test_schedule_render_never_shortens_backoff(render_on):
+    later = timezone.now() + datetime.timedelta(minutes=5)
+    RenderRequest.objects.create(key="abc", not_before=later)
+    screenshots.schedule_render("abc")
+    assert RenderRequest.objects.get(key="abc").not_before == later
+
+
+@pytest.mark.django_db
+def test_schedule_render_swallows_errors(render_on):
+    with mock.patch.object(screenshots, "_SCHEDULE_SQL", "SELECT broken("):
+        screenshots.schedule_render("abc")  # must not raise
+    # The savepoint kept the failure from poisoning the transaction.
+    assert not RenderRequest.objects.exists()
+
+
+def _queue(**kwargs) -> RenderRequest:
+    scene = SceneFactory.create()
+    return RenderRequest.objects.create(key=scene.key, **kwargs)
+
+
+@pytest.mark.django_db
+def test_drain_is_dark_when_unconfigured(settings):
+    settings.SCREENSHOTS_ORIGIN = ""
+    _queue()
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        assert screenshots.drain_render_outbox().claimed == 0
+    nudge.assert_not_called()
+    assert RenderRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_reserves_nudges_and_deletes(render_on):
+    row = _queue()
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        result = screenshots.drain_render_outbox()
+    assert result.rendered == 1
+    nudge.assert_called_once_with(row.key)
+    assert RenderDay.objects.get(pk=_today()).count == 1
+    assert not RenderRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_skips_rows_not_yet_due(render_on):
+    _queue(not_before=timezone.now() + datetime.timedelta(minutes=1))
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        assert screenshots.drain_render_outbox().claimed == 0
+    nudge.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_drain_declines_over_cap_without_nudging(render_on, settings):
+    settings.RENDER_DAILY_CAP = 1
+    RenderDay.objects.create(day=_today(), count=1)
+    _queue()
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        assert screenshots.drain_render_outbox().declined == 1
+    nudge.assert_not_called()
+    assert not RenderRequest.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_declines_deleted_scene_without_reserving(render_on):
+    RenderRequest.objects.create(key="gone")
     with mock.patch.object(screenshots, "reserve_render_slot") as reserve:
-        screenshots.maybe_render("abc")
+        assert screenshots.drain_render_outbox().declined == 1
     reserve.assert_not_called()
 
 
-def test_maybe_render_declines_over_cap_without_nudging(settings):
-    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
-    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
+@pytest.mark.django_db
+def test_failed_nudge_retries_with_backoff_on_the_same_slot(render_on, settings):
+    settings.RENDER_RETRY_BACKOFF = 30
+    row = _queue()
     with (
-        mock.patch.object(screenshots, "reserve_render_slot", return_value=False),
-        mock.patch.object(screenshots, "nudge_render") as nudge,
+        mock.patch.object(screenshots, "nudge_render", side_effect=OSError("down")),
+        mock.patch("scenes.screenshots.metrics.inc") as inc,
     ):
-        screenshots.maybe_render("abc")
-    nudge.assert_not_called()
+        assert screenshots.drain_render_outbox().retried == 1
+    inc.assert_any_call("math3d_render_nudge_failures_total")
+    row.refresh_from_db()
+    assert (row.attempts, row.reserved) == (1, True)
+    assert "down" in row.last_error
+    wait = row.not_before - timezone.now()
+    assert datetime.timedelta(seconds=25) < wait <= datetime.timedelta(seconds=30)
 
+    RenderRequest.objects.filter(pk=row.pk).update(not_before=timezone.now())
+    with mock.patch.object(screenshots, "nudge_render"):
+        assert screenshots.drain_render_outbox().rendered == 1
+    assert RenderDay.objects.get(pk=_today()).count == 1  # one slot, two nudges
 
-def test_maybe_render_nudges_when_granted(settings):
-    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
-    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
-    with (
-        mock.patch.object(screenshots, "reserve_render_slot", return_value=True),
-        mock.patch.object(screenshots, "nudge_render") as nudge,
-    ):
-        screenshots.maybe_render("abc")
-    nudge.assert_called_once_with("abc")
 
+@pytest.mark.django_db
+def test_drain_drops_after_max_attempts(render_on, settings):
+    settings.RENDER_OUTBOX_MAX_ATTEMPTS = 2
+    _queue(attempts=1, reserved=True)
+    with mock.patch.object(screenshots, "nudge_render", side_effect=OSError):
+        assert screenshots.drain_render_outbox().dropped == 1
+    assert not RenderRequest.objects.exists()
 
-def test_maybe_render_swallows_reserve_exception(settings):
-    # The isolation invariant: a failure inside maybe_render must not propagate
-    # (it runs inline in the save's request cycle — an escape would 500 the save).
-    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
-    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
-    with mock.patch.object(
-        screenshots, "reserve_render_slot", side_effect=RuntimeError("db down")
-    ):
-        screenshots.maybe_render("abc")  # must not raise
 
+@pytest.mark.django_db
+def test_save_during_render_queues_another(render_on):
+    row = _queue()
 
-def test_nudge_render_sends_named_user_agent(settings):
-    # A named UA avoids Cloudflare's Browser Integrity Check, which 1010-blocks
-    # the default `Python-urllib` UA at the edge before the Worker runs.
-    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
-    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
-    with mock.patch("scenes.screenshots.urllib.request.urlopen") as urlopen:
-        screenshots.nudge_render("abc")
-    req = urlopen.call_args.args[0]
-    assert req.get_header("User-agent") == BACKEND_USER_AGENT
+    def resave(key):
+        screenshots.schedule_render(key)
 
+    with mock.patch.object(screenshots, "nudge_render", side_effect=resave):
+        screenshots.drain_render_outbox()
+    row = RenderRequest.objects.get(key=row.key)
+    assert not row.reserved  # the next render needs a slot of its own
 
-def test_nudge_render_swallows_transport_error(settings):
-    settings.SCREENSHOTS_ORIGIN = "https://s.math3d.org"
-    settings.RENDER_SECRET = "shh"  # pragma: allowlist secret
-    with mock.patch(
-        "scenes.screenshots.urllib.request.urlopen", side_effect=OSError("refused")
-    ):
-        screenshots.nudge_render("abc")  # must not raise
+
+@pytest.mark.django_db
+def test_save_during_claim_waits_its_debounce_not_the_lease(render_on):
+    row = _queue()
+
+    def resave(key):
+        screenshots.schedule_render(key, delay=60)
+
+    with mock.patch.object(screenshots, "nudge_render", side_effect=resave):
+        screenshots.drain_render_outbox()
+    row = RenderRequest.objects.get(key=row.key)
+    assert row.claimed_until is None
+    wait = row.not_before - timezone.now()
+    assert datetime.timedelta(seconds=55) < wait <= datetime.timedelta(seconds=60)
+
+
+@pytest.mark.django_db
+def test_drain_skips_rows_claimed_by_another_drainer(render_on):
+    _queue(claimed_until=timezone.now() + datetime.timedelta(minutes=1))
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        assert screenshots.drain_render_outbox().claimed == 0
+    nudge.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_drain_takes_batches_in_due_order(render_on):
+    now = timezone.now()
+    late = _queue(not_before=now - datetime.timedelta(seconds=1))
+    early = _queue(not_before=now - datetime.timedelta(seconds=2))
+    with mock.patch.object(screenshots, "nudge_render") as nudge:
+        screenshots.drain_render_outbox(batch_size=1)
+    nudge.assert_called_once_with(early.key)
+    assert RenderRequest.objects.filter(key=late.key).exists()
+
+
+@pytest.mark.django_db
+def test_drain_command_once(render_on):
+    _queue()
+    out = io.StringIO()
+    with mock.patch.object(screenshots, "nudge_render"):
+        call_command("drain_render_outbox", stdout=out)
+    assert out.getvalue().strip() == "rendered=1 retried=0 dropped=0 declined=0"
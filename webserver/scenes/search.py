@@ -0,0 +1,57 @@
+"""Ranked scene search (GET /v1/scenes/search/).
+
+A scene matches if either index finds it:
+
+- full text: ``Scene.search_vector`` (title weighted A, item descriptions
+  weighted B) ``@@`` a ``websearch_to_tsquery`` of the query, served by
+  ``scene_search_vector_index``. Handles stemming, phrases and ``-excluded``
+  words across the whole scene.
+- fuzzy title: ``title %> q``, served by ``title_gin_trgm_index``. This is
+  pg_trgm *word* similarity: ``q`` is compared with the best-matching run of
+  words in the title, above ``pg_trgm.word_similarity_threshold``. Plain
+  similarity would compare against the whole title, so a one-word typo would
+  never reach a long title. It catches typos and partial words that full text
+  misses.
+
+Matches are ordered by ``ts_rank`` plus word similarity. Both are roughly
+0..1, so a strong fuzzy title hit and a full-text hit compete fairly. Ranking
+needs every match scored, so a query matching most of the table pays for
+that. The limit caps what is returned, not what is ranked.
+
+The query runs with ``random_page_cost`` lowered to the usual SSD value. At
+the default of 4, the planner prices each GIN scan at ~500 random page reads.
+It also prices ``%>`` like a trivial comparison, although it costs microseconds
+per row. On a 100k-scene table that makes it prefer a seq scan evaluating
+``%>`` on every row: 250-400 ms against ~30 ms for the two bitmap index scans
+(search_test.py pins the latency budget). The setting is ``SET LOCAL``: it
+ends with the search's transaction.
+"""
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connection, transaction
+from django.db.models import F, Q, QuerySet
+
+_RANDOM_PAGE_COST = 1.1
+
+
+def _ranked(queryset: QuerySet, q: str) -> QuerySet:
+    query = SearchQuery(q, config="english", search_type="websearch")
+    return (
+        queryset.filter(Q(search_vector=query) | Q(title__trigram_word_similar=q))
+        .annotate(
+            rank=SearchRank(F("search_vector"), query)
+            + TrigramWordSimilarity(q, "title")
+        )
+        .order_by("-rank", "id")
+    )
+
+
+def find_scenes(queryset: QuerySet, q: str, limit: int) -> list:
+    """The top ``limit`` of ``queryset``'s scenes matching ``q``, best first."""
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f"SET LOCAL random_page_cost = {_RANDOM_PAGE_COST}")
+        return list(_ranked(queryset, q)[:limit])
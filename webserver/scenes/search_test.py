@@ -0,0 +1,176 @@
+import os
+import statistics
+import time
+
+import pytest
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from scenes.factories import SceneFactory
+from scenes.models import Scene
+from scenes.search import _RANDOM_PAGE_COST
+
+SEARCH_URL = "/v1/scenes/search/"
+
+
+def _folder(description):
+    return [
+        {
+            "id": "f",
+            "type": "FOLDER",
+            "properties": {"description": description, "isCollapsed": "false"},
+        }
+    ]
+
+
+def _select_sql(q):
+    """The SQL of the search query the endpoint issues for ``q``."""
+    with CaptureQueriesContext(connection) as ctx:
+        _search(q)
+    (sql,) = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+    return sql
+
+
+def _search(q, **params):
+    response = Client().get(SEARCH_URL, {"q": q, **params})
+    assert response.status_code == 200
+    return [item["key"] for item in response.json()]
+
+
+@pytest.mark.django_db
+def test_matches_title_words_with_stemming():
+    hit = SceneFactory.create(title="Rotating tori", archived=False)
+    SceneFactory.create(title="Unrelated", archived=False)
+    assert _search("rotate") == [hit.key]
+
+
+@pytest.mark.django_db
+def test_matches_item_descriptions():
+    hit = SceneFactory.create(
+        title="Homework 3", items=_folder("Saddle surface"), archived=False
+    )
+    SceneFactory.create(title="Homework 4", archived=False)
+    assert _search("saddle") == [hit.key]
+
+
+@pytest.mark.django_db
+def test_fuzzy_title_match_survives_a_typo():
+    hit = SceneFactory.create(title="Paraboloid", archived=False)
+    assert _search("paraboloyd") == [hit.key]
+
+
+@pytest.mark.django_db
+def test_title_hits_outrank_description_hits():
+    in_description = SceneFactory.create(
+        title="Week 2", items=_folder("Helix"), archived=False
+    )
+    in_title = SceneFactory.create(title="Helix", archived=False)
+    assert _search("helix") == [in_title.key, in_description.key]
+
+
+@pytest.mark.django_db
+def test_excludes_archived_and_respects_limit():
+    SceneFactory.create(title="Torus", archived=True)
+    live = SceneFactory.create_batch(3, title="Torus", archived=False)
+    assert _search("torus") == [s.key for s in live]
+    assert len(_search("torus", limit=2)) == 2
+
+
+@pytest.mark.django_db
+def test_vector_tracks_writes_that_bypass_save():
+    scene = SceneFactory.create(title="Before", archived=False)
+    Scene.objects.filter(pk=scene.pk).update(title="Hyperboloid")
+    assert _search("hyperboloid") == [scene.key]
+
+
+@pytest.mark.django_db
+def test_only_list_columns_are_loaded():
+    SceneFactory.create(title="Cone", archived=False)
+    assert _select_sql("cone").count(f'"{Scene._meta.db_table}"."items"') == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": "x", "limit": 51}])
+def test_invalid_params_are_400(params):
+    assert Client().get(SEARCH_URL, params).status_code == 400
+
+
+_WORDS = (
+    "plane sphere torus helix cone cylinder saddle paraboloid curve surface "
+    "vector field gradient divergence curl flux line integral tangent normal "
+    "parametric implicit explicit polar spherical level set contour slice"
+).split()
+
+# 100k scenes in one statement. Each title and description pairs a topic word
+# from _WORDS (so common words match thousands of rows) with a per-scene
+# pseudo-word (so, like real titles, the corpus isn't 29 words recombined).
+_SEED_SQL = f"""
+    INSERT INTO {Scene._meta.db_table} (
+        key, title, items, item_order, archived, times_accessed, is_legacy,
+        serialized_version, created_date, modified_date
+    )
+    SELECT
+        'seed-' || i,
+        w[1 + mod(i, %(n)s)] || ' ' || substr(md5(i::text), 1, 6),
+        jsonb_build_array(jsonb_build_object(
+            'id', 'f', 'type', 'FOLDER', 'properties', jsonb_build_object(
+                'description',
+                w[1 + mod(i / 7, %(n)s)] || ' ' || substr(md5(i::text), 7, 6)
+            )
+        )),
+        '{{}}'::jsonb, false, 0, false, '', now(), now()
+    FROM generate_series(1, 100000) AS i, (SELECT %(words)s::text[] AS w) AS words
+"""
+
+# Per-query budget for the median of a few warm runs, end to end through the
+# view. Index-served queries take ~30 ms here and a seq scan 250-400 ms; the
+# EXPLAIN assertions below catch the scan even on hardware fast enough to hide it.
+_LATENCY_BUDGET_MS = 150
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("q", ["saddle surface", "helx"])
+def test_search_can_be_served_by_the_indexes(q):
+    """Plan shape on a tiny table, with seq scans off as in query_plan_test:
+    both the full-text and the fuzzy title arm must be able to use an index."""
+    SceneFactory.create_batch(3, archived=False)
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute("SET LOCAL enable_seqscan = off")
+        cur.execute(f"EXPLAIN {_select_sql(q)}")
+        plan = "\n".join(row[0] for row in cur.fetchall())
+    assert "scene_search_vector_index" in plan, plan
+    assert "title_gin_trgm_index" in plan, plan
+
+
+# Seeds 100k rows and times queries: minutes of setup and wall-clock
+# assertions that shared CI can't hold to. Opt in with MATH3D_SLOW_TESTS=1.
+@pytest.mark.skipif(
+    not os.environ.get("MATH3D_SLOW_TESTS"), reason="set MATH3D_SLOW_TESTS=1"
+)
+@pytest.mark.django_db
+def test_latency_budget_on_100k_scenes():
+    with connection.cursor() as cur:
+        cur.execute(_SEED_SQL, {"words": _WORDS, "n": len(_WORDS)})
+        cur.execute(f"ANALYZE {Scene._meta.db_table}")
+    rare = SceneFactory.create(title="Möbius strip", archived=False)
+
+    for q in ["mobius strip", "saddle surface", "helx"]:
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            keys = _search(q)
+            timings.append((time.perf_counter() - start) * 1000)
+        assert keys, q
+        assert statistics.median(timings) < _LATENCY_BUDGET_MS, (q, timings)
+    assert _search("strip")[0] == rare.key
+
+    # Served by the indexes, not a scan of the table.
+    for q in ["saddle surface", "helx"]:
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(f"SET LOCAL random_page_cost = {_RANDOM_PAGE_COST}")
+            cur.execute(f"EXPLAIN {_select_sql(q)}")
+            plan = "\n".join(row[0] for row in cur.fetchall())
+        assert "scene_search_vector_index" in plan, plan
+        assert "title_gin_trgm_index" in plan, plan
+        assert "Seq Scan" not in plan, plan
@@ -0,0 +1,55 @@
+"""Pre-serialized scene bodies for GET /v1/scenes/{key}/.
+
+Pushing a ``Scene`` through ``SceneSchema`` re-validates every item against
+the ``MathItem`` union, so instead ``Scene.save()`` renders the response body
+once, with exactly the bytes django-ninja would produce, and stores it in
+``Scene.serialized``. GET then serves that column verbatim.
+
+Each stored body is stamped with ``SERIALIZATION_VERSION``. A body whose stamp
+doesn't match — or that is missing, e.g. after a bulk write that bypassed
+``save()`` — is regenerated on its next read (``scenes.api``).
+
+MODULE-LOAD INVARIANT: scenes.models imports this module, so it must not
+import scenes.models itself (see scenes/schemas/math_items.py).
+"""
+
+import hashlib
+import json
+from typing import Any, List
+
+from ninja.responses import NinjaJSONEncoder
+
+from scenes.schemas import SceneSchema
+
+# Bump when the body changes in a way SceneSchema's JSON schema can't show —
+# a resolver, the encoder, or the dump options below.
+_FORMAT_REVISION = 1
+
+# The schema fingerprint covers every field and MathItem change automatically.
+_SCHEMA_FINGERPRINT = hashlib.sha256(
+    json.dumps(SceneSchema.model_json_schema(), sort_keys=True).encode()
+).hexdigest()[:12]
+
+SERIALIZATION_VERSION = f"{_FORMAT_REVISION}.{_SCHEMA_FINGERPRINT}"
+
+# What ninja's JSONRenderer sends, so a stored body is served unchanged.
+CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+class _ValidatedItemsSceneSchema(SceneSchema):
+    # For a scene whose items were just dumped from validated MathItem models
+    # (Scene.set_validated_items): pass them through instead of validating
+    # the union again. The output is the same, since MathItem fields carry no
+    # aliases and a dump of a dump is a no-op.
+    items: List[Any]  # type: ignore[assignment]
+
+
+def serialize_scene(scene) -> bytes:
+    """Render ``scene`` exactly as ninja renders a ``SceneSchema`` response."""
+    schema = (
+        _ValidatedItemsSceneSchema
+        if getattr(scene, "items_validated", False)
+        else SceneSchema
+    )
+    data = schema.model_validate(scene).model_dump(by_alias=True)
+    return json.dumps(data, cls=NinjaJSONEncoder).encode()
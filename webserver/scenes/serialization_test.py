@@ -0,0 +1,137 @@
+import json
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.test import Client
+
+from authentication.factories import CustomUserFactory
+from scenes import validators
+from scenes.factories import SceneFactory
+from scenes.models import Scene
+from scenes.serialization import SERIALIZATION_VERSION, serialize_scene
+from scenes.tests.data import default_scene
+
+
+def _detail(key):
+    return f"/v1/scenes/{key}/"
+
+
+def _stored(scene):
+    return Scene.objects.values_list("serialized", "serialized_version").get(
+        pk=scene.pk
+    )
+
+
+@pytest.mark.django_db
+def test_save_stores_current_body():
+    scene = SceneFactory.create()
+    serialized, version = _stored(scene)
+    assert bytes(serialized) == serialize_scene(scene)
+    assert version == SERIALIZATION_VERSION
+
+
+@pytest.mark.django_db
+def test_body_matches_ninja_rendering():
+    # Dates render like ninja's encoder (millisecond precision, trailing Z) and
+    # fields carry their camelCase aliases.
+    scene = SceneFactory.create()
+    body = json.loads(serialize_scene(scene))
+    assert body["key"] == scene.key
+    assert body["itemOrder"] == scene.item_order
+    assert body["author"] == scene.author_id
+    assert body["createdDate"] == scene.created_date.isoformat()[:23] + "Z"
+
+
+@pytest.mark.django_db
+def test_get_serves_stored_body_verbatim():
+    scene = SceneFactory.create()
+    Scene.objects.filter(pk=scene.pk).update(serialized=b'{"stored": true}')
+    response = Client().get(_detail(scene.key))
+    assert response.json() == {"stored": True}
+    assert response["Content-Type"] == "application/json; charset=utf-8"
+
+
+@pytest.mark.django_db
+def test_get_is_one_column_fetch(django_assert_num_queries):
+    scene = SceneFactory.create()
+    # The stored body, with the legacy-migration check folded into the same
+    # query. No Scene is instantiated.
+    with django_assert_num_queries(1):
+        Client().get(_detail(scene.key))
+
+
+@pytest.mark.django_db
+def test_stale_version_is_regenerated_and_written_back():
+    scene = SceneFactory.create()
+    Scene.objects.filter(pk=scene.pk).update(
+        serialized=b'{"stale": true}', serialized_version="0.old"
+    )
+    response = Client().get(_detail(scene.key))
+    assert response.json()["key"] == scene.key
+    serialized, version = _stored(scene)
+    assert bytes(serialized) == response.content
+    assert version == SERIALIZATION_VERSION
+
+
+@pytest.mark.django_db
+def test_missing_body_is_regenerated():
+    # bulk_create bypasses save(), so the row has no body yet.
+    built = SceneFactory.build(key="bulkkey", author=None)
+    Scene.objects.bulk_create([built])
+    response = Client().get(_detail("bulkkey"))
+    assert response.status_code == 200
+    assert response.json()["key"] == "bulkkey"
+    assert _stored(built)[0] is not None
+
+
+@pytest.mark.django_db
+def test_scene_queries_defer_the_body():
+    scene = SceneFactory.create()
+    assert "serialized" in Scene.objects.get(pk=scene.pk).get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_create_validates_items_once(client):
+    data = default_scene()
+    body = {"items": data["items"], "itemOrder": data["itemOrder"]}
+    adapter = validators.MATH_ITEM_LIST_ADAPTER
+    with (
+        mock.patch.object(
+            adapter, "validate_python", wraps=adapter.validate_python
+        ) as full_clean_validation,
+        mock.patch("scenes.serialization.SceneSchema") as render_validation,
+    ):
+        response = client.post(
+            "/v1/scenes/", data=body, content_type="application/json"
+        )
+    assert response.status_code == 201
+    full_clean_validation.assert_not_called()
+    render_validation.assert_not_called()
+    # The pass-through render matches a validating one. (Parsed: a re-read
+    # item_order comes back in jsonb's key order, not the request's.)
+    scene = Scene.objects.get(key=response.json()["key"])
+    assert response.json() == json.loads(serialize_scene(scene))
+
+
+@pytest.mark.django_db
+def test_patch_items_body_matches_validating_render(client):
+    me = CustomUserFactory.create()
+    scene = SceneFactory.create(author=me)
+    client.force_login(me)
+    items = default_scene()["items"]
+    response = client.patch(
+        _detail(scene.key), data={"items": items}, content_type="application/json"
+    )
+    scene.refresh_from_db()
+    assert response.json() == json.loads(serialize_scene(scene))
+
+
+@pytest.mark.django_db
+def test_validated_items_flag_lasts_one_save():
+    scene = SceneFactory.create()
+    scene.set_validated_items(scene.items)
+    scene.save()
+    scene.items = [{"unexpected": "shape"}]
+    with pytest.raises(ValidationError):
+        scene.save()
@@ -1,7 +1,10 @@
 from django.core.exceptions import ValidationError
 from pydantic import ValidationError as PydanticValidationError
 
-from scenes.schemas.math_items import MATH_ITEM_LIST_ADAPTER
+from scenes.schemas.math_items import (
+    MATH_ITEM_LIST_ADAPTER,
+    MATH_ITEM_LISTS_BY_KEY_ADAPTER,
+)
 
 
 def validate_math_items(value):
@@ -15,3 +18,23 @@ def validate_math_items(value):
         MATH_ITEM_LIST_ADAPTER.validate_python(value)
     except PydanticValidationError as exc:
         raise ValidationError(str(exc)) from exc
+
+
+def validate_math_items_by_key(items_by_key: dict[str, list]) -> dict[str, list]:
+    """``validate_math_items`` for a batch of scenes in one Pydantic call.
+
+    For write paths that bypass ``full_clean()`` (bulk upserts). Returns the
+    items dumped from the validated models, the form the API stores, so they
+    can be rendered later without validating them again. The raised
+    ValidationError's ``error_dict`` is keyed by the failing scenes' keys.
+    """
+    try:
+        validated = MATH_ITEM_LISTS_BY_KEY_ADAPTER.validate_python(items_by_key)
+    except PydanticValidationError as exc:
+        errors: dict[str, list[str]] = {}
+        for error in exc.errors():
+            key, *loc = error["loc"]
+            where = ".".join(str(part) for part in loc)
+            errors.setdefault(str(key), []).append(f"{where}: {error['msg']}")
+        raise ValidationError(errors) from exc
+    return MATH_ITEM_LISTS_BY_KEY_ADAPTER.dump_python(validated, mode="json")
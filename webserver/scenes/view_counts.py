@@ -0,0 +1,104 @@
+"""Buffered view counting for ``times_accessed``.
+
+Scene GETs record a view into a per-process buffer instead of issuing an
+UPDATE each, so a viral scene no longer turns every read into a write on one
+hot row. The buffer is flushed — one bulk UPDATE per table, with every
+increment for a key coalesced — by the first view recorded after
+``settings.SCENE_VIEW_FLUSH_INTERVAL`` seconds (or once the buffer holds
+``_MAX_BUFFERED_KEYS`` keys), and at interpreter exit.
+
+``times_accessed`` is therefore eventually consistent: up to one interval
+behind per worker, and a hard-killed worker loses its unflushed views. That is
+the accepted trade for a popularity counter.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+from scenes.models import LegacyScene, Scene
+
+logger = logging.getLogger(__name__)
+
+# Bounds the buffer's memory and the size of one flush statement when a crawl
+# touches many distinct keys inside a single interval.
+_MAX_BUFFERED_KEYS = 1000
+
+# Raw SQL: the ORM has no single-statement "add a different amount to each
+# matched row" (bulk_update writes absolute values, which would clobber
+# increments from other workers). unnest() pairs the two arrays row-wise.
+_SCENE = Scene._meta.db_table
+_LEGACY = LegacyScene._meta.db_table
+_SCENE_SQL = f"""
+    UPDATE {_SCENE} AS s SET times_accessed = s.times_accessed + v.n
+    FROM unnest(%(keys)s::text[], %(counts)s::int[]) AS v(key, n)
+    WHERE s.key = v.key
+"""
+# last_accessed is auto_now, which only fires on .save(); set it here instead.
+_LEGACY_SQL = f"""
+    UPDATE {_LEGACY} AS s
+    SET times_accessed = s.times_accessed + v.n, last_accessed = now()
+    FROM unnest(%(keys)s::text[], %(counts)s::int[]) AS v(key, n)
+    WHERE s.key = v.key
+"""
+
+_lock = threading.Lock()
+_scene_views: Counter[str] = Counter()
+_legacy_views: Counter[str] = Counter()
+_last_flush = time.monotonic()
+
+
+def record_scene_view(key: str) -> None:
+    _record(_scene_views, key)
+
+
+def record_legacy_view(key: str) -> None:
+    _record(_legacy_views, key)
+
+
+def _record(buffer: Counter[str], key: str) -> None:
+    with _lock:
+        buffer[key] += 1
+        due = (
+            time.monotonic() - _last_flush >= settings.SCENE_VIEW_FLUSH_INTERVAL
+            or len(_scene_views) + len(_legacy_views) >= _MAX_BUFFERED_KEYS
+        )
+    # Never from inside a transaction, as in main/metrics.py: a rollback
+    # there would discard the views after they've left the buffer.
+    if due and not connection.in_atomic_block:
+        flush()
+
+
+def _increment(sql: str, views: dict[str, int]) -> None:
+    if not views:
+        return
+    with connection.cursor() as cur:
+        cur.execute(sql, {"keys": list(views), "counts": list(views.values())})
+
+
+def flush() -> None:
+    """Write the buffered views. Never raises: it runs inline in a GET, and a
+    failed flush must not 500 the read. Failed counts go back in the buffer."""
+    global _last_flush
+    with _lock:
+        scene_views, legacy_views = dict(_scene_views), dict(_legacy_views)
+        _scene_views.clear()
+        _legacy_views.clear()
+        _last_flush = time.monotonic()
+    try:
+        _increment(_SCENE_SQL, scene_views)
+        scene_views = {}
+        _increment(_LEGACY_SQL, legacy_views)
+    except Exception:
+        logger.warning("flushing buffered view counts failed", exc_info=True)
+        with _lock:
+            _scene_views.update(scene_views)
+            _legacy_views.update(legacy_views)
+
+
+atexit.register(flush)
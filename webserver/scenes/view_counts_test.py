@@ -0,0 +1,88 @@
+import datetime
+from unittest import mock
+
+import pytest
+from django.db import transaction
+from django.test import Client
+
+from scenes import view_counts
+from scenes.factories import SceneFactory
+from scenes.models import LegacyScene
+
+
+@pytest.mark.django_db
+def test_get_does_not_write_times_accessed_inline(django_assert_num_queries):
+    scene = SceneFactory.create()
+    client = Client()
+    client.get(f"/v1/scenes/{scene.key}/")  # populates the scene cache
+    with django_assert_num_queries(0):
+        client.get(f"/v1/scenes/{scene.key}/")
+    scene.refresh_from_db()
+    assert scene.times_accessed == 0
+
+
+@pytest.mark.django_db
+def test_flush_coalesces_views_into_one_update(django_assert_num_queries):
+    a = SceneFactory.create()
+    b = SceneFactory.create()
+    for key in [a.key, a.key, a.key, b.key]:
+        view_counts.record_scene_view(key)
+    with django_assert_num_queries(1):
+        view_counts.flush()
+    a.refresh_from_db()
+    b.refresh_from_db()
+    assert (a.times_accessed, b.times_accessed) == (3, 1)
+
+
+@pytest.mark.django_db
+def test_flush_adds_to_the_stored_count():
+    # Increments, not absolute writes: other workers' flushes must not be lost.
+    scene = SceneFactory.create(times_accessed=10)
+    view_counts.record_scene_view(scene.key)
+    view_counts.flush()
+    scene.refresh_from_db()
+    assert scene.times_accessed == 11
+
+
+@pytest.mark.django_db
+def test_flush_bumps_legacy_count_and_last_accessed():
+    legacy = LegacyScene.objects.create(dehydrated={"a": 1})
+    # now() is the transaction start, which predates the row in a test
+    # transaction; backdate so the bump is observable.
+    before = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    LegacyScene.objects.filter(pk=legacy.pk).update(last_accessed=before)
+    view_counts.record_legacy_view(legacy.key)
+    view_counts.record_legacy_view(legacy.key)
+    view_counts.flush()
+    legacy.refresh_from_db()
+    assert legacy.times_accessed == 2
+    assert legacy.last_accessed > before
+
+
+# transaction=True: outside a transaction, as a request's view is.
+@pytest.mark.django_db(transaction=True)
+def test_record_flushes_inline_once_interval_elapses(settings):
+    settings.SCENE_VIEW_FLUSH_INTERVAL = 0
+    scene = SceneFactory.create()
+    view_counts.record_scene_view(scene.key)
+    scene.refresh_from_db()
+    assert scene.times_accessed == 1
+
+
+@pytest.mark.django_db
+def test_due_flush_waits_for_the_transaction_to_end(settings):
+    settings.SCENE_VIEW_FLUSH_INTERVAL = 0
+    with mock.patch.object(view_counts, "flush") as flush:
+        with transaction.atomic():
+            view_counts.record_scene_view("abc")
+        flush.assert_not_called()
+    assert view_counts._scene_views["abc"] == 1
+
+
+def test_failed_flush_keeps_views_buffered():
+    view_counts.record_scene_view("abc")
+    with mock.patch.object(
+        view_counts, "_increment", side_effect=RuntimeError("db down")
+    ):
+        view_counts.flush()  # must not raise
+    assert view_counts._scene_views["abc"] == 1